@@ -1,9 +1,8 @@
-from functools import partial
 import statsmodels.api as sm
 from sklearn import datasets
-import numpy as np
 import pandas as pd
 from genopt import GeneticOptimizer
+from genopt.objectives import SubsetRegression
 
 
 # Helper function to fit a regression model after a chromosome
@@ -13,31 +12,22 @@ def linear_regression_fit_chromosome(chromosome, x_data, targets):
     return regression_model.fit()
 
 
-# Objective function to maximize
-def linear_regression_minimize_bic(chromosome, x_data, targets):
-    if np.all(chromosome == 0):
-        return -1e9
-
-    results = linear_regression_fit_chromosome(chromosome, x_data, targets)
-    return -results.bic
-
-
 def main():
     # Load Boston housing dataset
     data = datasets.load_boston()
     x_data = pd.DataFrame(data=data["data"], columns=data["feature_names"])
     targets = data["target"]
 
-    # Setup GeneticOptimizer
+    # Setup GeneticOptimizer to maximize the negated BIC, which fits all
+    # chromosomes of a population at once
     optimizer = GeneticOptimizer(
         n_vars=x_data.shape[1],
         popsize=100,
-        objective_function=partial(
-            linear_regression_minimize_bic, x_data=x_data, targets=targets
-        ),
+        objective_function=SubsetRegression(x_data.values, targets, "bic"),
         encoding="discrete",
         var_range=(0, 1),
         var_size=1,
+        vectorized=True,
     )
 
     best_chromosome = optimizer.optimize(10)
@@ -1,2 +1,4 @@
-__all__ = ["GeneticOptimizer"]
+__all__ = ["BatchOptimizer", "GeneticOptimizer", "IslandOptimizer"]
+from .batch import BatchOptimizer
 from .go import GeneticOptimizer
+from .island import IslandOptimizer
@@ -0,0 +1,334 @@
+from typing import Tuple
+
+import numpy as np
+
+from genopt.mutation import mutation_self_adaptive
+
+
+def offspring_parent_fitness(
+    population: np.ndarray,
+    fitness: np.ndarray,
+    parents: np.ndarray,
+    offspring: np.ndarray,
+) -> np.ndarray:
+    """Get the fitness of the fitter parent of each offspring, where the
+    parents of a pair that may be crossed over are parents of both offspring
+
+    Args:
+        population (np.ndarray): Parent population as a 2d array
+        fitness (np.ndarray): Fitness of the parent population
+        parents (np.ndarray): Index of the selected parent of each offspring
+        offspring (np.ndarray): Offspring after crossover and mutation
+
+    Returns:
+        np.ndarray: Parent fitness, NaN for unchanged copies of a parent, which
+            cannot be successful
+    """
+    n_pairs = parents.size // 2
+    partners = parents.copy()
+    partners[0 : 2 * n_pairs : 2] = parents[1 : 2 * n_pairs : 2]
+    partners[1 : 2 * n_pairs : 2] = parents[0 : 2 * n_pairs : 2]
+    fitness = np.asarray(fitness, dtype=float)
+    parent_fitness = np.maximum(fitness[parents], fitness[partners])
+    unchanged = (offspring == population[parents]).all(axis=1)
+    unchanged |= (offspring == population[partners]).all(axis=1)
+    parent_fitness[unchanged] = np.nan
+    return parent_fitness
+
+
+class Adaptation:
+    """Base class for strategies that adapt the parameters of a
+    :py:class:`~genopt.GeneticOptimizer` during a run. The optimizer calls
+    :py:meth:`update` after every evaluated generation, and adaptations change
+    its ``mut_p``, ``mut_var`` or ``crossover_p`` attributes. The current
+    parameters are reported in ``parameters`` of every
+    :py:class:`~genopt.go.GenerationRecord`.
+    """
+
+    name = "adaptation"
+
+    # If True, the optimizer tracks the fitness of the parents of offspring
+    tracks_parents = False
+
+    # Number of strategy genes appended to real valued chromosomes
+    n_strategy_genes = 0
+
+    def update(self, optimizer, fitness: np.ndarray, parent_fitness: np.ndarray):
+        """Adapt the parameters of the optimizer to the latest generation
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer to adapt
+            fitness (np.ndarray): Fitness of the latest generation
+            parent_fitness (np.ndarray): Fitness of the fitter parent of each
+                chromosome of the latest generation, NaN for elites and
+                unchanged copies of a parent. None if ``tracks_parents`` is
+                False.
+        """
+        raise NotImplementedError
+
+    def parameters(self) -> dict:
+        """Get values of the adaptation to report with every generation
+
+        Returns:
+            dict: Values by name
+        """
+        return {}
+
+    def get_state(self) -> np.ndarray:
+        """Get the internal state of the adaptation for checkpoints
+
+        Returns:
+            np.ndarray: State as a 1d array
+        """
+        return np.zeros(0)
+
+    def set_state(self, state: np.ndarray):
+        """Restore a state from :py:meth:`get_state`
+
+        Args:
+            state (np.ndarray): State as a 1d array
+        """
+
+
+class OneFifthRule(Adaptation):
+    """Rechenberg's 1/5th success rule. An offspring is successful if it is
+    fitter than the fitter of its parents, and unchanged copies of a parent
+    are not counted. If more than ``target_rate`` of the offspring of a
+    generation are successful, the search is too cautious and the mutation
+    strength is increased by dividing it by ``factor``. Otherwise it is
+    multiplied by ``factor``. Successes of crossover are counted as well, so
+    the rule works best when mutation is the main source of variation, e.g.
+    with a ``crossover_p`` below 1.
+
+    Args:
+        parameter (str, optional): Parameter of the optimizer to adapt, either
+            'mut_var' or 'mut_p'. Adapts mut_var for real and mut_p for
+            discrete encoding if None. Defaults to None.
+        factor (float, optional): Multiplier of the parameter after a
+            generation with too few successes, between 0 and 1.
+            Defaults to 0.85.
+        target_rate (float, optional): Success rate that keeps the mutation
+            strength balanced. Defaults to 0.2.
+        bounds (Tuple[float, float], optional): Range of the parameter. Uses
+            (1e-12, inf) for mut_var and (0.1 / chromosome_length, 0.5) for
+            mut_p if None. Defaults to None.
+
+    Attributes:
+        success_rate (float): Success rate of the latest generation
+    """
+
+    name = "one_fifth_rule"
+    tracks_parents = True
+
+    def __init__(
+        self,
+        parameter: str = None,
+        factor: float = 0.85,
+        target_rate: float = 0.2,
+        bounds: Tuple[float, float] = None,
+    ):
+        assert parameter in [
+            None,
+            "mut_var",
+            "mut_p",
+        ], "Parameter can only be mut_var or mut_p"
+        assert 0 < factor < 1, "Factor must be between 0 and 1"
+        self.parameter = parameter
+        self.factor = factor
+        self.target_rate = target_rate
+        self.bounds = bounds
+        self.success_rate = np.nan
+
+    def update(self, optimizer, fitness: np.ndarray, parent_fitness: np.ndarray):
+        if parent_fitness is None:
+            return
+        tracked = ~np.isnan(parent_fitness)
+        if not tracked.any():
+            return
+        parameter = self.parameter
+        if parameter is None:
+            parameter = "mut_var" if optimizer.encoding == "real" else "mut_p"
+        bounds = self.bounds
+        if bounds is None:
+            if parameter == "mut_var":
+                bounds = (1e-12, np.inf)
+            else:
+                bounds = (0.1 / optimizer.chromosome_length, 0.5)
+        self.success_rate = float(np.mean(fitness[tracked] > parent_fitness[tracked]))
+        value = getattr(optimizer, parameter)
+        if self.success_rate > self.target_rate:
+            value = value / self.factor
+        else:
+            value = value * self.factor
+        setattr(optimizer, parameter, float(np.clip(value, *bounds)))
+
+    def parameters(self) -> dict:
+        return {"success_rate": self.success_rate}
+
+
+class SelfAdaptiveMutation(Adaptation):
+    """Self-adaptive mutation step sizes for real encoding. Every chromosome
+    carries its own step size as an extra gene after its variables, which is
+    inherited through selection and crossover. Mutation first changes the
+    step size log-normally and then perturbs the selected variables with it,
+    see :py:func:`~genopt.mutation.mutation_self_adaptive`, so selection
+    favours step sizes that produce fit offspring. The step sizes are not
+    passed to the objective function.
+
+    Args:
+        learning_rate (float, optional): Standard deviation of the log-normal
+            change of the step sizes. Uses 1 / sqrt(n_vars) if None.
+            Defaults to None.
+        initial_step (float, optional): Step size of the initial population.
+            Uses ``mut_var`` of the optimizer if None. Defaults to None.
+        min_step (float, optional): Smallest step size. Defaults to 1e-12.
+
+    Attributes:
+        median_step (float): Median step size of the latest generation
+    """
+
+    name = "self_adaptive_mutation"
+    n_strategy_genes = 1
+
+    def __init__(
+        self,
+        learning_rate: float = None,
+        initial_step: float = None,
+        min_step: float = 1e-12,
+    ):
+        assert min_step > 0, "Minimum step size must be larger than 0"
+        self.learning_rate = learning_rate
+        self.initial_step = initial_step
+        self.min_step = min_step
+        self.median_step = np.nan
+
+    def init_steps(self, optimizer, population: np.ndarray):
+        """Set the step sizes of an initial population of an optimizer
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer of the population
+            population (np.ndarray): Initial population, changed in place
+        """
+        population[:, optimizer.n_vars :] = (
+            optimizer.mut_var if self.initial_step is None else self.initial_step
+        )
+
+    def clamp_steps(self, optimizer, population: np.ndarray):
+        """Raise the step sizes of a population of an optimizer to at least
+        ``min_step``, e.g. after blend crossover extrapolated them
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer of the population
+            population (np.ndarray): Population with step sizes, changed in
+                place
+        """
+        steps = population[:, optimizer.n_vars :]
+        np.maximum(steps, self.min_step, out=steps)
+
+    def mutate(
+        self, optimizer, population: np.ndarray, mut_p: float, out: np.ndarray = None
+    ) -> np.ndarray:
+        """Mutate a population of an optimizer with its own step sizes
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer of the population
+            population (np.ndarray): Population with step sizes
+            mut_p (float): Mutation probability of each gene
+            out (np.ndarray, optional): Array to write the result to, which may
+                be the population itself. Defaults to None.
+
+        Returns:
+            np.ndarray: Population after mutation
+        """
+        learning_rate = self.learning_rate
+        if learning_rate is None:
+            learning_rate = 1 / np.sqrt(optimizer.n_vars)
+        return mutation_self_adaptive(
+            population, mut_p, learning_rate, self.min_step, rng=optimizer.rng, out=out
+        )
+
+    def update(self, optimizer, fitness: np.ndarray, parent_fitness: np.ndarray):
+        self.median_step = float(np.median(optimizer.population[:, optimizer.n_vars]))
+
+    def parameters(self) -> dict:
+        return {"median_step": self.median_step}
+
+
+class ImprovementRule(Adaptation):
+    """Adapt the mutation and crossover probabilities to the progress of the
+    best fitness. Every generation that improves the best fitness multiplies
+    the mutation probability by ``factor`` and divides the crossover
+    probability by it, since larger steps keep paying off. After ``patience``
+    generations without improvement, the mutation probability is divided by
+    ``factor`` and the crossover probability multiplied by it to refine the
+    current solutions instead of disrupting them.
+
+    Args:
+        factor (float, optional): Multiplier of the probabilities, larger than
+            1. Defaults to 1.2.
+        patience (int, optional): Number of generations without improvement
+            before decreasing the mutation probability. Defaults to 3.
+        min_improvement (float, optional): Smallest increase of the best
+            fitness that counts as an improvement. Defaults to 0.
+        mut_p_bounds (Tuple[float, float], optional): Range of the mutation
+            probability. Uses (0.1 / chromosome_length, 0.5) if None.
+            Defaults to None.
+        crossover_p_bounds (Tuple[float, float], optional): Range of the
+            crossover probability. Defaults to (0.5, 1.0).
+
+    Attributes:
+        best_fitness (float): Best fitness so far
+        n_stagnant (int): Number of generations since the last improvement or
+            decrease of the mutation probability
+    """
+
+    name = "improvement_rule"
+
+    def __init__(
+        self,
+        factor: float = 1.2,
+        patience: int = 3,
+        min_improvement: float = 0.0,
+        mut_p_bounds: Tuple[float, float] = None,
+        crossover_p_bounds: Tuple[float, float] = (0.5, 1.0),
+    ):
+        assert factor > 1, "Factor must be larger than 1"
+        assert patience > 0, "Patience must be larger than 0"
+        self.factor = factor
+        self.patience = patience
+        self.min_improvement = min_improvement
+        self.mut_p_bounds = mut_p_bounds
+        self.crossover_p_bounds = crossover_p_bounds
+        self.best_fitness = -np.inf
+        self.n_stagnant = 0
+
+    def update(self, optimizer, fitness: np.ndarray, parent_fitness: np.ndarray):
+        mut_p_bounds = self.mut_p_bounds
+        if mut_p_bounds is None:
+            mut_p_bounds = (0.1 / optimizer.chromosome_length, 0.5)
+
+        best_fitness = float(np.max(fitness))
+        if best_fitness > self.best_fitness + self.min_improvement:
+            first = np.isinf(self.best_fitness)
+            self.best_fitness = best_fitness
+            self.n_stagnant = 0
+            if first:
+                return
+            factor = self.factor
+        else:
+            self.n_stagnant += 1
+            if self.n_stagnant < self.patience:
+                return
+            self.n_stagnant = 0
+            factor = 1 / self.factor
+        optimizer.mut_p = float(np.clip(optimizer.mut_p * factor, *mut_p_bounds))
+        optimizer.crossover_p = float(
+            np.clip(optimizer.crossover_p / factor, *self.crossover_p_bounds)
+        )
+
+    def get_state(self) -> np.ndarray:
+        return np.array([self.best_fitness, self.n_stagnant])
+
+    def set_state(self, state: np.ndarray):
+        self.best_fitness = float(state[0])
+        self.n_stagnant = int(state[1])
@@ -0,0 +1,438 @@
+from typing import Callable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from genopt.evaluation import DiscreteDecoder, evaluate
+from genopt.population import DTypeLike, genome_dtype, init_discrete, init_real
+from genopt.rng import SeedLike, as_generator
+from genopt.selection import random_tournaments
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _batch_tournaments(
+    n_runs: int, popsize: int, t_sel_size: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    # Sample t_sel_size[r] distinct individuals for each tournament of run r,
+    # padded to the largest tournament size. Padding columns are ignored
+    max_size = int(t_sel_size.max())
+    assert max_size <= popsize, "Tournament size can not exceed population size"
+    if max_size * max_size > popsize:
+        # Duplicates are likely, so rejection sampling could take very long.
+        # Distinct individuals for the largest size are also distinct for the
+        # padded smaller tournaments
+        selected = random_tournaments(popsize, max_size, rng, n_runs * popsize)
+        return selected.reshape((n_runs, popsize, max_size))
+    padding = np.arange(max_size) >= t_sel_size.reshape((-1, 1, 1))
+    selected = rng.integers(popsize, size=(n_runs, popsize, max_size))
+    while max_size > 1:
+        # Give the padding columns distinct negative values so they never
+        # count as duplicates
+        sorted_selected = np.sort(
+            np.where(padding, -1 - np.arange(max_size), selected), axis=2
+        )
+        duplicates = (sorted_selected[..., 1:] == sorted_selected[..., :-1]).any(axis=2)
+        n_duplicates = duplicates.sum()
+        if n_duplicates == 0:
+            break
+        selected[duplicates] = rng.integers(popsize, size=(n_duplicates, max_size))
+    return selected
+
+
+def _batch_winner_ranks(
+    t_sel_p: np.ndarray,
+    t_sel_size: np.ndarray,
+    popsize: int,
+    max_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    # Draw the fitness rank of the winner of every tournament of every run.
+    # The i:th best wins with probability t_sel_p*(1-t_sel_p)^i and the last
+    # participant takes the remaining probability
+    rank = np.arange(max_size)
+    prob_thresholds = 1 - (1 - t_sel_p) ** (rank + 1)
+    prob_thresholds[rank >= t_sel_size.reshape((-1, 1)) - 1] = 1
+    draws = rng.random((t_sel_size.shape[0], popsize, 1))
+    i_winner = (draws > prob_thresholds[:, np.newaxis, :]).sum(axis=2)
+    return np.minimum(i_winner, t_sel_size.reshape((-1, 1)) - 1)
+
+
+def batch_tournament_selection(
+    population: np.ndarray,
+    fitness: np.ndarray,
+    t_sel_p: np.ndarray,
+    t_sel_size: np.ndarray,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """Tournament selection applied to several independent runs at once, see
+    :py:func:`~genopt.selection.tournament_selection`
+
+    Args:
+        population (np.ndarray): Populations with shape
+            (n_runs, popsize, chromosome_length)
+        fitness (np.ndarray): Fitness with shape (n_runs, popsize)
+        t_sel_p (np.ndarray): Probability of the fittest individual to win a
+            competition, per run
+        t_sel_size (np.ndarray): Tournament size, per run
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Populations after selection of tournament winners
+    """
+    rng = as_generator(rng)
+    n_runs, popsize = fitness.shape
+    t_sel_size = np.broadcast_to(t_sel_size, (n_runs,))
+    t_sel_p = np.broadcast_to(t_sel_p, (n_runs,)).reshape((-1, 1))
+    i_run = np.arange(n_runs).reshape((-1, 1, 1))
+
+    selected = _batch_tournaments(n_runs, popsize, t_sel_size, rng)
+    max_size = selected.shape[2]
+
+    # Sort the participants by fitness, with the padding columns last
+    padding = np.arange(max_size) >= t_sel_size.reshape((-1, 1, 1))
+    participant_fitness = np.where(padding, -np.inf, fitness[i_run, selected])
+    i_sel = np.argsort(-participant_fitness, axis=2, kind="stable")
+
+    i_winner = _batch_winner_ranks(t_sel_p, t_sel_size, popsize, max_size, rng)
+    i_sel = np.take_along_axis(i_sel, i_winner[..., np.newaxis], axis=2)
+    winners = np.take_along_axis(selected, i_sel, axis=2)[..., 0]
+    return np.take_along_axis(population, winners[..., np.newaxis], axis=1)
+
+
+def batch_one_way_crossover(
+    population: np.ndarray,
+    crossover_p: ArrayLike = 1.0,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """One way crossover applied to several independent runs at once, see
+    :py:func:`~genopt.crossover.one_way_crossover`
+
+    Args:
+        population (np.ndarray): Parent populations with shape
+            (n_runs, popsize, chromosome_length)
+        crossover_p (ArrayLike, optional): Probability that a pair of parents
+            is crossed over, shared or per run. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Child populations
+    """
+    rng = as_generator(rng)
+    new_population = population.copy()
+    n_runs, popsize, chromosome_length = new_population.shape
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    cross_points = rng.integers(1, chromosome_length - 1, size=(n_runs, n_pairs, 1))
+    mask = np.arange(chromosome_length) < cross_points
+    crossover_p = np.broadcast_to(crossover_p, (n_runs,)).reshape((-1, 1, 1))
+    mask &= rng.random((n_runs, n_pairs, 1)) < crossover_p
+
+    chromosomes1 = new_population[:, 0 : 2 * n_pairs : 2]
+    chromosomes2 = new_population[:, 1 : 2 * n_pairs : 2]
+    new_chromosomes1 = np.where(mask, chromosomes2, chromosomes1)
+    new_population[:, 1 : 2 * n_pairs : 2] = np.where(mask, chromosomes1, chromosomes2)
+    new_population[:, 0 : 2 * n_pairs : 2] = new_chromosomes1
+    return new_population
+
+
+def batch_mutation(
+    population: np.ndarray,
+    mut_p: ArrayLike,
+    mut_var: ArrayLike = None,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """Mutation applied to several independent runs at once. Flips the
+    selected genes of discrete chromosomes as
+    :py:func:`~genopt.mutation.mutation_discrete`, or perturbs them as
+    :py:func:`~genopt.mutation.mutation_real` if mut_var is given.
+
+    Args:
+        population (np.ndarray): Populations with shape
+            (n_runs, popsize, chromosome_length)
+        mut_p (ArrayLike): Mutation probability of each gene, shared or per run
+        mut_var (ArrayLike, optional): Variance of the normal distribution for
+            real valued chromosomes, shared or per run. Flips binary genes if
+            None. Defaults to None.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Mutated populations
+    """
+    rng = as_generator(rng)
+    n_runs = population.shape[0]
+    mut_p = np.broadcast_to(mut_p, (n_runs,)).reshape((-1, 1, 1))
+    selected = rng.random(population.shape) < mut_p
+    if mut_var is None:
+        return population ^ selected.astype(population.dtype)
+
+    mut_var = np.broadcast_to(mut_var, (n_runs,)).reshape((-1, 1, 1))
+    noise = rng.standard_normal(population.shape, dtype=population.dtype)
+    noise *= mut_var
+    noise *= selected
+    return population + noise
+
+
+def batch_update_population(
+    population: np.ndarray,
+    top_individuals: np.ndarray,
+    elitism: ArrayLike,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """Update several independent populations with elitism and shuffle, see
+    :py:func:`~genopt.population.update_population`
+
+    Args:
+        population (np.ndarray): Populations with shape
+            (n_runs, popsize, chromosome_length)
+        top_individuals (np.ndarray): Top chromosome of each run with shape
+            (n_runs, chromosome_length)
+        elitism (ArrayLike): Number of copies of the top chromosome, shared or
+            per run
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Populations after elitism and shuffle
+    """
+    rng = as_generator(rng)
+    n_runs, popsize, _ = population.shape
+    order = np.argsort(rng.random((n_runs, popsize)), axis=1)
+    new_population = np.take_along_axis(population, order[..., np.newaxis], axis=1)
+    elite = np.arange(popsize) < np.broadcast_to(elitism, (n_runs,)).reshape((-1, 1))
+    return np.where(
+        elite[..., np.newaxis], top_individuals[:, np.newaxis, :], new_population
+    )
+
+
+# pylint: disable=R0902
+class BatchOptimizer:
+    """Run many independent genetic optimizations at once, e.g. for a
+    hyperparameter sweep. The populations of all runs are stacked into one
+    array of shape (n_runs, popsize, chromosome_length) and each generation
+    applies tournament selection, one way crossover, mutation and elitism to
+    all runs with vectorized operations. The hyperparameters can be given per
+    run.
+
+    The decoded chromosomes of all runs are evaluated together, so a
+    vectorized objective function is called with n_runs * popsize rows.
+
+    Args:
+        n_runs (int): Number of independent runs
+        n_vars (int): Number of variables
+        popsize (int): Population size of each run
+        objective_function (callable): Function to optimize for, see
+            :py:class:`~genopt.GeneticOptimizer`
+        t_sel_p (ArrayLike, optional): Probability of the fittest individual
+            to win a tournament, shared or per run. Defaults to 0.7.
+        t_sel_size (ArrayLike, optional): Tournament size, shared or per run.
+            Defaults to 1.
+        mut_p (ArrayLike, optional): Mutation probability, shared or per run.
+            Set to 1/(n_vars*var_size) if None. Defaults to None.
+        mut_var (ArrayLike, optional): Mutation variance for real encoded
+            variables, shared or per run. Defaults to 1.
+        crossover_p (ArrayLike, optional): Probability that a pair of parents
+            is crossed over, shared or per run. Defaults to 1.0.
+        elitism (ArrayLike, optional): Number of copies of the best individual
+            to transfer to the next generation, shared or per run.
+            Defaults to 1.
+        encoding (str, optional): Type of variable encoding. Can be 'real'
+            or 'discrete'. Defaults to 'real'.
+        var_range (tuple, optional): Range of discrete variables.
+            Defaults to (0, 1).
+        var_size (int, optional): Number of genes for each discrete variable.
+            Defaults to 1.
+        gray (bool, optional): Decode discrete variables as Gray code.
+            Defaults to False.
+        vectorized (bool, optional): If True, ``objective_function`` takes a
+            2d array of decoded chromosomes. Defaults to False.
+        chunk_size (int, optional): Number of chromosomes passed to a
+            vectorized objective function per call. Defaults to None.
+        seed (SeedLike, optional): Seed of the random number generator shared
+            by all runs. Defaults to None.
+        dtype (DTypeLike, optional): Data type of the genes, see
+            :py:func:`~genopt.population.genome_dtype`. Uses float64 for real
+            and int64 for discrete encoding if None. Defaults to None.
+
+    Attributes:
+        population (np.ndarray): Populations of all runs
+        fitness (np.ndarray): Fitness with shape (n_runs, popsize)
+        top_individuals (np.ndarray): Best chromosome of each run
+        top_fitness (np.ndarray): Best fitness of each run
+        history (np.ndarray): Best fitness of each run per generation with
+            shape (n_generations, n_runs), including the initial population
+    """
+
+    def __init__(  # pylint: disable=R0914
+        self,
+        n_runs: int,
+        n_vars: int,
+        popsize: int,
+        objective_function: Callable,
+        t_sel_p: ArrayLike = 0.7,
+        t_sel_size: ArrayLike = 1,
+        mut_p: ArrayLike = None,
+        mut_var: ArrayLike = 1.0,
+        crossover_p: ArrayLike = 1.0,
+        elitism: ArrayLike = 1,
+        encoding: str = "real",
+        var_range: Tuple[float] = (0, 1),
+        var_size: Union[int, Sequence[int]] = 1,
+        gray: bool = False,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        seed: SeedLike = None,
+        dtype: DTypeLike = None,
+    ):
+        assert encoding in [
+            "discrete",
+            "real",
+        ], "Encoding can only be real or discrete."
+        assert n_runs > 0, "Number of runs must be larger than 0"
+
+        self.n_runs = n_runs
+        self.n_vars = n_vars
+        self.popsize = popsize
+        self.objective_function = objective_function
+        self.encoding = encoding
+        if encoding == "real":
+            self.decoder = None
+            self.chromosome_length = n_vars
+        else:
+            self.decoder = DiscreteDecoder(n_vars, var_range, var_size, gray)
+            self.chromosome_length = self.decoder.chromosome_length
+        if mut_p is None:
+            mut_p = 1 / self.chromosome_length
+
+        self.t_sel_p = self._per_run(t_sel_p, float)
+        self.t_sel_size = self._per_run(t_sel_size, int)
+        self.mut_p = self._per_run(mut_p, float)
+        self.mut_var = self._per_run(mut_var, float)
+        self.crossover_p = self._per_run(crossover_p, float)
+        self.elitism = self._per_run(elitism, int)
+        assert (self.t_sel_size > 0).all(), "Tournament size must be larger than 0"
+        assert (self.elitism <= popsize).all(), "Elitism can not exceed popsize"
+        self.vectorized = vectorized
+        self.chunk_size = chunk_size
+        self.rng = as_generator(seed)
+        self.dtype = genome_dtype(encoding, dtype)
+
+        shape = (n_runs, popsize, self.chromosome_length)
+        if encoding == "real":
+            population = init_real(n_runs * popsize, n_vars, self.rng, self.dtype)
+        else:
+            population = init_discrete(
+                n_runs * popsize, n_vars, var_size, self.rng, self.dtype
+            )
+        self.population = population.reshape(shape)
+        self.fitness = None
+        self.top_individuals = None
+        self.top_fitness = None
+        self.history = np.zeros((0, n_runs))
+
+    def _per_run(self, value: ArrayLike, dtype: type) -> np.ndarray:
+        # Broadcast a hyperparameter to one value per run
+        value = np.asarray(value, dtype=dtype)
+        assert value.ndim == 0 or value.shape == (
+            self.n_runs,
+        ), "Hyperparameters must be scalars or have one value per run"
+        return np.broadcast_to(value, (self.n_runs,)).copy()
+
+    def optimize(self, n_gen: int) -> np.ndarray:
+        """Run all runs for n_gen generations and return the top individual of
+        each run
+
+        Args:
+            n_gen (int): Number of generations to optimize for
+
+        Returns:
+            np.ndarray: Top chromosome of each run with shape
+                (n_runs, chromosome_length)
+        """
+        if self.fitness is None:
+            self._set_fitness(self.evaluate(self.population))
+
+        for _ in range(n_gen):
+            population = batch_tournament_selection(
+                self.population, self.fitness, self.t_sel_p, self.t_sel_size, self.rng
+            )
+            population = batch_one_way_crossover(population, self.crossover_p, self.rng)
+            population = batch_mutation(
+                population,
+                self.mut_p,
+                self.mut_var if self.encoding == "real" else None,
+                self.rng,
+            )
+            self.population = batch_update_population(
+                population, self.top_individuals, self.elitism, self.rng
+            )
+            self._set_fitness(self.evaluate(self.population))
+        return self.top_individuals
+
+    def _set_fitness(self, fitness: np.ndarray):
+        self.fitness = fitness
+        i_max = np.argmax(fitness, axis=1)
+        self.top_individuals = self.population[np.arange(self.n_runs), i_max]
+        self.top_fitness = fitness[np.arange(self.n_runs), i_max]
+        self.history = np.vstack([self.history, self.top_fitness])
+
+    def decode(self, population: np.ndarray) -> np.ndarray:
+        """Decode chromosomes of any leading shape to variables
+
+        Args:
+            population (np.ndarray): Chromosomes with chromosome_length as the
+                last dimension
+
+        Returns:
+            np.ndarray: Variables with n_vars as the last dimension
+        """
+        if self.encoding == "real":
+            return population
+        flat = population.reshape((-1, self.chromosome_length))
+        return self.decoder(flat).reshape(population.shape[:-1] + (self.n_vars,))
+
+    def evaluate(self, population: np.ndarray) -> np.ndarray:
+        """Evaluate the populations of all runs with the objective function
+
+        Args:
+            population (np.ndarray): Populations with shape
+                (n_runs, popsize, chromosome_length)
+
+        Returns:
+            np.ndarray: Fitness with shape (n_runs, popsize)
+        """
+        variables = self.decode(population).reshape((-1, self.n_vars))
+        fitness = evaluate(
+            variables, self.objective_function, self.vectorized, self.chunk_size
+        )
+        return fitness.reshape(population.shape[:2])
+
+    def results(self) -> List[dict]:
+        """Get the result of each run
+
+        Returns:
+            List[dict]: One result per run with its hyperparameters under the
+                keys ``t_sel_p``, ``t_sel_size``, ``mut_p``, ``mut_var``,
+                ``crossover_p`` and ``elitism``, and its ``best_fitness``,
+                ``best_chromosome`` and decoded ``best_variables``
+        """
+        assert self.fitness is not None, "Run optimize before getting results"
+        best_variables = self.decode(self.top_individuals)
+        return [
+            {
+                "t_sel_p": float(self.t_sel_p[i]),
+                "t_sel_size": int(self.t_sel_size[i]),
+                "mut_p": float(self.mut_p[i]),
+                "mut_var": float(self.mut_var[i]),
+                "crossover_p": float(self.crossover_p[i]),
+                "elitism": int(self.elitism[i]),
+                "best_fitness": self.top_fitness[i],
+                "best_chromosome": self.top_individuals[i],
+                "best_variables": best_variables[i],
+            }
+            for i in range(self.n_runs)
+        ]
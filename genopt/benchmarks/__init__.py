@@ -0,0 +1,29 @@
+"""Standard test problems and operator microbenchmarks. Run the suite from
+the command line with ``python -m genopt.benchmarks``."""
+
+from genopt.benchmarks.micro import run_microbenchmarks, time_call
+from genopt.benchmarks.problems import (
+    Problem,
+    ackley,
+    deceptive_trap,
+    get_problems,
+    make_variable_selection,
+    onemax,
+    rastrigin,
+    rosenbrock,
+)
+from genopt.benchmarks.runner import run_problem
+
+__all__ = [
+    "Problem",
+    "ackley",
+    "deceptive_trap",
+    "get_problems",
+    "make_variable_selection",
+    "onemax",
+    "rastrigin",
+    "rosenbrock",
+    "run_microbenchmarks",
+    "run_problem",
+    "time_call",
+]
@@ -0,0 +1,91 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+from typing import List
+
+import numpy as np
+
+from genopt.benchmarks.micro import run_microbenchmarks
+from genopt.benchmarks.problems import get_problems
+from genopt.benchmarks.runner import run_problem
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse the command line arguments of the benchmark runner
+
+    Args:
+        argv (List[str], optional): Arguments, uses ``sys.argv`` if None.
+            Defaults to None.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m genopt.benchmarks",
+        description="Run genopt benchmarks and print the results as JSON",
+    )
+    parser.add_argument(
+        "--problems",
+        nargs="*",
+        default=None,
+        help="Problems to optimize, all if not given. Pass no names to skip.",
+    )
+    parser.add_argument("--size", type=int, default=20, help="Variables per problem")
+    parser.add_argument("--popsize", type=int, default=100)
+    parser.add_argument("--n-gen", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--micro", action="store_true", help="Run the operator microbenchmarks"
+    )
+    parser.add_argument("--popsizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[32, 256])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="File to write, or stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> dict:
+    """Run the benchmarks and write the results as JSON
+
+    Args:
+        argv (List[str], optional): Command line arguments, uses ``sys.argv``
+            if None. Defaults to None.
+
+    Returns:
+        dict: Benchmark results
+    """
+    args = parse_args(argv)
+    logging.getLogger("genopt").setLevel(logging.WARNING)
+
+    problems = get_problems(args.size)
+    names = list(problems) if args.problems is None else args.problems
+    unknown = set(names) - set(problems)
+    if unknown:
+        raise SystemExit(f"Unknown problems: {', '.join(sorted(unknown))}")
+
+    results = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "problems": [
+            run_problem(problems[name], args.popsize, args.n_gen, args.seed)
+            for name in names
+        ],
+    }
+    if args.micro:
+        results["micro"] = run_microbenchmarks(
+            args.popsizes, args.lengths, args.repeats, args.seed
+        )
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from genopt.crossover import one_way_crossover
+from genopt.evaluation import decode_discrete
+from genopt.mutation import mutation_discrete, mutation_real
+from genopt.population import init_discrete, init_real, update_population
+from genopt.rng import as_generator
+from genopt.selection import tournament_selection
+
+# Number of bits per variable when benchmarking decode_discrete
+DECODE_VAR_SIZE = 8
+
+
+def time_call(function: Callable, repeats: int = 5) -> Dict[str, float]:
+    """Time repeated calls to a function
+
+    Args:
+        function (Callable): Function without arguments to time
+        repeats (int, optional): Number of timed calls. Defaults to 5.
+
+    Returns:
+        Dict[str, float]: Minimum and median wall time in seconds
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"min": float(np.min(times)), "median": float(np.median(times))}
+
+
+def _operators(
+    popsize: int, chromosome_length: int, rng: np.random.Generator
+) -> Dict[str, Callable]:
+    discrete = init_discrete(popsize, chromosome_length, 1, rng=rng)
+    real = init_real(popsize, chromosome_length, rng=rng)
+    fitness = rng.random(popsize)
+    n_vars = max(chromosome_length // DECODE_VAR_SIZE, 1)
+    encoded = init_discrete(popsize, n_vars, DECODE_VAR_SIZE, rng=rng)
+    mut_p = 1 / chromosome_length
+    return {
+        "decode_discrete": lambda: decode_discrete(
+            encoded, n_vars, (0, 1), DECODE_VAR_SIZE
+        ),
+        "tournament_selection": lambda: tournament_selection(
+            discrete, fitness, 0.7, 2, rng=rng
+        ),
+        "one_way_crossover": lambda: one_way_crossover(discrete, rng=rng),
+        "mutation_discrete": lambda: mutation_discrete(discrete, mut_p, rng=rng),
+        "mutation_real": lambda: mutation_real(real, mut_p, 1.0, rng=rng),
+        "update_population": lambda: update_population(
+            discrete, discrete[0], 1, rng=rng
+        ),
+    }
+
+
+def run_microbenchmarks(
+    popsizes: Sequence[int] = (100, 1000),
+    chromosome_lengths: Sequence[int] = (32, 256),
+    repeats: int = 5,
+    seed: int = None,
+) -> List[dict]:
+    """Time the genetic operators over a grid of population sizes and
+    chromosome lengths
+
+    Args:
+        popsizes (Sequence[int], optional): Population sizes.
+            Defaults to (100, 1000).
+        chromosome_lengths (Sequence[int], optional): Number of genes per
+            chromosome. Defaults to (32, 256).
+        repeats (int, optional): Number of timed calls per operator.
+            Defaults to 5.
+        seed (int, optional): Seed of the random number generator.
+            Defaults to None.
+
+    Returns:
+        List[dict]: One result per operator and grid point with the keys
+            ``operator``, ``popsize``, ``chromosome_length``, ``min`` and
+            ``median``
+    """
+    rng = as_generator(seed)
+    results = []
+    for popsize in popsizes:
+        for chromosome_length in chromosome_lengths:
+            operators = _operators(popsize, chromosome_length, rng)
+            for name, operator in operators.items():
+                result = {
+                    "operator": name,
+                    "popsize": popsize,
+                    "chromosome_length": chromosome_length,
+                }
+                result.update(time_call(operator, repeats))
+                results.append(result)
+    return results
@@ -0,0 +1,191 @@
+from typing import Callable, Dict, NamedTuple, Tuple
+import numpy as np
+
+from genopt.objectives import SubsetRegression
+
+
+class Problem(NamedTuple):
+    """Benchmark problem with a vectorized objective function to maximize
+
+    Attributes:
+        name (str): Name of the problem
+        objective_function (Callable): Vectorized objective function that
+            takes a 2d array of decoded chromosomes and returns their fitness
+        n_vars (int): Number of variables
+        optimizer_kwargs (dict): Encoding arguments for
+            :py:class:`~genopt.GeneticOptimizer`
+        optimum (float): Best possible fitness
+        target (float): Fitness that counts as solved
+    """
+
+    name: str
+    objective_function: Callable
+    n_vars: int
+    optimizer_kwargs: dict
+    optimum: float
+    target: float
+
+
+def onemax(variables: np.ndarray) -> np.ndarray:
+    """Number of ones in each binary chromosome
+
+    Args:
+        variables (np.ndarray): Binary chromosomes as a 2d array
+
+    Returns:
+        np.ndarray: Fitness with shape (popsize, )
+    """
+    return np.atleast_2d(variables).sum(axis=1)
+
+
+def rastrigin(variables: np.ndarray) -> np.ndarray:
+    """Negated Rastrigin function, maximized at 0 with fitness 0
+
+    Args:
+        variables (np.ndarray): Chromosomes as a 2d array
+
+    Returns:
+        np.ndarray: Fitness with shape (popsize, )
+    """
+    variables = np.atleast_2d(variables)
+    return -(
+        10 * variables.shape[1]
+        + (variables**2 - 10 * np.cos(2 * np.pi * variables)).sum(axis=1)
+    )
+
+
+def rosenbrock(variables: np.ndarray) -> np.ndarray:
+    """Negated Rosenbrock function, maximized at 1 with fitness 0
+
+    Args:
+        variables (np.ndarray): Chromosomes as a 2d array
+
+    Returns:
+        np.ndarray: Fitness with shape (popsize, )
+    """
+    variables = np.atleast_2d(variables)
+    x_current = variables[:, :-1]
+    x_next = variables[:, 1:]
+    return -(100 * (x_next - x_current**2) ** 2 + (1 - x_current) ** 2).sum(axis=1)
+
+
+def ackley(variables: np.ndarray) -> np.ndarray:
+    """Negated Ackley function, maximized at 0 with fitness 0
+
+    Args:
+        variables (np.ndarray): Chromosomes as a 2d array
+
+    Returns:
+        np.ndarray: Fitness with shape (popsize, )
+    """
+    variables = np.atleast_2d(variables)
+    mean_square = (variables**2).mean(axis=1)
+    mean_cos = np.cos(2 * np.pi * variables).mean(axis=1)
+    return -(-20 * np.exp(-0.2 * np.sqrt(mean_square)) - np.exp(mean_cos) + 20 + np.e)
+
+
+def deceptive_trap(variables: np.ndarray, trap_size: int = 4) -> np.ndarray:
+    """Concatenated deceptive trap function. Each block of ``trap_size`` bits
+    scores ``trap_size`` if all bits are one and ``trap_size - 1 - ones``
+    otherwise, which leads hill climbers towards all zeros.
+
+    Args:
+        variables (np.ndarray): Binary chromosomes as a 2d array with a
+            length divisible by trap_size
+        trap_size (int, optional): Number of bits per trap. Defaults to 4.
+
+    Returns:
+        np.ndarray: Fitness with shape (popsize, )
+    """
+    variables = np.atleast_2d(variables)
+    ones = variables.reshape((variables.shape[0], -1, trap_size)).sum(axis=2)
+    return np.where(ones == trap_size, trap_size, trap_size - 1 - ones).sum(axis=1)
+
+
+def make_variable_selection(
+    n_samples: int = 200, n_features: int = 30, n_informative: int = 5, seed: int = 0
+) -> Tuple[Callable, np.ndarray]:
+    """Create a synthetic linear regression variable selection problem, where
+    the fitness of a binary chromosome is the negated BIC of an ordinary least
+    squares fit on the selected features
+
+    Args:
+        n_samples (int, optional): Number of samples. Defaults to 200.
+        n_features (int, optional): Number of candidate features.
+            Defaults to 30.
+        n_informative (int, optional): Number of features used to generate
+            the targets. Defaults to 5.
+        seed (int, optional): Seed of the generated data. Defaults to 0.
+
+    Returns:
+        Tuple[Callable, np.ndarray]: Vectorized objective function and the
+            binary mask of informative features
+    """
+    rng = np.random.default_rng(seed)
+    x_data = rng.normal(size=(n_samples, n_features))
+    informative = np.zeros(n_features, dtype=int)
+    informative[rng.choice(n_features, n_informative, replace=False)] = 1
+    coefficients = informative * rng.uniform(1, 3, size=n_features)
+    targets = x_data @ coefficients + rng.normal(size=n_samples)
+
+    variable_selection = SubsetRegression(x_data, targets, "bic")
+    return variable_selection, informative
+
+
+def get_problems(size: int = 20) -> Dict[str, Problem]:
+    """Get the standard benchmark problems
+
+    Args:
+        size (int, optional): Number of variables of each problem, a multiple
+            of 4. Defaults to 20.
+
+    Returns:
+        Dict[str, Problem]: Problems by name
+    """
+    real_kwargs = {
+        "encoding": "discrete",
+        "var_size": 16,
+        "vectorized": True,
+        "crossover_method": "uniform",
+    }
+    binary_kwargs = {"encoding": "discrete", "vectorized": True}
+    variable_selection, informative = make_variable_selection(n_features=size)
+    # The generating features are used as the target, a smaller BIC is rare
+    selection_target = float(variable_selection(informative)[0])
+    problems = [
+        Problem("onemax", onemax, size, binary_kwargs, size, size),
+        Problem(
+            "rastrigin",
+            rastrigin,
+            size,
+            dict(real_kwargs, var_range=(-5.12, 5.12)),
+            0.0,
+            -size,
+        ),
+        Problem(
+            "rosenbrock",
+            rosenbrock,
+            size,
+            dict(real_kwargs, var_range=(-2.048, 2.048)),
+            0.0,
+            -size,
+        ),
+        Problem(
+            "ackley",
+            ackley,
+            size,
+            dict(real_kwargs, var_range=(-32.768, 32.768)),
+            0.0,
+            -1.0,
+        ),
+        Problem("deceptive_trap", deceptive_trap, size, binary_kwargs, size, size),
+        Problem(
+            "variable_selection",
+            variable_selection,
+            size,
+            binary_kwargs,
+            selection_target,
+            selection_target,
+        ),
+    ]
+    return {problem.name: problem for problem in problems}
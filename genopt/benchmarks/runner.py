@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+
+from genopt.benchmarks.problems import Problem
+from genopt.go import GeneticOptimizer
+
+
+def run_problem(
+    problem: Problem, popsize: int = 100, n_gen: int = 100, seed: int = None, **kwargs
+) -> dict:
+    """Optimize a benchmark problem and measure the time per generation and
+    the number of evaluations until the target fitness was reached
+
+    Args:
+        problem (Problem): Problem to optimize
+        popsize (int, optional): Population size. Defaults to 100.
+        n_gen (int, optional): Number of generations. Defaults to 100.
+        seed (int, optional): Seed of the optimizer. Defaults to None.
+        **kwargs: Additional arguments to :py:class:`~genopt.GeneticOptimizer`,
+            overriding the encoding arguments of the problem
+
+    Returns:
+        dict: Result with the keys ``problem``, ``popsize``, ``n_gen``,
+            ``time_per_generation``, ``evaluations_to_target`` (None if the
+            target was not reached), ``best_fitness`` and ``n_evaluations``
+    """
+    optimizer_kwargs = dict(problem.optimizer_kwargs, **kwargs)
+    assert (
+        optimizer_kwargs.get("n_objectives", 1) == 1
+    ), "Benchmark problems have a single objective"
+    optimizer = GeneticOptimizer(
+        problem.n_vars,
+        popsize,
+        problem.objective_function,
+        seed=seed,
+        **optimizer_kwargs
+    )
+
+    evaluations_to_target = None
+    generation_times = []
+    start = time.perf_counter()
+    for record in optimizer.iter_generations(n_gen):
+        generation_times.append(time.perf_counter() - start)
+        if evaluations_to_target is None and record.best_fitness >= problem.target:
+            evaluations_to_target = record.n_evaluations
+        start = time.perf_counter()
+
+    return {
+        "problem": problem.name,
+        "popsize": popsize,
+        "n_gen": n_gen,
+        "time_per_generation": float(np.mean(generation_times)),
+        "evaluations_to_target": evaluations_to_target,
+        "best_fitness": float(optimizer.fitness.max()),
+        "n_evaluations": optimizer.n_evaluations,
+    }
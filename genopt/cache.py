@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+import numpy as np
+
+
+class FitnessCache:
+    """Memoize fitness scores of chromosomes. Chromosomes are identified by
+    the bytes of their genes, so identical chromosomes are only evaluated
+    once. Duplicates within a population are evaluated once and their
+    fitness is copied to every occurrence.
+
+    Least recently used fitness scores are evicted when the cache is full.
+
+    Args:
+        maxsize (int, optional): Maximum number of fitness scores to store.
+            Unbounded if None. Defaults to None.
+
+    Attributes:
+        hits (int): Number of unique chromosomes found in the cache
+        misses (int): Number of unique chromosomes that had to be evaluated
+        duplicates (int): Number of chromosomes skipped because an identical
+            chromosome was in the same population
+    """
+
+    def __init__(self, maxsize: int = None):
+        assert maxsize is None or maxsize > 0, "Cache size must be larger than 0"
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+        self._fitness = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fitness)
+
+    def __contains__(self, chromosome: np.ndarray) -> bool:
+        return np.ascontiguousarray(chromosome).tobytes() in self._fitness
+
+    def clear(self):
+        """Remove all fitness scores and reset the counters"""
+        self._fitness.clear()
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Get the cached fitness scores and counters as arrays, in least
+        recently used order
+
+        Returns:
+            Dict[str, np.ndarray]: Cache state
+        """
+        keys = list(self._fitness.keys())
+        key_size = len(keys[0]) if keys else 0
+        return {
+            "keys": np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(
+                (len(keys), key_size)
+            ),
+            "fitness": np.array(list(self._fitness.values())),
+            "counters": np.array([self.hits, self.misses, self.duplicates]),
+        }
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        """Restore a state from :py:meth:`get_state`
+
+        Args:
+            state (Dict[str, np.ndarray]): Cache state
+        """
+        self._fitness = OrderedDict(
+            (key.tobytes(), value)
+            for key, value in zip(state["keys"], state["fitness"])
+        )
+        self.hits, self.misses, self.duplicates = (int(c) for c in state["counters"])
+
+    def evaluate(
+        self, population: np.ndarray, evaluate_function: Callable
+    ) -> np.ndarray:
+        """Get the fitness of a population, evaluating only unique chromosomes
+        that are not in the cache
+
+        Args:
+            population (np.ndarray): Population as a 2d array
+            evaluate_function (Callable): Function that takes a 2d array of
+                chromosomes and returns their fitness scores
+
+        Returns:
+            np.ndarray: Fitness scores with shape (popsize, )
+        """
+        query = self._lookup(population)
+        missing = query[1]
+        fitness = evaluate_function(missing) if len(missing) else np.zeros(0)
+        return self._store(query, fitness)
+
+    async def evaluate_async(
+        self, population: np.ndarray, evaluate_function: Callable[..., Awaitable]
+    ) -> np.ndarray:
+        """Coroutine version of :py:meth:`evaluate`
+
+        Args:
+            population (np.ndarray): Population as a 2d array
+            evaluate_function (Callable): Coroutine function that takes a 2d
+                array of chromosomes and returns their fitness scores
+
+        Returns:
+            np.ndarray: Fitness scores with shape (popsize, )
+        """
+        query = self._lookup(population)
+        missing = query[1]
+        fitness = await evaluate_function(missing) if len(missing) else np.zeros(0)
+        return self._store(query, fitness)
+
+    def _lookup(self, population: np.ndarray) -> Tuple:
+        population = np.ascontiguousarray(np.atleast_2d(population))
+        popsize = population.shape[0]
+
+        # View each row as a single void scalar to find unique rows in C
+        rows = population.view(
+            np.dtype((np.void, population.dtype.itemsize * population.shape[1]))
+        ).ravel()
+        _, i_unique, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        self.duplicates += popsize - i_unique.size
+
+        keys = [population[i].tobytes() for i in i_unique]
+        cached = {}
+        i_missing = []
+        for j, key in enumerate(keys):
+            if key in self._fitness:
+                self._fitness.move_to_end(key)
+                cached[j] = self._fitness[key]
+            else:
+                i_missing.append(j)
+        self.hits += i_unique.size - len(i_missing)
+        self.misses += len(i_missing)
+
+        i_missing = np.array(i_missing, dtype=int)
+        missing = population[i_unique[i_missing]]
+        return keys, missing, i_missing, cached, inverse.ravel()
+
+    def _store(self, query: Tuple, fitness: np.ndarray) -> np.ndarray:
+        # Fitness scores may be vectors of objectives
+        keys, _, i_missing, cached, inverse = query
+        for j, value in zip(i_missing, np.asarray(fitness)):
+            self._fitness[keys[j]] = value
+            cached[j] = value
+        unique_fitness = np.array([cached[j] for j in range(len(keys))])
+        if self.maxsize is not None:
+            while len(self._fitness) > self.maxsize:
+                self._fitness.popitem(last=False)
+        return unique_fitness[inverse]
@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+from typing import Dict
+import numpy as np
+
+
+def save_checkpoint(path: str, state: Dict[str, np.ndarray], compress: bool = False):
+    """Atomically write a checkpoint as an ``.npz`` file. The arrays are
+    written to a temporary file in the same directory which then replaces
+    ``path``, so an interrupted write never leaves a partial checkpoint.
+
+    Args:
+        path (str): Path of the checkpoint file
+        state (Dict[str, np.ndarray]): Arrays to store
+        compress (bool, optional): Compress the arrays. Smaller files but
+            slower writes. Defaults to False.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, tmp_path = tempfile.mkstemp(
+        suffix=".npz", prefix=".checkpoint-", dir=directory
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as tmp_file:
+            if compress:
+                np.savez_compressed(tmp_file, **state)
+            else:
+                np.savez(tmp_file, **state)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Dict[str, np.ndarray]:
+    """Read a checkpoint written by :py:func:`save_checkpoint`
+
+    Args:
+        path (str): Path of the checkpoint file
+
+    Returns:
+        Dict[str, np.ndarray]: Stored arrays
+    """
+    with np.load(path, allow_pickle=False) as checkpoint:
+        return {key: checkpoint[key] for key in checkpoint.files}
+
+
+def rng_state_to_array(rng: np.random.Generator) -> np.ndarray:
+    """Serialize the state of a random number generator to a string array
+
+    Args:
+        rng (np.random.Generator): Random number generator
+
+    Returns:
+        np.ndarray: State as a 0d string array
+    """
+    return np.array(json.dumps(rng.bit_generator.state))
+
+
+def rng_state_from_array(rng: np.random.Generator, state: np.ndarray):
+    """Restore the state of a random number generator serialized by
+    :py:func:`rng_state_to_array`
+
+    Args:
+        rng (np.random.Generator): Random number generator to restore
+        state (np.ndarray): Serialized state
+    """
+    rng.bit_generator.state = json.loads(str(state))
+
+
+def _with_prefix(prefix: str, state: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {f"{prefix}_{key}": value for key, value in state.items()}
+
+
+def _without_prefix(prefix: str, state: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    prefix = f"{prefix}_"
+    return {
+        key[len(prefix) :]: value
+        for key, value in state.items()
+        if key.startswith(prefix)
+    }
+
+
+def get_optimizer_state(optimizer, n_gen_remaining: int = 0) -> Dict[str, np.ndarray]:
+    """Collect the state of a :py:class:`~genopt.GeneticOptimizer` as arrays,
+    including its random number generator, adaptations, diversity monitor,
+    fitness cache and surrogate
+
+    Args:
+        optimizer (GeneticOptimizer): Optimizer to checkpoint
+        n_gen_remaining (int, optional): Number of generations left of the
+            current run. Defaults to 0.
+
+    Returns:
+        Dict[str, np.ndarray]: State for :py:func:`save_checkpoint`
+    """
+    state = {
+        "population": optimizer.population,
+        "fitness": optimizer.fitness,
+        "top_individual": (
+            optimizer.top_individual
+            if optimizer.top_individual is not None
+            else np.zeros((0,), dtype=optimizer.population.dtype)
+        ),
+        "generation": np.array(optimizer.generation),
+        "n_evaluations": np.array(optimizer.n_evaluations),
+        "n_gen_remaining": np.array(n_gen_remaining),
+        "rng_state": rng_state_to_array(optimizer.rng),
+        "parameters": np.array(
+            [optimizer.mut_p, optimizer.mut_var, optimizer.crossover_p]
+        ),
+    }
+    for i, adaptation in enumerate(optimizer.adaptation):
+        state[f"adaptation_{i}"] = adaptation.get_state()
+    if optimizer.diversity_monitor is not None:
+        state["diversity_monitor"] = optimizer.diversity_monitor.get_state()
+    if optimizer.cache is not None:
+        state.update(_with_prefix("cache", optimizer.cache.get_state()))
+    if optimizer.surrogate is not None:
+        state.update(_with_prefix("surrogate", optimizer.surrogate.get_state()))
+    return state
+
+
+def set_optimizer_state(optimizer, state: Dict[str, np.ndarray]) -> int:
+    """Restore the state of a :py:class:`~genopt.GeneticOptimizer` collected by
+    :py:func:`get_optimizer_state`. The diversity of the population is
+    measured again rather than stored.
+
+    Args:
+        optimizer (GeneticOptimizer): Optimizer to restore, created with the
+            same arguments as the checkpointed one
+        state (Dict[str, np.ndarray]): State from :py:func:`load_checkpoint`
+
+    Returns:
+        int: Number of generations left of the checkpointed run
+    """
+    optimizer.population = state["population"]
+    optimizer.fitness = state["fitness"]
+    optimizer.top_individual = state["top_individual"]
+    if optimizer.top_individual.size == 0:
+        optimizer.top_individual = None
+    optimizer.generation = int(state["generation"])
+    optimizer.n_evaluations = int(state["n_evaluations"])
+    rng_state_from_array(optimizer.rng, state["rng_state"])
+    if "parameters" in state:
+        optimizer.mut_p, optimizer.mut_var, optimizer.crossover_p = (
+            float(value) for value in state["parameters"]
+        )
+    for i, adaptation in enumerate(optimizer.adaptation):
+        adaptation.set_state(state[f"adaptation_{i}"])
+    if optimizer.diversity_monitor is not None:
+        optimizer.diversity_monitor.set_state(state["diversity_monitor"])
+        optimizer.diversity = (
+            optimizer.diversity_monitor.measure(optimizer)
+            if optimizer.generation
+            else None
+        )
+    if optimizer.cache is not None and "cache_keys" in state:
+        optimizer.cache.set_state(_without_prefix("cache", state))
+    if optimizer.surrogate is not None and "surrogate_counters" in state:
+        optimizer.surrogate.set_state(_without_prefix("surrogate", state))
+    return int(state["n_gen_remaining"])
@@ -1,27 +1,394 @@
 import numpy as np
 
+from genopt.population import as_output
+from genopt.rng import as_generator
+from genopt.selection import random_tournaments
 
-def one_way_crossover(population: np.ndarray) -> np.ndarray:
+# Number of random numbers drawn at once for the swap masks of packed
+# chromosomes, which bounds the memory of long chromosomes
+RANDOM_MASK_CHUNK_SIZE = 2**20
+
+
+def _swap_pairs(population: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # Swap the masked genes between the chromosome pairs (0, 1), (2, 3) etc.
+    # A trailing chromosome in an odd sized population is left unchanged
+    n_pairs = mask.shape[0]
+    chromosomes1 = population[0 : 2 * n_pairs : 2]
+    chromosomes2 = population[1 : 2 * n_pairs : 2]
+    if population.dtype == np.uint8 and mask.dtype == np.uint8:
+        # Packed chromosomes are swapped bytewise with an XOR mask
+        swap = (chromosomes1 ^ chromosomes2) & mask
+        population[0 : 2 * n_pairs : 2] ^= swap
+        population[1 : 2 * n_pairs : 2] ^= swap
+    else:
+        swapped = chromosomes1.copy()
+        np.copyto(chromosomes1, chromosomes2, where=mask)
+        np.copyto(chromosomes2, swapped, where=mask)
+    return population
+
+
+def _crossover_pairs(
+    n_pairs: int, crossover_p: float, rng: np.random.Generator
+) -> np.ndarray:
+    # Select which pairs of parents are crossed over
+    if crossover_p >= 1:
+        return np.ones((n_pairs, 1), dtype=bool)
+    return rng.random((n_pairs, 1)) < crossover_p
+
+
+def _random_cross_points(
+    n_pairs: int, low: int, high: int, n_points: int, rng: np.random.Generator
+) -> np.ndarray:
+    # Sample n_points distinct crossover points in [low, high) for each pair,
+    # like the participants of tournaments so that the cost grows with
+    # n_points rather than with the chromosome length
+    if n_points == 1:
+        return rng.integers(low, high, size=(n_pairs, 1))
+    assert high - low >= n_points, "Too many crossover points for chromosome"
+    return random_tournaments(high - low, n_points, rng, n_pairs) + low
+
+
+def _cross_point_mask(cross_points: np.ndarray, chromosome_length: int) -> np.ndarray:
+    # Genes with an odd number of crossover points to their right are swapped.
+    # The running XOR of the points gives the parity of the points to the left
+    n_pairs, n_points = cross_points.shape
+    mask = np.zeros((n_pairs, chromosome_length), dtype=bool)
+    mask[np.arange(n_pairs).reshape((-1, 1)), cross_points] = True
+    np.logical_xor.accumulate(mask, axis=1, out=mask)
+    if n_points % 2 == 1:
+        np.logical_not(mask, out=mask)
+    return mask
+
+
+def _packed_prefix_mask(cross_points: np.ndarray, n_bytes: int) -> np.ndarray:
+    # Byte mask of the genes to the left of each crossover point. Genes are
+    # stored with the most significant bit first in each byte
+    full_bytes = (cross_points // 8).ravel()
+    mask = (np.arange(n_bytes) < full_bytes.reshape((-1, 1))).view(np.uint8)
+    mask *= 0xFF
+    rows = np.flatnonzero(full_bytes < n_bytes)
+    bits = cross_points.ravel()[rows] % 8
+    mask[rows, full_bytes[rows]] = (0xFF << (8 - bits)) & 0xFF
+    return mask
+
+
+def one_way_crossover(
+    population: np.ndarray,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
     """Produce child chomosomes from pairs of parent chromosomes by swapping
     the chromosomes to the right of a randomly selected index.
 
     Args:
         population (np.ndarray): Parent population
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
 
     Returns:
         np.ndarray: Child population
     """
-    new_population = np.atleast_2d(population.copy())
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
     popsize, chromosome_length = new_population.shape
-    for j in np.arange(popsize - 1, step=2):
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    cross_points = rng.integers(1, chromosome_length - 1, size=(n_pairs, 1))
+    mask = np.arange(chromosome_length) < cross_points
+    mask &= _crossover_pairs(n_pairs, crossover_p, rng)
+    return _swap_pairs(new_population, mask)
 
-        # Take two chromosomes and find a crossover point
-        chromosome1 = new_population[j, :].copy()
-        chromosome2 = new_population[j + 1, :].copy()
-        cross_point = np.random.randint(1, chromosome_length - 1)
 
-        # Swap the chromosomes at the crossover point and update the population
-        new_population[j, :cross_point] = chromosome2[:cross_point]
-        new_population[j + 1, :cross_point] = chromosome1[:cross_point]
+def k_point_crossover(
+    population: np.ndarray,
+    k: int,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Produce child chromosomes from pairs of parent chromosomes by cutting
+    them at ``k`` distinct random points and swapping every other segment.
+
+    Args:
+        population (np.ndarray): Parent population
+        k (int): Number of crossover points
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
 
+    Returns:
+        np.ndarray: Child population
+    """
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    popsize, chromosome_length = new_population.shape
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    cross_points = _random_cross_points(n_pairs, 1, chromosome_length, k, rng)
+    mask = _cross_point_mask(cross_points, chromosome_length)
+    mask &= _crossover_pairs(n_pairs, crossover_p, rng)
+    return _swap_pairs(new_population, mask)
+
+
+def two_point_crossover(
+    population: np.ndarray,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Produce child chromosomes from pairs of parent chromosomes by swapping
+    the segment between two random points. See :py:func:`k_point_crossover`.
+
+    Args:
+        population (np.ndarray): Parent population
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Child population
+    """
+    return k_point_crossover(population, 2, crossover_p, rng, out)
+
+
+def uniform_crossover(
+    population: np.ndarray,
+    swap_p: float = 0.5,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Produce child chromosomes from pairs of parent chromosomes by swapping
+    each gene independently with probability ``swap_p``.
+
+    Args:
+        population (np.ndarray): Parent population
+        swap_p (float, optional): Probability of swapping each gene.
+            Defaults to 0.5.
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Child population
+    """
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    popsize, chromosome_length = new_population.shape
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    mask = rng.random((n_pairs, chromosome_length)) < swap_p
+    mask &= _crossover_pairs(n_pairs, crossover_p, rng)
+    return _swap_pairs(new_population, mask)
+
+
+def blend_crossover(
+    population: np.ndarray,
+    alpha: float = 0.5,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Produce real valued child chromosomes from pairs of parent chromosomes
+    with blend crossover (BLX-alpha). Each gene of the children is drawn
+    uniformly from the interval spanned by the parent genes, extended by
+    ``alpha`` times its length on both sides.
+
+    Args:
+        population (np.ndarray): Real valued parent population
+        alpha (float, optional): Extension of the sampling interval.
+            Defaults to 0.5.
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Child population
+    """
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    n_pairs = new_population.shape[0] // 2
+    if n_pairs == 0:
+        return new_population
+
+    chromosomes1 = new_population[0 : 2 * n_pairs : 2]
+    chromosomes2 = new_population[1 : 2 * n_pairs : 2]
+    distance = np.abs(chromosomes1 - chromosomes2)
+    lower = np.minimum(chromosomes1, chromosomes2) - alpha * distance
+    width = (1 + 2 * alpha) * distance
+
+    crossed = _crossover_pairs(n_pairs, crossover_p, rng)
+    for children in (chromosomes1, chromosomes2):
+        blended = rng.random(children.shape, dtype=children.dtype)
+        blended *= width
+        blended += lower
+        np.copyto(children, blended, where=crossed)
     return new_population
+
+
+def one_way_crossover_packed(
+    population: np.ndarray,
+    chromosome_length: int,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Perform :py:func:`one_way_crossover` on packed binary chromosomes by
+    masking whole bytes, without unpacking the genes.
+
+    Args:
+        population (np.ndarray): Packed parent population, as created by
+            :py:func:`~genopt.population.init_packed`
+        chromosome_length (int): Number of genes in each chromosome
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Packed child population
+    """
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    popsize, n_bytes = new_population.shape
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    cross_points = rng.integers(1, chromosome_length - 1, size=(n_pairs, 1))
+    mask = _packed_prefix_mask(cross_points, n_bytes)
+    mask *= _crossover_pairs(n_pairs, crossover_p, rng).astype(np.uint8)
+    return _swap_pairs(new_population, mask)
+
+
+def k_point_crossover_packed(
+    population: np.ndarray,
+    chromosome_length: int,
+    k: int,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Perform :py:func:`k_point_crossover` on packed binary chromosomes by
+    masking whole bytes, without unpacking the genes.
+
+    Args:
+        population (np.ndarray): Packed parent population, as created by
+            :py:func:`~genopt.population.init_packed`
+        chromosome_length (int): Number of genes in each chromosome
+        k (int): Number of crossover points
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Packed child population
+    """
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    popsize, n_bytes = new_population.shape
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    # The XOR of the masks left of each point swaps every other segment
+    cross_points = _random_cross_points(n_pairs, 1, chromosome_length, k, rng)
+    mask = _packed_prefix_mask(cross_points[:, :1], n_bytes)
+    for i_point in range(1, k):
+        mask ^= _packed_prefix_mask(cross_points[:, i_point : i_point + 1], n_bytes)
+    mask *= _crossover_pairs(n_pairs, crossover_p, rng).astype(np.uint8)
+    return _swap_pairs(new_population, mask)
+
+
+def uniform_crossover_packed(
+    population: np.ndarray,
+    chromosome_length: int,
+    swap_p: float = 0.5,
+    crossover_p: float = 1.0,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Perform :py:func:`uniform_crossover` on packed binary chromosomes. With
+    the default ``swap_p`` of 0.5 the swap mask is drawn as random bytes.
+
+    Args:
+        population (np.ndarray): Packed parent population, as created by
+            :py:func:`~genopt.population.init_packed`
+        chromosome_length (int): Number of genes in each chromosome
+        swap_p (float, optional): Probability of swapping each gene.
+            Defaults to 0.5.
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Packed child population
+    """
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    popsize, n_bytes = new_population.shape
+    n_pairs = popsize // 2
+    if n_pairs == 0:
+        return new_population
+
+    if swap_p == 0.5:
+        mask = rng.integers(256, size=(n_pairs, n_bytes), dtype=np.uint8)
+    else:
+        # Draw the genes of a chunk of pairs at a time and pack them at once
+        mask = np.empty((n_pairs, n_bytes), dtype=np.uint8)
+        chunk_size = max(1, RANDOM_MASK_CHUNK_SIZE // chromosome_length)
+        for start in range(0, n_pairs, chunk_size):
+            swap = rng.random((min(chunk_size, n_pairs - start), chromosome_length))
+            mask[start : start + chunk_size] = np.packbits(swap < swap_p, axis=1)
+    mask *= _crossover_pairs(n_pairs, crossover_p, rng).astype(np.uint8)
+    return _swap_pairs(new_population, mask)
+
+
+# Crossover operators for unpacked and packed chromosomes by name, the
+# crossover_method of GeneticOptimizer
+CROSSOVER_METHODS = {
+    "one_way": (one_way_crossover, one_way_crossover_packed),
+    "two_point": (k_point_crossover, k_point_crossover_packed),
+    "k_point": (k_point_crossover, k_point_crossover_packed),
+    "uniform": (uniform_crossover, uniform_crossover_packed),
+    "blend": (blend_crossover, None),
+}
@@ -0,0 +1,465 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import pickle
+import secrets
+import socket
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from genopt.evaluation import Evaluator, evaluate_worker_chunk, init_worker
+from genopt.rng import SeedLike, spawn_seeds
+
+LOGGER = logging.getLogger(__name__)
+
+# Environment variable holding the authkey of the evaluator for workers
+# started from the command line
+AUTHKEY_ENV = "GENOPT_AUTHKEY"
+
+# Seconds between checks for new workers and timed out batches
+POLL_INTERVAL = 0.1
+
+
+class _Worker:
+    # Connection and outstanding batches of a registered worker
+    def __init__(self, worker_id: int, connection: Connection, info: dict):
+        self.worker_id = worker_id
+        self.connection = connection
+        self.info = info
+        self.objective_version = None
+        self.tasks = {}
+        self.n_completed = 0
+
+
+# pylint: disable=R0902
+class DistributedEvaluator(Evaluator):
+    """Evaluate the population on worker processes that connect over TCP,
+    e.g. from other nodes of a cluster.
+
+    The evaluator listens on ``address`` and workers register by connecting
+    to it with :py:func:`run_worker`, or from the command line with
+    ``python -m genopt.distributed --host HOST --port PORT``. Workers can
+    join and leave at any time. Each evaluation splits the population into
+    batches that are sent to the workers, and the fitness scores are
+    reassembled in population order. Batches of a worker that disconnects,
+    or that do not finish within ``task_timeout``, are sent to another
+    worker. The objective function is sent to each worker once, like with
+    the :py:class:`~genopt.evaluation.ProcessPoolEvaluator`, and must be
+    picklable.
+
+    Messages are pickled, so only accept workers on a trusted network.
+    Workers must know ``authkey`` to connect. A random key is generated if
+    none is given, and passed to workers started from the command line with
+    the ``GENOPT_AUTHKEY`` environment variable.
+
+    Args:
+        address (Tuple[str, int], optional): Host and port to listen on. Port
+            0 picks a free port, see ``address`` of the created evaluator.
+            Defaults to ('127.0.0.1', 0).
+        authkey (bytes, optional): Shared secret of the evaluator and its
+            workers, see ``authkey`` of the created evaluator. Generates a
+            random hexadecimal key if None. Defaults to None.
+        batch_size (int, optional): Number of chromosomes per batch. Splits
+            the population into four batches per worker if None.
+            Defaults to None.
+        max_pending (int, optional): Number of batches a worker can hold at
+            once, so that it can start on the next batch while results are
+            in transit. Defaults to 2.
+        task_timeout (float, optional): Seconds after which a batch is
+            considered lost and its worker is dropped. Waits forever if None.
+            Defaults to None.
+        worker_timeout (float, optional): Seconds to wait for a worker to
+            register when there is none. Defaults to 60.
+        max_retries (int, optional): Number of times a lost batch is sent
+            again before the evaluation fails. Defaults to 3.
+        seed (SeedLike, optional): Seed for the random streams returned by
+            :py:func:`~genopt.evaluation.worker_rng`, with one independent
+            stream per batch. Defaults to None.
+
+    Attributes:
+        address (Tuple[str, int]): Host and port the evaluator listens on
+        authkey (bytes): Shared secret that workers connect with
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        authkey: bytes = None,
+        batch_size: int = None,
+        max_pending: int = 2,
+        task_timeout: float = None,
+        worker_timeout: float = 60.0,
+        max_retries: int = 3,
+        seed: SeedLike = None,
+    ):
+        assert batch_size is None or batch_size > 0, "Batch size must be larger than 0"
+        assert max_pending > 0, "Max pending must be larger than 0"
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.task_timeout = task_timeout
+        self.worker_timeout = worker_timeout
+        self.max_retries = max_retries
+        self.seed_seq = None if seed is None else spawn_seeds(seed, 1)[0]
+        self.authkey = (
+            authkey if authkey is not None else secrets.token_hex(32).encode()
+        )
+        self._listener = Listener(tuple(address), authkey=self.authkey)
+        self.address = self._listener.address
+        self._workers = {}
+        self._new_workers = []
+        self._registered = threading.Condition()
+        self._next_worker_id = 0
+        self._n_evaluations = 0
+        self._objective_function = None
+        self._objective_payload = None
+        self._objective_version = 0
+        self._closed = False
+        self._accept_thread = threading.Thread(target=self._accept, daemon=True)
+        self._accept_thread.start()
+
+    @property
+    def n_workers(self) -> int:
+        """int: Number of registered workers"""
+        with self._registered:
+            return len(self._workers) + len(self._new_workers)
+
+    @property
+    def workers(self) -> Dict[int, dict]:
+        """Dict[int, dict]: Host, process id and number of evaluated batches
+        of every registered worker by worker id"""
+        with self._registered:
+            workers = list(self._workers.values()) + self._new_workers
+        return {
+            worker.worker_id: dict(worker.info, n_completed=worker.n_completed)
+            for worker in workers
+        }
+
+    def wait_for_workers(self, n_workers: int = 1, timeout: float = None) -> int:
+        """Wait until at least n_workers workers are registered
+
+        Args:
+            n_workers (int, optional): Number of workers to wait for.
+                Defaults to 1.
+            timeout (float, optional): Maximum number of seconds to wait.
+                Waits forever if None. Defaults to None.
+
+        Returns:
+            int: Number of registered workers
+        """
+        with self._registered:
+            self._registered.wait_for(
+                lambda: len(self._workers) + len(self._new_workers) >= n_workers,
+                timeout,
+            )
+            return len(self._workers) + len(self._new_workers)
+
+    def _accept(self):
+        # Register connecting workers until the evaluator is closed
+        while not self._closed:
+            try:
+                connection = self._listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                continue
+            if self._closed:
+                connection.close()
+                break
+            try:
+                message = connection.recv() if connection.poll(10) else None
+                if not isinstance(message, tuple) or message[0] != "register":
+                    raise EOFError("Expected registration")
+                with self._registered:
+                    worker_id = self._next_worker_id
+                    self._next_worker_id += 1
+                connection.send(("registered", worker_id))
+            except (OSError, EOFError, pickle.UnpicklingError):
+                connection.close()
+                continue
+            with self._registered:
+                self._new_workers.append(_Worker(worker_id, connection, message[1]))
+                self._registered.notify_all()
+            LOGGER.info("Worker %d registered - %s", worker_id, message[1])
+
+    def _collect_new_workers(self):
+        with self._registered:
+            for worker in self._new_workers:
+                self._workers[worker.worker_id] = worker
+            self._new_workers = []
+
+    def _set_objective(self, objective_function: Callable):
+        # Pickle the objective once, and send it lazily to every worker
+        if objective_function is not self._objective_function:
+            self._objective_payload = pickle.dumps(objective_function)
+            self._objective_function = objective_function
+            self._objective_version += 1
+
+    def evaluate(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        variables = np.atleast_2d(variables)
+        popsize = variables.shape[0]
+        if popsize == 0:
+            return np.zeros(0)
+        self._set_objective(objective_function)
+        if self.wait_for_workers(1, self.worker_timeout) == 0:
+            raise RuntimeError("No workers registered with the evaluator")
+
+        batch_size = self.batch_size or max(1, -(-popsize // (4 * self.n_workers)))
+        starts = range(0, popsize, batch_size)
+        seed_seqs = (
+            self.seed_seq.spawn(len(starts))
+            if self.seed_seq is not None
+            else [None] * len(starts)
+        )
+        batches = [
+            (
+                variables[start : start + batch_size],
+                vectorized,
+                chunk_size,
+                n_objectives,
+                seed_seq,
+            )
+            for start, seed_seq in zip(starts, seed_seqs)
+        ]
+        self._n_evaluations += 1
+        results = self._run_batches(batches)
+        return np.concatenate(results)
+
+    def _run_batches(self, batches: List[tuple]) -> list:
+        # Dispatch the batches and collect their results until all are done.
+        # Batches are keyed by evaluation, so that late results of an earlier
+        # failed evaluation are ignored
+        results = [None] * len(batches)
+        pending = deque(range(len(batches)))
+        retries = [0] * len(batches)
+        n_done = 0
+        try:
+            while n_done < len(batches):
+                self._collect_new_workers()
+                if not self._workers:
+                    if self.wait_for_workers(1, self.worker_timeout) == 0:
+                        raise RuntimeError("All workers of the evaluator were lost")
+                    continue
+                self._dispatch(batches, pending, retries)
+
+                connections = [worker.connection for worker in self._workers.values()]
+                for connection in wait(connections, POLL_INTERVAL):
+                    worker = next(
+                        worker
+                        for worker in self._workers.values()
+                        if worker.connection is connection
+                    )
+                    try:
+                        kind, key, payload = connection.recv()
+                    except (OSError, EOFError):
+                        self._drop_worker(worker, pending, retries, "disconnected")
+                        continue
+                    if worker.tasks.pop(key, None) is None:
+                        continue
+                    if kind == "error":
+                        raise RuntimeError(
+                            f"Objective function failed on worker "
+                            f"{worker.worker_id}:\n{payload}"
+                        )
+                    worker.n_completed += 1
+                    results[key[1]] = payload
+                    n_done += 1
+                self._check_timeouts(pending, retries)
+        finally:
+            # Results still in flight are ignored by the next evaluation
+            for worker in self._workers.values():
+                worker.tasks.clear()
+        return results
+
+    def _dispatch(self, batches: List[tuple], pending: deque, retries: List[int]):
+        # Fill up every worker with one batch before giving any a second one
+        for n_pending in range(self.max_pending):
+            for worker in list(self._workers.values()):
+                if not pending or len(worker.tasks) > n_pending:
+                    continue
+                index = pending.popleft()
+                key = (self._n_evaluations, index)
+                try:
+                    if worker.objective_version != self._objective_version:
+                        worker.connection.send(
+                            ("objective", None, self._objective_payload)
+                        )
+                        worker.objective_version = self._objective_version
+                    worker.connection.send(("evaluate", key, batches[index]))
+                except (OSError, EOFError):
+                    pending.appendleft(index)
+                    self._drop_worker(worker, pending, retries, "disconnected")
+                    continue
+                worker.tasks[key] = time.monotonic()
+
+    def _check_timeouts(self, pending: deque, retries: List[int]):
+        if self.task_timeout is None:
+            return
+        now = time.monotonic()
+        for worker in list(self._workers.values()):
+            if any(now - sent > self.task_timeout for sent in worker.tasks.values()):
+                self._drop_worker(worker, pending, retries, "timed out")
+
+    def _drop_worker(
+        self, worker: _Worker, pending: deque, retries: List[int], reason: str
+    ):
+        # Forget a lost worker and send its batches to the other workers
+        LOGGER.warning(
+            "Worker %d %s - Resending %d batches",
+            worker.worker_id,
+            reason,
+            len(worker.tasks),
+        )
+        with self._registered:
+            del self._workers[worker.worker_id]
+        worker.connection.close()
+        for _, index in worker.tasks:
+            retries[index] += 1
+            if retries[index] > self.max_retries:
+                raise RuntimeError(
+                    f"Batch {index} was lost {retries[index]} times, giving up"
+                )
+            pending.appendleft(index)
+        worker.tasks.clear()
+
+    def close(self):
+        """Stop the workers and stop listening for new ones"""
+        if self._closed:
+            return
+        self._closed = True
+        self._collect_new_workers()
+        for worker in self._workers.values():
+            try:
+                worker.connection.send(("stop", None, None))
+            except (OSError, EOFError):
+                pass
+            worker.connection.close()
+        self._workers.clear()
+
+        # Wake up the thread blocked on accepting connections
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError, multiprocessing.AuthenticationError):
+            pass
+        self._accept_thread.join(timeout=5)
+        self._listener.close()
+
+
+def _connect(address: Tuple[str, int], authkey: bytes, timeout: float) -> Connection:
+    # Retry until the evaluator listens, since workers may start before it
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(tuple(address), authkey=authkey)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(POLL_INTERVAL)
+
+
+def run_worker(
+    address: Tuple[str, int],
+    authkey: bytes,
+    connect_timeout: float = 30.0,
+) -> int:
+    """Register with a :py:class:`DistributedEvaluator` and evaluate the
+    batches it sends until it is closed or the connection is lost
+
+    Args:
+        address (Tuple[str, int]): Host and port of the evaluator
+        authkey (bytes): Shared secret of the evaluator and its workers, see
+            ``authkey`` of the evaluator
+        connect_timeout (float, optional): Seconds to keep retrying while the
+            evaluator is not listening yet. Defaults to 30.
+
+    Returns:
+        int: Number of evaluated batches
+    """
+    connection = _connect(address, authkey, connect_timeout)
+    n_batches = 0
+    objective_error = None
+    with connection:
+        try:
+            connection.send(
+                ("register", {"host": socket.gethostname(), "pid": os.getpid()})
+            )
+            connection.recv()
+            while True:
+                kind, key, task = connection.recv()
+                if kind == "stop":
+                    break
+                if kind == "objective":
+                    objective_error = None
+                    try:
+                        init_worker(pickle.loads(task))
+                    except Exception:  # pylint: disable=W0703
+                        objective_error = traceback.format_exc()
+                    continue
+
+                if objective_error is not None:
+                    reply = ("error", key, objective_error)
+                else:
+                    try:
+                        reply = ("result", key, evaluate_worker_chunk(task))
+                    except Exception:  # pylint: disable=W0703
+                        reply = ("error", key, traceback.format_exc())
+                connection.send(reply)
+                n_batches += 1
+        except (OSError, EOFError):
+            LOGGER.info("Lost connection to the evaluator")
+    return n_batches
+
+
+def parse_args(argv: Sequence[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m genopt.distributed",
+        description="Start workers for a genopt DistributedEvaluator. The "
+        f"authkey of the evaluator is read from the {AUTHKEY_ENV} environment "
+        "variable.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Evaluator host")
+    parser.add_argument("--port", type=int, required=True, help="Evaluator port")
+    parser.add_argument(
+        "--processes", type=int, default=1, help="Number of worker processes"
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait for the evaluator to listen",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] = None):
+    args = parse_args(argv)
+    authkey = os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        raise SystemExit(f"Set {AUTHKEY_ENV} to the authkey of the evaluator")
+    worker_args = ((args.host, args.port), authkey.encode(), args.connect_timeout)
+    if args.processes == 1:
+        run_worker(*worker_args)
+        return
+    processes = [
+        multiprocessing.Process(target=run_worker, args=worker_args)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
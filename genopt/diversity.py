@@ -0,0 +1,237 @@
+import logging
+
+import numpy as np
+
+from genopt.population import unpack_population
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of packed chromosomes unpacked at once when counting genes
+UNPACK_CHUNK_SIZE = 4096
+
+
+def gene_counts(population: np.ndarray, chromosome_length: int = None) -> np.ndarray:
+    """Count the chromosomes with a one in each gene of a binary population
+
+    Args:
+        population (np.ndarray): Binary population as a 2d array
+        chromosome_length (int, optional): Number of genes of packed
+            chromosomes. The population is unpacked in chunks if given, and
+            used as is if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Number of ones in each gene
+    """
+    population = np.atleast_2d(population)
+    if chromosome_length is None:
+        return population.sum(axis=0, dtype=np.int64)
+
+    counts = np.zeros(chromosome_length, dtype=np.int64)
+    for start in range(0, population.shape[0], UNPACK_CHUNK_SIZE):
+        chunk = population[start : start + UNPACK_CHUNK_SIZE]
+        counts += unpack_population(chunk, chromosome_length).sum(
+            axis=0, dtype=np.int64
+        )
+    return counts
+
+
+def mean_hamming_distance(
+    population: np.ndarray, chromosome_length: int = None
+) -> float:
+    """Compute the mean Hamming distance between all pairs of chromosomes of a
+    binary population, i.e. the mean popcount of their XOR. A gene where
+    ``c`` of ``n`` chromosomes are one differs in ``c * (n - c)`` pairs, so
+    the mean is computed from the gene counts in O(popsize * length) instead
+    of comparing all pairs.
+
+    Args:
+        population (np.ndarray): Binary population as a 2d array
+        chromosome_length (int, optional): Number of genes of packed
+            chromosomes, None if the population is not packed.
+            Defaults to None.
+
+    Returns:
+        float: Mean pairwise Hamming distance
+    """
+    popsize = np.atleast_2d(population).shape[0]
+    if popsize < 2:
+        return 0.0
+    counts = gene_counts(population, chromosome_length)
+    n_differing = np.sum(counts * (popsize - counts))
+    return float(2 * n_differing / (popsize * (popsize - 1)))
+
+
+def gene_variance(population: np.ndarray) -> np.ndarray:
+    """Compute the variance of each gene of a real valued population
+
+    Args:
+        population (np.ndarray): Real valued population as a 2d array
+
+    Returns:
+        np.ndarray: Variance of each gene
+    """
+    return np.atleast_2d(population).var(axis=0, dtype=np.float64)
+
+
+class DiversityMonitor:
+    """Measure the diversity of the population of a
+    :py:class:`~genopt.GeneticOptimizer` after every generation, and respond
+    when it drops below a threshold. Binary populations are measured by the
+    mean pairwise Hamming distance divided by the chromosome length, which is
+    about 0.5 for a random population and 0 when all chromosomes are equal.
+    Real valued populations are measured by the mean variance of their
+    variables, which is about 1 for a random population.
+
+    When the diversity is below ``threshold``, a ``fraction`` of the next
+    generation is replaced after elitism, so the elite is always kept. The
+    responses are:
+
+    - 'reinitialize': Replace the chromosomes with random ones, drawn like the
+      initial population.
+    - 'mutate': Mutate the chromosomes with the mutation probability
+      ``mut_p``.
+    - None: Only measure the diversity.
+
+    Args:
+        threshold (float, optional): Diversity below which to respond.
+            Defaults to 0.1.
+        response (str, optional): Response to a low diversity. Defaults to
+            'reinitialize'.
+        fraction (float, optional): Fraction of the population that is
+            replaced. Defaults to 0.8.
+        cooldown (int, optional): Smallest number of generations between two
+            responses, which gives the new chromosomes time to spread.
+            Defaults to 5.
+        mut_p (float, optional): Mutation probability of the 'mutate'
+            response. Defaults to 0.25.
+
+    Attributes:
+        n_restarts (int): Number of responses so far
+        last_restart (int): Generation of the latest response, or None
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        response: str = "reinitialize",
+        fraction: float = 0.8,
+        cooldown: int = 5,
+        mut_p: float = 0.25,
+    ):
+        assert response in [
+            None,
+            "reinitialize",
+            "mutate",
+        ], "Response can only be reinitialize, mutate or None"
+        assert 0 < fraction <= 1, "Fraction must be between 0 and 1"
+        assert cooldown >= 0, "Cooldown cannot be negative"
+        self.threshold = threshold
+        self.response = response
+        self.fraction = fraction
+        self.cooldown = cooldown
+        self.mut_p = mut_p
+        self.n_restarts = 0
+        self.last_restart = None
+
+    def measure(self, optimizer) -> float:
+        """Measure the diversity of the population of an optimizer
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer to measure
+
+        Returns:
+            float: Diversity of the population
+        """
+        if optimizer.encoding == "real":
+            return float(gene_variance(optimizer.decode(optimizer.population)).mean())
+
+        chromosome_length = optimizer.chromosome_length if optimizer.packed else None
+        distance = mean_hamming_distance(optimizer.population, chromosome_length)
+        return distance / optimizer.chromosome_length
+
+    def should_respond(self, diversity: float, generation: int) -> bool:
+        """Check if the optimizer should respond to the diversity of a
+        generation. Counts the response if it should.
+
+        Args:
+            diversity (float): Diversity of the generation, or None if it has
+                not been measured
+            generation (int): Generation number
+
+        Returns:
+            bool: True if the optimizer should respond
+        """
+        if self.response is None or diversity is None or diversity >= self.threshold:
+            return False
+        if (
+            self.last_restart is not None
+            and generation - self.last_restart < self.cooldown
+        ):
+            return False
+        self.n_restarts += 1
+        self.last_restart = generation
+        return True
+
+    def respond(self, optimizer, population: np.ndarray, n_keep: int) -> int:
+        """Replace chromosomes of a new population of an optimizer
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer that produced the
+                population
+            population (np.ndarray): New population, changed in place
+            n_keep (int): Number of leading chromosomes to keep, e.g. elites
+
+        Returns:
+            int: Number of replaced chromosomes
+        """
+        popsize = population.shape[0]
+        n_replaced = min(int(round(self.fraction * popsize)), popsize - n_keep)
+        replaced = population[n_keep : n_keep + n_replaced]
+        if self.response == "reinitialize":
+            replaced[...] = optimizer.init_population(n_replaced)
+        else:
+            optimizer.mutate(replaced, out=replaced, mut_p=self.mut_p)
+        return n_replaced
+
+    def restart(self, optimizer, population: np.ndarray, n_keep: int) -> int:
+        """Respond to a low diversity of the evaluated population of an
+        optimizer by replacing chromosomes of its new population, if
+        :py:meth:`should_respond`
+
+        Args:
+            optimizer (GeneticOptimizer): Optimizer that produced the
+                population
+            population (np.ndarray): New population, changed in place
+            n_keep (int): Number of leading chromosomes to keep, e.g. elites
+
+        Returns:
+            int: Number of replaced chromosomes, 0 if there was no response
+        """
+        if not self.should_respond(optimizer.diversity, optimizer.generation):
+            return 0
+        n_replaced = self.respond(optimizer, population, n_keep)
+        LOGGER.info(
+            "Diversity %.3g below threshold - Response: %s of %d chromosomes",
+            optimizer.diversity,
+            self.response,
+            n_replaced,
+        )
+        return n_replaced
+
+    def get_state(self) -> np.ndarray:
+        """Get the state of the monitor for checkpoints
+
+        Returns:
+            np.ndarray: State as a 1d array
+        """
+        last_restart = -1 if self.last_restart is None else self.last_restart
+        return np.array([self.n_restarts, last_restart])
+
+    def set_state(self, state: np.ndarray):
+        """Restore a state from :py:meth:`get_state`
+
+        Args:
+            state (np.ndarray): State as a 1d array
+        """
+        self.n_restarts = int(state[0])
+        self.last_restart = None if state[1] < 0 else int(state[1])
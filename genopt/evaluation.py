@@ -1,61 +1,628 @@
-from typing import Callable, Tuple
+import asyncio
+import multiprocessing
+from typing import Callable, Sequence, Tuple, Union
 import numpy as np
 
+from genopt.rng import SeedLike, as_generator, spawn_seeds
+
+
+# pylint: disable=R0902
+class DiscreteDecoder:
+    """Decoder for populations of binary chromosomes. The bit weights and
+    scaling factors are computed once so that a whole population can be
+    decoded with a single batched matrix product.
+
+    Bits are read with the least significant bit first. ``var_range`` and
+    ``var_size`` can either be shared by all variables or given per variable.
+
+    Args:
+        n_vars (int): Number of variables in decoded chromosome
+        var_range (Tuple[float]): Variable range in decoded chromosome as a tuple
+            of floats with length 2: ``(lower, upper)``, or a sequence of such
+            tuples with one range per variable
+        var_size (Union[int, Sequence[int]]): Number of binary genes for each
+            decoded variable, or a sequence with one size per variable
+        gray (bool, optional): Interpret the genes of each variable as a
+            reflected binary Gray code. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        n_vars: int,
+        var_range: Tuple[float],
+        var_size: Union[int, Sequence[int]],
+        gray: bool = False,
+    ):
+        var_ranges = np.broadcast_to(np.asarray(var_range, dtype=float), (n_vars, 2))
+        var_sizes = np.broadcast_to(np.asarray(var_size, dtype=np.int64), (n_vars,))
+
+        self.n_vars = n_vars
+        self.gray = gray
+        self.chromosome_length = int(var_sizes.sum())
+        self.uniform = bool((var_sizes == var_sizes[0]).all())
+        self.identity = (
+            not gray
+            and (var_ranges[:, 0] == 0).all()
+            and (var_ranges[:, 1] == 1).all()
+            and (var_sizes == 1).all()
+        )
+        self.var_min = var_ranges[:, 0]
+        self.var_max = var_ranges[:, 1]
+        self.max_decimal = 2**var_sizes - 1
+        self.max_size = int(var_sizes.max())
+
+        if self.uniform:
+            self.weights = -(2 ** np.arange(self.max_size))
+            self.starts = None
+        else:
+            self.weights = np.concatenate([-(2 ** np.arange(s)) for s in var_sizes])
+            self.starts = np.concatenate(([0], np.cumsum(var_sizes)[:-1]))
+
+    def __call__(self, population: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        return self.decode(population, out)
+
+    def decode(self, population: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Decode a population of binary chromosomes
+
+        Args:
+            population (np.ndarray): Population to decode
+            out (np.ndarray, optional): Float array with shape (popsize, n_vars)
+                to write the decoded population to. Allocates a new array if
+                None. Defaults to None.
+
+        Returns:
+            np.ndarray: Decoded population with shape (popsize, n_vars)
+        """
+        # Special case where there is no need to decode
+        if self.identity:
+            if out is None:
+                return population
+            np.copyto(out, population)
+            return out
+
+        population = np.atleast_2d(population)
+        if self.uniform:
+            var_bits = population.reshape((population.shape[0], self.n_vars, -1))
+            var_decimal = var_bits @ self.weights
+        else:
+            var_decimal = np.add.reduceat(
+                population * self.weights, self.starts, axis=1
+            )
+
+        if self.gray:
+            var_decimal = -gray_to_binary(-var_decimal, self.max_size)
+
+        # Scale in place into out, in the same order as
+        # (var_min - var_max) * var_decimal / max_decimal + var_min
+        out = np.multiply(self.var_min - self.var_max, var_decimal, out=out)
+        np.divide(out, self.max_decimal, out=out)
+        np.add(out, self.var_min, out=out)
+        return out
+
+
+def gray_to_binary(gray: np.ndarray, n_bits: int) -> np.ndarray:
+    """Convert integers encoded as reflected binary Gray code to their
+    regular binary value
+
+    Args:
+        gray (np.ndarray): Gray coded non-negative integers
+        n_bits (int): Maximum number of bits in the integers
+
+    Returns:
+        np.ndarray: Integers in regular binary encoding
+    """
+    binary = np.asarray(gray).astype(np.int64)
+    shift = 1
+    while shift < n_bits:
+        binary ^= binary >> shift
+        shift *= 2
+    return binary
+
 
 def decode_discrete(
-    population: np.ndarray, n_vars: int, var_range: Tuple[float], var_size: int
+    population: np.ndarray,
+    n_vars: int,
+    var_range: Tuple[float],
+    var_size: Union[int, Sequence[int]],
+    gray: bool = False,
 ) -> np.ndarray:
     """Decode a population of binary chromosomes into an array with
-    discrete values in a variable range.
+    discrete values in a variable range. Use :py:class:`DiscreteDecoder`
+    directly to reuse the precomputed bit weights between calls.
 
     Args:
         population (np.ndarray): Population to decode
         n_vars (int): Number of variables in decoded chromosome
         var_range (Tuple[float]): Variable range in decoded chromosome as a tuple
-            of floats with length 2: ``(lower, upper)``
-        var_size (int): Number of binary genes for each decoded variable
+            of floats with length 2: ``(lower, upper)``, or one such tuple per
+            variable
+        var_size (Union[int, Sequence[int]]): Number of binary genes for each
+            decoded variable, or one size per variable
+        gray (bool, optional): Decode genes as Gray code. Defaults to False.
 
     Returns:
         np.ndarray: Decoded population with shape (popsize, n_vars)
     """
-    # Special case where there is no need to decode
-    if var_range[0] == 0 and var_range[1] == 1 and var_size == 1:
-        return population
-
-    population = np.atleast_2d(population.copy())
-    popsize = population.shape[0]
-    decoded = np.zeros((popsize, n_vars))
-    var_min = var_range[0]
-    var_max = var_range[1]
-
-    # Has room for optimization
-    for i_indiv in range(popsize):
-        for i_var in range(n_vars):
-            var_bits = population[
-                i_indiv,
-                i_var * var_size : (i_var * var_size + var_size),
-            ]
-            var_decimal = var_bits.dot(-(2 ** np.arange(var_bits.size)))
-            var_scaled = (var_min - var_max) * var_decimal / (
-                2 ** var_size - 1
-            ) + var_min
-            decoded[i_indiv, i_var] = var_scaled
-
-    return decoded
-
-
-def evaluate(variables: np.ndarray, objective_function: Callable) -> np.ndarray:
+    return DiscreteDecoder(n_vars, var_range, var_size, gray)(population)
+
+
+def read_only(variables: np.ndarray) -> np.ndarray:
+    """Get a read-only 2d view of decoded chromosomes, which protects them
+    from objective functions without copying
+
+    Args:
+        variables (np.ndarray): Decoded chromosomes
+
+    Returns:
+        np.ndarray: Read-only view of the chromosomes
+    """
+    view = np.atleast_2d(variables).view()
+    view.flags.writeable = False
+    return view
+
+
+def evaluate(
+    variables: np.ndarray,
+    objective_function: Callable,
+    vectorized: bool = False,
+    chunk_size: int = None,
+    n_objectives: int = 1,
+) -> np.ndarray:
     """Evaluate the fitness scores of a population
 
     Args:
         variables (np.ndarray): Decoded chromosomes
         objective_function (Callable): Objective function that takes a
             single chromosome as input and returns a fitness score.
+        vectorized (bool, optional): If True, the objective function takes a
+            2d array of decoded chromosomes and returns one fitness score per
+            row. Defaults to False.
+        chunk_size (int, optional): Number of chromosomes passed to a
+            vectorized objective function per call. The last chunk may be
+            smaller. Passes the whole population at once if None. Does nothing
+            if vectorized=False. Defaults to None.
+        n_objectives (int, optional): Number of objectives returned for each
+            chromosome. Defaults to 1.
+
+    Raises:
+        ValueError: If the objective function does not return n_objectives
+            fitness scores per chromosome
 
     Returns:
-        np.ndarray: Fitness scores with shape (popsize, )
+        np.ndarray: Fitness scores with shape (popsize, ), or
+            (popsize, n_objectives) if n_objectives > 1
     """
-    variables = np.atleast_2d(variables.copy())
+    variables = read_only(variables)
     popsize = variables.shape[0]
+    if vectorized:
+        return evaluate_vectorized(
+            variables, objective_function, chunk_size, n_objectives
+        )
+
+    if popsize == 0:
+        return np.zeros(0)
     fitness = [objective_function(variables[i, :]) for i in range(popsize)]
-    return np.array(fitness)
+    return _check_chunk_fitness(fitness, variables, n_objectives)
+
+
+def evaluate_vectorized(
+    variables: np.ndarray,
+    objective_function: Callable,
+    chunk_size: int = None,
+    n_objectives: int = 1,
+) -> np.ndarray:
+    """Evaluate the fitness scores of a population with an objective function
+    that scores a whole batch of chromosomes in one call
+
+    Args:
+        variables (np.ndarray): Decoded chromosomes as a 2d array
+        objective_function (Callable): Objective function that takes a 2d
+            array of chromosomes and returns an array of fitness scores
+        chunk_size (int, optional): Maximum number of chromosomes per call.
+            Defaults to None.
+        n_objectives (int, optional): Number of objectives returned for each
+            chromosome. Defaults to 1.
+
+    Raises:
+        ValueError: If the objective function does not return n_objectives
+            fitness scores per chromosome
+
+    Returns:
+        np.ndarray: Fitness scores with shape (popsize, ), or
+            (popsize, n_objectives) if n_objectives > 1
+    """
+    popsize = variables.shape[0]
+    if chunk_size is None:
+        chunk_size = max(popsize, 1)
+
+    fitness = []
+    for start in range(0, popsize, chunk_size):
+        chunk = variables[start : start + chunk_size]
+        fitness.append(
+            _check_chunk_fitness(objective_function(chunk), chunk, n_objectives)
+        )
+
+    if not fitness:
+        return np.zeros(0)
+    return np.concatenate(fitness)
+
+
+def _check_chunk_fitness(
+    chunk_fitness, chunk: np.ndarray, n_objectives: int = 1
+) -> np.ndarray:
+    # Multi-objective functions return one row of objectives per chromosome.
+    # A single objective may also be returned as a column
+    chunk_fitness = np.asarray(chunk_fitness)
+    expected = (
+        (chunk.shape[0],) if n_objectives == 1 else (chunk.shape[0], n_objectives)
+    )
+    if n_objectives == 1 and chunk_fitness.shape == (chunk.shape[0], 1):
+        chunk_fitness = chunk_fitness.reshape(expected)
+    if chunk_fitness.shape != expected:
+        raise ValueError(
+            f"Objective function returned fitness with shape {chunk_fitness.shape}, "
+            f"expected {expected}"
+        )
+    return chunk_fitness
+
+
+async def evaluate_async(
+    variables: np.ndarray,
+    objective_function: Callable,
+    max_concurrency: int = None,
+    vectorized: bool = False,
+    chunk_size: int = None,
+    n_objectives: int = 1,
+) -> np.ndarray:
+    """Evaluate the fitness scores of a population concurrently with an
+    ``async def`` objective function
+
+    Args:
+        variables (np.ndarray): Decoded chromosomes
+        objective_function (Callable): Coroutine function that takes a single
+            chromosome, or a 2d array of chromosomes if vectorized=True, and
+            returns its fitness
+        max_concurrency (int, optional): Maximum number of objective function
+            calls awaited at the same time. No limit if None. Defaults to None.
+        vectorized (bool, optional): If the objective function takes a 2d
+            array of chromosomes. Defaults to False.
+        chunk_size (int, optional): Chromosomes per call to a vectorized
+            objective function. Defaults to None.
+        n_objectives (int, optional): Number of objectives returned for each
+            chromosome. Defaults to 1.
+
+    Returns:
+        np.ndarray: Fitness scores with shape (popsize, ), or
+            (popsize, n_objectives) if n_objectives > 1
+    """
+    variables = np.atleast_2d(variables)
+    popsize = variables.shape[0]
+    if vectorized:
+        step = chunk_size or max(popsize, 1)
+        batches = [variables[i : i + step] for i in range(0, popsize, step)]
+    else:
+        batches = [variables[i, :] for i in range(popsize)]
+
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def call(batch: np.ndarray):
+        if semaphore is None:
+            return await objective_function(batch)
+        async with semaphore:
+            return await objective_function(batch)
+
+    results = await asyncio.gather(*(call(batch) for batch in batches))
+    if not results:
+        return np.zeros(0)
+    if not vectorized:
+        return _check_chunk_fitness(results, variables, n_objectives)
+    return np.concatenate(
+        [
+            _check_chunk_fitness(result, batch, n_objectives)
+            for result, batch in zip(results, batches)
+        ]
+    )
+
+
+class Evaluator:
+    """Base class for evaluation backends of
+    :py:class:`~genopt.GeneticOptimizer`. An evaluator receives the decoded
+    population and returns its fitness scores in population order.
+
+    Evaluators can hold resources such as worker processes, which are released
+    by :py:meth:`close` or by using the evaluator as a context manager.
+    """
+
+    def evaluate(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        """Evaluate the fitness scores of a population
+
+        Args:
+            variables (np.ndarray): Decoded chromosomes
+            objective_function (Callable): Objective function
+            vectorized (bool, optional): If the objective function takes a 2d
+                array of chromosomes. Defaults to False.
+            chunk_size (int, optional): Chromosomes per call to a vectorized
+                objective function. Defaults to None.
+            n_objectives (int, optional): Number of objectives returned for
+                each chromosome. Defaults to 1.
+
+        Returns:
+            np.ndarray: Fitness scores with shape (popsize, ), or
+                (popsize, n_objectives) if n_objectives > 1
+        """
+        raise NotImplementedError
+
+    async def evaluate_async(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        """Evaluate the fitness scores of a population from within a running
+        event loop. Blocks the loop while evaluating unless the evaluator
+        overrides this method.
+
+        Args:
+            variables (np.ndarray): Decoded chromosomes
+            objective_function (Callable): Objective function
+            vectorized (bool, optional): If the objective function takes a 2d
+                array of chromosomes. Defaults to False.
+            chunk_size (int, optional): Chromosomes per call to a vectorized
+                objective function. Defaults to None.
+            n_objectives (int, optional): Number of objectives returned for
+                each chromosome. Defaults to 1.
+
+        Returns:
+            np.ndarray: Fitness scores with shape (popsize, ), or
+                (popsize, n_objectives) if n_objectives > 1
+        """
+        return self.evaluate(
+            variables, objective_function, vectorized, chunk_size, n_objectives
+        )
+
+    def close(self):
+        """Release the resources held by the evaluator"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SerialEvaluator(Evaluator):
+    """Evaluate the population in the current process, one chromosome or
+    chunk at a time. This is the default evaluator.
+    """
+
+    def evaluate(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        return evaluate(
+            variables, objective_function, vectorized, chunk_size, n_objectives
+        )
+
+
+_WORKER_OBJECTIVE = None
+_WORKER_RNG = None
+
+
+def worker_rng() -> np.random.Generator:
+    """Get the random number generator for the chromosomes currently being
+    evaluated. Objective functions that need random numbers can use it to
+    stay reproducible when evaluated by a seeded
+    :py:class:`ProcessPoolEvaluator`, where each chunk of chromosomes gets
+    its own independent stream. Outside of a seeded worker a generator
+    seeded by the operating system is returned.
+
+    Returns:
+        np.random.Generator: Random number generator
+    """
+    global _WORKER_RNG  # pylint: disable=W0603
+    if _WORKER_RNG is None:
+        _WORKER_RNG = as_generator()
+    return _WORKER_RNG
+
+
+def init_worker(objective_function: Callable):
+    """Set the objective function of the current worker process. Workers
+    store the objective so that it, and any data bound to it, is only
+    transferred once per worker process.
+
+    Args:
+        objective_function (Callable): Objective function evaluated by
+            :py:func:`evaluate_worker_chunk`
+    """
+    global _WORKER_OBJECTIVE  # pylint: disable=W0603
+    _WORKER_OBJECTIVE = objective_function
+
+
+def evaluate_worker_chunk(
+    args: Tuple[np.ndarray, bool, int, int, np.random.SeedSequence],
+) -> np.ndarray:
+    """Evaluate a chunk of chromosomes with the objective function set by
+    :py:func:`init_worker`.
+
+    Args:
+        args (Tuple[np.ndarray, bool, int, int, np.random.SeedSequence]):
+            Decoded variables, whether the objective is vectorized, chunk
+            size, number of objectives and the seed of the random number
+            generator returned by :py:func:`worker_rng`. Keeps the current
+            generator if the seed is None.
+
+    Returns:
+        np.ndarray: Fitness of the chromosomes
+    """
+    global _WORKER_RNG  # pylint: disable=W0603
+    variables, vectorized, chunk_size, n_objectives, seed_seq = args
+    if seed_seq is not None:
+        _WORKER_RNG = as_generator(seed_seq)
+    return evaluate(variables, _WORKER_OBJECTIVE, vectorized, chunk_size, n_objectives)
+
+
+class ProcessPoolEvaluator(Evaluator):
+    """Evaluate the population in parallel on a pool of worker processes.
+
+    The pool is started on the first evaluation and kept alive between
+    generations. The objective function is sent to each worker once, when
+    the worker starts, so large data bound to it (e.g. with
+    ``functools.partial``) is not pickled again for every chromosome. The pool
+    is restarted if it is used with a different objective function.
+
+    Args:
+        n_workers (int, optional): Number of worker processes. Uses the
+            number of CPUs if None. Defaults to None.
+        worker_chunk_size (int, optional): Number of chromosomes sent to a
+            worker per task. Splits the population into four tasks per worker
+            if None. Defaults to None.
+        mp_context (str, optional): Multiprocessing start method, e.g. 'fork'
+            or 'spawn'. Uses the platform default if None. Defaults to None.
+        seed (SeedLike, optional): Seed for the random streams returned by
+            :py:func:`worker_rng`. Every chunk of every evaluation gets an
+            independent stream spawned from the seed, so results do not
+            depend on which worker evaluates a chunk. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        n_workers: int = None,
+        worker_chunk_size: int = None,
+        mp_context: str = None,
+        seed: SeedLike = None,
+    ):
+        assert n_workers is None or n_workers > 0, "Number of workers must be > 0"
+        assert (
+            worker_chunk_size is None or worker_chunk_size > 0
+        ), "Worker chunk size must be larger than 0"
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.worker_chunk_size = worker_chunk_size
+        self.mp_context = mp_context
+        self.seed_seq = None if seed is None else spawn_seeds(seed, 1)[0]
+        self._pool = None
+        self._objective_function = None
+
+    def _get_pool(self, objective_function: Callable):
+        if self._pool is None or self._objective_function is not objective_function:
+            self.close()
+            context = multiprocessing.get_context(self.mp_context)
+            self._pool = context.Pool(
+                self.n_workers,
+                initializer=init_worker,
+                initargs=(objective_function,),
+            )
+            self._objective_function = objective_function
+        return self._pool
+
+    def evaluate(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        variables = np.atleast_2d(variables)
+        popsize = variables.shape[0]
+        if popsize == 0:
+            return np.zeros(0)
+
+        worker_chunk_size = self.worker_chunk_size or max(
+            1, -(-popsize // (4 * self.n_workers))
+        )
+        starts = range(0, popsize, worker_chunk_size)
+        seed_seqs = (
+            self.seed_seq.spawn(len(starts))
+            if self.seed_seq is not None
+            else [None] * len(starts)
+        )
+        tasks = [
+            (
+                variables[start : start + worker_chunk_size],
+                vectorized,
+                chunk_size,
+                n_objectives,
+                seed_seq,
+            )
+            for start, seed_seq in zip(starts, seed_seqs)
+        ]
+        # Pool.map returns the results in the same order as the tasks
+        results = self._get_pool(objective_function).map(evaluate_worker_chunk, tasks)
+        return np.concatenate(results)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._objective_function = None
+
+
+class AsyncEvaluator(Evaluator):
+    """Evaluate an ``async def`` objective function concurrently on an event
+    loop. Suitable for I/O-bound objectives, e.g. objectives that query a
+    service, where a generation then takes roughly as long as the slowest
+    batch of calls instead of the sum of all calls.
+
+    :py:meth:`evaluate` runs its own event loop and can not be called from a
+    running loop. Use :py:meth:`~genopt.GeneticOptimizer.optimize_async` in
+    that case.
+
+    Args:
+        max_concurrency (int, optional): Maximum number of objective function
+            calls awaited at the same time. No limit if None. Defaults to None.
+    """
+
+    def __init__(self, max_concurrency: int = None):
+        assert (
+            max_concurrency is None or max_concurrency > 0
+        ), "Max concurrency must be larger than 0"
+        self.max_concurrency = max_concurrency
+
+    def evaluate(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(
+                self.evaluate_async(
+                    variables, objective_function, vectorized, chunk_size, n_objectives
+                )
+            )
+        finally:
+            loop.close()
+
+    async def evaluate_async(
+        self,
+        variables: np.ndarray,
+        objective_function: Callable,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        n_objectives: int = 1,
+    ) -> np.ndarray:
+        return await evaluate_async(
+            variables,
+            objective_function,
+            self.max_concurrency,
+            vectorized,
+            chunk_size,
+            n_objectives,
+        )
@@ -1,20 +1,81 @@
+import inspect
 import logging
-from typing import Callable, Tuple
+import time
+from typing import Callable, Iterator, List, NamedTuple, Sequence, Tuple, Union
 
 import numpy as np
 
-from genopt.crossover import one_way_crossover
-from genopt.evaluation import decode_discrete, evaluate
-from genopt.mutation import mutation_discrete, mutation_real
-from genopt.population import init_discrete, init_real, update_population
-from genopt.selection import tournament_selection
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+from genopt.adaptation import (
+    Adaptation,
+    SelfAdaptiveMutation,
+    offspring_parent_fitness,
+)
+from genopt.cache import FitnessCache
+from genopt.checkpoint import (
+    get_optimizer_state,
+    load_checkpoint,
+    save_checkpoint,
+    set_optimizer_state,
+)
+from genopt.crossover import CROSSOVER_METHODS
+from genopt.diversity import DiversityMonitor
+from genopt.evaluation import (
+    AsyncEvaluator,
+    DiscreteDecoder,
+    Evaluator,
+    SerialEvaluator,
+    read_only,
+)
+from genopt.multiobjective import (
+    crowded_tournament_selection,
+    crowding_distance,
+    fast_non_dominated_sort,
+    nsga2_survival,
 )
+from genopt.mutation import (
+    mutation_discrete,
+    mutation_packed,
+    mutation_real,
+)
+from genopt.population import (
+    DTypeLike,
+    genome_dtype,
+    init_discrete,
+    init_packed,
+    init_real,
+    unpack_population,
+    update_population,
+)
+from genopt.rng import SeedLike, as_generator
+from genopt.selection import SELECTION_METHODS
+from genopt.stats import OptimizerStats, RateLimitedLogger, generation_in_range
+from genopt.surrogate import SurrogateScreening
+from genopt.termination import TerminationCriterion
+
 LOGGER = logging.getLogger(__name__)
 
 
+class GenerationRecord(NamedTuple):
+    """Summary of a generation, yielded by
+    :py:meth:`GeneticOptimizer.iter_generations` and passed to callbacks.
+    ``best_chromosome`` is a copy of the top individual. With multiple
+    objectives, ``best_fitness`` and ``mean_fitness`` hold the maximum and
+    mean of every objective. ``parameters`` holds the mutation and crossover
+    parameters for producing the next generation, after adaptation to this
+    one, and the values reported by the adaptations. ``diversity`` is the
+    diversity of the population if it is monitored, see
+    :py:class:`~genopt.diversity.DiversityMonitor`.
+    """
+
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    best_chromosome: np.ndarray
+    n_evaluations: int
+    parameters: dict = None
+    diversity: float = None
+
+
 # pylint: disable=R0902
 class GeneticOptimizer:
     """Maximize the function ``objective_function`` using genetic optimization.
@@ -27,38 +88,192 @@ class GeneticOptimizer:
         objective_function (callable): Function to optimize for. Takes
             the decoded variables as input and returns a fitness. The
             genetic optimizer will then try to maximize the fitness.
+            Can be an ``async def`` function, which is then evaluated
+            concurrently by an :py:class:`~genopt.evaluation.AsyncEvaluator`.
+            The arrays passed to it are read-only and only valid during the
+            call, since the buffers are reused for later evaluations. Copy
+            them to keep them.
         t_sel_p (float, optional): Probability of the fittest individual
             to win a tournament. Defaults to 0.7.
         t_sel_size (int, optional): Tournament size. Defaults to 1.
+        selection_method (str, optional): Selection scheme. Can be
+            'tournament', 'sus' (stochastic universal sampling), 'rank' or
+            'truncation'. Defaults to 'tournament'.
+        rank_pressure (float, optional): Expected number of copies of the
+            fittest individual if selection_method='rank'. Defaults to 1.5.
+        truncation_p (float, optional): Fraction of the fittest individuals
+            that can be selected if selection_method='truncation'.
+            Defaults to 0.5.
         mut_p (float, optional): Mutation probability, set to
             1/(n_vars*var_size) if None. Defaults to None.
         mut_var (int, optional): Mutation variance for real encoded
             variables. Does nothing if encoding='discrete'. Defaults to 1.
         encoding (str, optional): Type of variable encoding. Can be 'real'
             or 'discrete'. Defaults to 'real'.
-        var_range (tuple, optional): Range of discrete variables. Does
-            nothing if encoding='real'. Defaults to (0, 1).
+        var_range (tuple, optional): Range of discrete variables, either
+            shared by all variables or a sequence with one range per variable.
+            Does nothing if encoding='real'. Defaults to (0, 1).
         var_size (int, optional): Number of genes for each discrete
-            variables. Multiplicatively increases chromosome length.
+            variables, either shared by all variables or a sequence with one
+            size per variable. Multiplicatively increases chromosome length.
             Does nothing if encoding='real'. Defaults to 1.
+        gray (bool, optional): Decode the genes of discrete variables as Gray
+            code. Does nothing if encoding='real'. Defaults to False.
+        packed (bool, optional): Store discrete chromosomes packed into
+            bytes with eight genes per byte. Reduces memory use and lets
+            mutation and crossover work on whole bytes. Chromosomes, including
+            the one returned by :py:meth:`optimize`, are then packed and can
+            be converted with :py:meth:`unpack`. Does nothing if
+            encoding='real'. Defaults to False.
+        crossover_method (str, optional): Crossover operator. Can be
+            'one_way', 'two_point', 'k_point', 'uniform' or 'blend'. 'blend'
+            requires encoding='real'. Defaults to 'one_way'.
+        crossover_p (float, optional): Probability that a pair of parents is
+            crossed over. Defaults to 1.0.
+        crossover_points (int, optional): Number of crossover points if
+            crossover_method='k_point'. Defaults to 2.
+        blend_alpha (float, optional): Extension of the sampling interval if
+            crossover_method='blend'. Defaults to 0.5.
         elitism (int, optional): Number of copies of the best
             (maximum fitness) to transfer to the next generation.
             Defaults to 1.
+        vectorized (bool, optional): If True, ``objective_function`` takes
+            the whole decoded population as a 2d array and returns a 1d array
+            of fitness scores. Defaults to False.
+        chunk_size (int, optional): Number of chromosomes passed to a
+            vectorized objective function per call. Passes the whole
+            population if None. Defaults to None.
+        evaluator (Evaluator, optional): Backend used to evaluate the
+            population, e.g. a
+            :py:class:`~genopt.evaluation.ProcessPoolEvaluator` or a
+            :py:class:`~genopt.distributed.DistributedEvaluator`. Uses a
+            :py:class:`~genopt.evaluation.SerialEvaluator` if None, or an
+            :py:class:`~genopt.evaluation.AsyncEvaluator` if the objective
+            function is a coroutine function. Defaults to None.
+        max_concurrency (int, optional): Maximum number of concurrent calls
+            to an ``async def`` objective function. Only used when the
+            evaluator is created by the optimizer. No limit if None.
+            Defaults to None.
+        cache_size (int, optional): Number of fitness scores to memoize in a
+            :py:class:`~genopt.cache.FitnessCache`, so that identical
+            chromosomes are only evaluated once. Disables the cache if 0 and
+            never evicts scores if None. Defaults to 0.
+        seed (SeedLike, optional): Seed of the random number generator used
+            by all operators, as an integer, ``np.random.SeedSequence`` or
+            ``np.random.Generator``. Runs with the same seed are reproducible.
+            Seeds from the operating system if None. Defaults to None.
+        checkpoint_path (str, optional): Path of an ``.npz`` file where the
+            optimizer state is checkpointed during :py:meth:`optimize`. The
+            run can be continued with :py:meth:`resume`. Defaults to None.
+        checkpoint_every (int, optional): Checkpoint every n generations.
+            Defaults to None.
+        checkpoint_seconds (float, optional): Checkpoint when at least this
+            many seconds passed since the last checkpoint. Defaults to None.
+        callbacks (List[Callable], optional): Functions called with a
+            :py:class:`GenerationRecord` after every generation. The run stops
+            early if a callback returns True. Defaults to None.
+        termination (List[TerminationCriterion], optional): Criteria from
+            :py:mod:`genopt.termination` that stop the run early when any of
+            them is met, e.g. on stagnation or when an evaluation budget is
+            used up. The reason the last run stopped is stored in
+            ``termination_reason``. Defaults to None.
+        log_interval (float, optional): Minimum number of seconds between
+            progress messages logged at INFO level. The last generation of a
+            run is always logged. Defaults to 1.
+        profile_generations (Tuple[int, int], optional): Range
+            ``[start, stop)`` of generations to capture a cProfile profile
+            for, stored in ``stats.profile``. Defaults to None.
+        profile_memory (bool, optional): Also trace memory allocations with
+            tracemalloc during the profiled generations. Defaults to False.
+        surrogate (SurrogateScreening, optional): Surrogate model that
+            pre-screens each population so that only the most promising
+            chromosomes are evaluated with the objective function, see
+            :py:class:`~genopt.surrogate.SurrogateScreening`. The other
+            chromosomes get a predicted fitness. Defaults to None.
+        n_objectives (int, optional): Number of objectives. If larger than 1,
+            the objective function returns one value per objective, or a 2d
+            array of shape (popsize, n_objectives) if vectorized, and all
+            objectives are maximized with NSGA-II. Parents are then selected
+            by crowded binary tournaments instead of the selection method,
+            and offspring compete with their parents for survival by Pareto
+            front and crowding distance instead of elitism. The top
+            individual is the non-dominated individual with the largest first
+            objective, see :py:meth:`pareto_front` for the whole front.
+            Defaults to 1.
+        dtype (DTypeLike, optional): Data type of the genes, which every
+            operator preserves. Can be float32 or float64 for real encoding,
+            and bool or an integer type such as uint8 for discrete encoding.
+            Packed chromosomes are always uint8. Uses float64 for real and
+            int64 for discrete encoding if None. Defaults to None.
+        adaptation (List[Adaptation], optional): Strategies from
+            :py:mod:`genopt.adaptation` that adapt ``mut_p``, ``mut_var`` or
+            ``crossover_p`` during the run, e.g. the 1/5th success rule or
+            self-adaptive step sizes. The parameters of every generation are
+            reported in its :py:class:`GenerationRecord` and logged.
+            Defaults to None.
+        diversity_monitor (DiversityMonitor, optional): Measures the
+            diversity of every generation and replaces part of the population
+            when it collapses, see
+            :py:class:`~genopt.diversity.DiversityMonitor`. Defaults to None.
+
+    Attributes:
+        population (np.ndarray): Current population, which alternates between
+            two arrays that are overwritten by later generations. Copy it to
+            keep it. :py:meth:`pareto_front` and the records hold copies.
+        stats (OptimizerStats): Wall time and calls of every stage of the
+            generation loop, objective latencies and captured profiles, see
+            :py:class:`~genopt.stats.OptimizerStats`. Objective latencies are
+            only recorded for calls made in this process, i.e. with a
+            :py:class:`~genopt.evaluation.SerialEvaluator`.
+        ranks (np.ndarray): Pareto front index of each individual of the
+            evaluated population if n_objectives > 1
+        crowding (np.ndarray): Crowding distance of each individual within
+            its Pareto front if n_objectives > 1
+        diversity (float): Diversity of the evaluated population if a
+            diversity monitor is set
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=R0914
         self,
         n_vars: int,
         popsize: int,
         objective_function: Callable,
         t_sel_p: float = 0.7,
         t_sel_size: int = 1,
+        selection_method: str = "tournament",
+        rank_pressure: float = 1.5,
+        truncation_p: float = 0.5,
         mut_p: float = None,
         mut_var: float = 1.0,
         encoding: str = "real",
         var_range: Tuple[float] = (0, 1),
-        var_size: int = 1,
+        var_size: Union[int, Sequence[int]] = 1,
+        gray: bool = False,
+        packed: bool = False,
+        crossover_method: str = "one_way",
+        crossover_p: float = 1.0,
+        crossover_points: int = 2,
+        blend_alpha: float = 0.5,
         elitism: int = 1,
+        vectorized: bool = False,
+        chunk_size: int = None,
+        evaluator: Evaluator = None,
+        max_concurrency: int = None,
+        cache_size: int = 0,
+        seed: SeedLike = None,
+        checkpoint_path: str = None,
+        checkpoint_every: int = None,
+        checkpoint_seconds: float = None,
+        callbacks: List[Callable[[GenerationRecord], bool]] = None,
+        termination: List[TerminationCriterion] = None,
+        log_interval: float = 1.0,
+        profile_generations: Tuple[int, int] = None,
+        profile_memory: bool = False,
+        surrogate: SurrogateScreening = None,
+        n_objectives: int = 1,
+        dtype: DTypeLike = None,
+        adaptation: List[Adaptation] = None,
+        diversity_monitor: DiversityMonitor = None,
     ):
 
         # Assertions
@@ -66,95 +281,554 @@ class GeneticOptimizer:
             "discrete",
             "real",
         ], "Encoding can only be real or discrete."
-        if encoding == "discrete":
-            assert (
-                var_range[0] < var_range[1]
-            ), "First value in range must be smaller than the first"
-            assert (
-                isinstance(var_size, int) and var_size > 0
-            ), "Variable size must be an integer larger than 0"
+        assert (
+            selection_method in SELECTION_METHODS
+        ), "Selection method can only be one of " + ", ".join(SELECTION_METHODS)
+        assert (
+            crossover_method in CROSSOVER_METHODS
+        ), "Crossover method can only be one of " + ", ".join(CROSSOVER_METHODS)
+        assert (
+            crossover_method != "blend" or encoding == "real"
+        ), "Blend crossover requires real encoding"
+        assert chunk_size is None or chunk_size > 0, "Chunk size must be larger than 0"
+        assert n_objectives >= 1, "Number of objectives must be at least 1"
+        assert (
+            surrogate is None or n_objectives == 1
+        ), "Surrogate screening requires a single objective"
+        self.n_objectives = n_objectives
+        self._init_adaptation(adaptation, encoding)
+        self.diversity_monitor = diversity_monitor
 
         self.n_vars = n_vars
         self.objective_function = objective_function
         self.t_sel_p = t_sel_p
         self.t_sel_size = t_sel_size
+        self.selection_method = selection_method
+        self.rank_pressure = rank_pressure
+        self.truncation_p = truncation_p
+        self._init_encoding(encoding, var_range, var_size, gray, packed, dtype)
+        self.mut_p = (
+            1 / (self.chromosome_length - self.n_strategy_genes)
+            if mut_p is None
+            else mut_p
+        )
+        self.mut_var = mut_var
+        self.crossover_method = crossover_method
+        self.crossover_p = crossover_p
+        self.crossover_points = (
+            2 if crossover_method == "two_point" else crossover_points
+        )
+        self.blend_alpha = blend_alpha
+        self.elitism = elitism
+        self.vectorized = vectorized
+        self.chunk_size = chunk_size
+        if evaluator is not None:
+            self.evaluator = evaluator
+        elif inspect.iscoroutinefunction(objective_function):
+            self.evaluator = AsyncEvaluator(max_concurrency)
+        else:
+            self.evaluator = SerialEvaluator()
+        self.cache = FitnessCache(cache_size) if cache_size != 0 else None
+        self.surrogate = surrogate
+        self.rng = as_generator(seed)
+        self.callbacks = list(callbacks) if callbacks is not None else []
+        self.termination = list(termination) if termination is not None else []
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self._last_checkpoint = time.monotonic()
+        self.stats = OptimizerStats()
+        self.profile_generations = profile_generations
+        self.profile_memory = profile_memory
+        self._logger = RateLimitedLogger(LOGGER, log_interval)
+        self._init_run_state(popsize)
+
+    def _init_adaptation(self, adaptation: List[Adaptation], encoding: str):
+        self.adaptation = list(adaptation) if adaptation is not None else []
+        self.n_strategy_genes = sum(a.n_strategy_genes for a in self.adaptation)
+        assert (
+            not self.adaptation or self.n_objectives == 1
+        ), "Adaptation requires a single objective"
+        assert (
+            self.n_strategy_genes == 0 or encoding == "real"
+        ), "Strategy genes require real encoding"
+        self._self_adaptive = next(
+            (a for a in self.adaptation if isinstance(a, SelfAdaptiveMutation)), None
+        )
+        self._track_parents = any(a.tracks_parents for a in self.adaptation)
+
+    def _init_encoding(
+        self,
+        encoding: str,
+        var_range: Tuple[float],
+        var_size: Union[int, Sequence[int]],
+        gray: bool,
+        packed: bool,
+        dtype: DTypeLike,
+    ):
         self.encoding = encoding
         if encoding == "real":
             self.var_size = 1
+            self.decoder = None
+            self.chromosome_length = self.n_vars + self.n_strategy_genes
         else:
+            var_ranges = np.broadcast_to(np.asarray(var_range), (self.n_vars, 2))
+            var_sizes = np.broadcast_to(np.asarray(var_size), (self.n_vars,))
+            assert (
+                var_ranges[:, 0] < var_ranges[:, 1]
+            ).all(), "First value in range must be smaller than the first"
+            assert (
+                np.issubdtype(var_sizes.dtype, np.integer) and (var_sizes > 0).all()
+            ), "Variable size must be an integer larger than 0"
             self.var_size = var_size
+            self.decoder = DiscreteDecoder(self.n_vars, var_range, var_size, gray)
+            self.chromosome_length = self.decoder.chromosome_length
         self.var_range = var_range
-        if mut_p is None:
-            self.mut_p = 1 / (self.n_vars * self.var_size)
+        self.gray = gray
+        self.packed = packed and encoding == "discrete"
+        self.dtype = (
+            np.dtype(np.uint8) if self.packed else genome_dtype(encoding, dtype)
+        )
+
+    def _init_run_state(self, popsize: int):
+        if self.n_objectives == 1:
+            self.fitness = np.zeros(popsize)
         else:
-            self.mut_p = mut_p
-        self.mut_var = mut_var
-        self.elitism = elitism
-        self.fitness = np.zeros(popsize)
+            self.fitness = np.zeros((popsize, self.n_objectives))
+        self.ranks = None
+        self.crowding = None
+        self._parents = None
+        self._parent_fitness = None
         self.top_individual = None
+        self.generation = 0
+        self.n_evaluations = 0
+        self.termination_reason = None
+        self._evaluated = False
+        self._buffer = None
+        self._decoded = None
+        self.diversity = None
+        self.population = self.init_population(popsize)
+
+    def init_population(self, popsize: int) -> np.ndarray:
+        """Initialize random chromosomes with the encoding of the optimizer
 
-        # Initialize population
-        if encoding == "real":
-            self.population = init_real(popsize, self.n_vars)
-        else:
-            self.population = init_discrete(popsize, self.n_vars, self.var_size)
+        Args:
+            popsize (int): Number of chromosomes
 
-    def optimize(self, n_gen: int) -> np.ndarray:
-        """Run the genetic optimizer for n_gen generations and return the
-        top individual of the population
+        Returns:
+            np.ndarray: Random population
+        """
+        if self.encoding == "real":
+            population = init_real(
+                popsize, self.chromosome_length, self.rng, self.dtype
+            )
+            if self._self_adaptive is not None:
+                self._self_adaptive.init_steps(self, population)
+            return population
+        if self.packed:
+            return init_packed(popsize, self.n_vars, self.var_size, self.rng)
+        return init_discrete(popsize, self.n_vars, self.var_size, self.rng, self.dtype)
+
+    def optimize(self, n_gen: int = None) -> np.ndarray:
+        """Run the genetic optimizer for n_gen generations, or until a
+        termination criterion is met, and return the top individual of the
+        population
 
         Args:
-            n_gen (int): Number of generations to optimize for
+            n_gen (int, optional): Number of generations to optimize for. Only
+                stops on the termination criteria if None. Defaults to None.
 
         Returns:
             np.ndarray: Chromosome of the top individual
         """
-        for i in range(n_gen):
+        assert (
+            n_gen is not None or self.termination or self.callbacks
+        ), "Set n_gen, callbacks or termination criteria to stop the run"
+        for _ in self.iter_generations(n_gen):
+            pass
+        return self.top_individual
 
-            # Evaluate population
-            self.fitness = self.evaluate(self.population)
-            i_max = np.argmax(self.fitness)
-            self.top_individual = self.population[i_max, :]
+    def iter_generations(self, n_gen: int = None) -> Iterator[GenerationRecord]:
+        """Run the genetic optimizer and yield a :py:class:`GenerationRecord`
+        after each generation. The population is evaluated before the first
+        generation if it has not been evaluated yet, and every new generation
+        is evaluated before its record is yielded. The run stops early if the
+        consumer stops iterating, a callback returns True or a termination
+        criterion is met.
 
-            # Selection
-            tmp_population = self.select(self.population)
+        Args:
+            n_gen (int, optional): Number of generations to optimize for. Runs
+                until stopped if None. Defaults to None.
 
-            # Crossover
-            tmp_population = self.crossover(tmp_population)
+        Yields:
+            GenerationRecord: Summary of the latest generation
+        """
+        self._start_run()
+        if not self._evaluated:
+            self._set_fitness(self.evaluate(self.population))
+
+        i_gen = 0
+        try:
+            while n_gen is None or i_gen < n_gen:
+                i_gen += 1
+                self._update_profile()
+                with self.stats.timer("generation"):
+                    self.population = self._next_population()
+                    self._set_fitness(self.evaluate(self.population))
+                    record, stop = self._end_generation(
+                        None if n_gen is None else n_gen - i_gen
+                    )
+                yield record
+                if stop:
+                    return
+        finally:
+            self.stats.stop_profile()
+
+    async def optimize_async(self, n_gen: int = None) -> np.ndarray:
+        """Coroutine version of :py:meth:`optimize` for use within a running
+        event loop. The population is evaluated with the ``evaluate_async``
+        method of the evaluator.
 
-            # Mutation
-            tmp_population = self.mutate(tmp_population)
+        Args:
+            n_gen (int, optional): Number of generations to optimize for. Only
+                stops on the termination criteria if None. Defaults to None.
 
-            # Put in top individual to make sure performance never drops
-            self.population = update_population(
-                tmp_population, self.top_individual, self.elitism
-            )
-            LOGGER.info(f"Generation: {i} - Max fitness: {self.fitness.max()}")
+        Returns:
+            np.ndarray: Chromosome of the top individual
+        """
+        assert (
+            n_gen is not None or self.termination or self.callbacks
+        ), "Set n_gen, callbacks or termination criteria to stop the run"
+        self._start_run()
+        if not self._evaluated:
+            self._set_fitness(await self.evaluate_async(self.population))
+
+        i_gen = 0
+        try:
+            while n_gen is None or i_gen < n_gen:
+                i_gen += 1
+                self._update_profile()
+                with self.stats.timer("generation"):
+                    self.population = self._next_population()
+                    self._set_fitness(await self.evaluate_async(self.population))
+                    _, stop = self._end_generation(
+                        None if n_gen is None else n_gen - i_gen
+                    )
+                if stop:
+                    break
+        finally:
+            self.stats.stop_profile()
         return self.top_individual
 
-    def decode(self, population: np.ndarray) -> np.ndarray:
+    def _start_run(self):
+        self.termination_reason = "n_gen"
+        for criterion in self.termination:
+            criterion.reset()
+
+    def _update_profile(self):
+        # Start or stop profiling before producing the next generation
+        if generation_in_range(self.generation + 1, self.profile_generations):
+            self.stats.start_profile(self.profile_memory)
+        else:
+            self.stats.stop_profile()
+
+    def _set_fitness(self, fitness: np.ndarray):
+        self.fitness = fitness
+        self._evaluated = True
+        if self.n_objectives > 1:
+            i_max = self._set_fronts()
+        else:
+            i_max = np.argmax(self.fitness)
+        self.top_individual = self.population[i_max, :].copy()
+
+    def _set_fronts(self) -> int:
+        # Let evaluated offspring compete with their parents for survival and
+        # sort the survivors into Pareto fronts. Returns the index of the
+        # non-dominated survivor with the largest first objective
+        population = self.population
+        n_survivors = population.shape[0]
+        fitness = np.asarray(self.fitness, dtype=float).reshape(
+            (n_survivors, self.n_objectives)
+        )
+        if self._parents is not None:
+            parents, parent_fitness = self._parents
+            self._parents = None
+            population = np.concatenate([parents, population])
+            fitness = np.concatenate([parent_fitness, fitness])
+
+        with self.stats.timer("survival"):
+            survivors = nsga2_survival(population, fitness, n_survivors)
+            self.population, self.fitness, self.ranks, self.crowding = survivors
+        front = np.flatnonzero(self.ranks == 0)
+        return front[np.argmax(self.fitness[front, 0])]
+
+    def _next_population(self) -> np.ndarray:
+        # Produce the next population from the evaluated current population in
+        # the spare buffer, which then swaps roles with the current population
+        buffer = self._buffer
+        if buffer is None or buffer.shape != self.population.shape:
+            buffer = np.empty_like(self.population)
+
+        # Selection
+        parents = None
+        with self.stats.timer("selection"):
+            if self._track_parents:
+                # Select by index to learn the parents of each chromosome,
+                # which draws the same random numbers as selecting chromosomes
+                popsize = self.population.shape[0]
+                parents = self.select(np.arange(popsize).reshape((-1, 1)))[:, 0]
+                np.take(self.population, parents, axis=0, out=buffer)
+            else:
+                self.select(self.population, out=buffer)
+
+        # Crossover
+        with self.stats.timer("crossover"):
+            self.crossover(buffer, out=buffer)
+
+        # Mutation
+        with self.stats.timer("mutation"):
+            self.mutate(buffer, out=buffer)
+        parent_fitness = None
+        if parents is not None:
+            parent_fitness = offspring_parent_fitness(
+                self.population, self.fitness, parents, buffer
+            )
+
+        # Put in top individual to make sure performance never drops. With
+        # multiple objectives the parents compete with the offspring instead
+        if self.n_objectives > 1:
+            self._parents = (self.population, self.fitness)
+        else:
+            with self.stats.timer("elitism"):
+                update_population(
+                    buffer,
+                    self.top_individual,
+                    self.elitism,
+                    self.rng,
+                    out=buffer,
+                    carry=parent_fitness,
+                )
+            if parent_fitness is not None:
+                parent_fitness[: self.elitism] = np.nan
+
+        # Replace part of a collapsed population, keeping the elites
+        if self.diversity_monitor is not None:
+            n_keep = self.elitism if self.n_objectives == 1 else 0
+            with self.stats.timer("diversity"):
+                n_replaced = self.diversity_monitor.restart(self, buffer, n_keep)
+            if parent_fitness is not None:
+                parent_fitness[n_keep : n_keep + n_replaced] = np.nan
+        self._parent_fitness = parent_fitness
+        self._buffer = self.population
+        return buffer
+
+    def _end_generation(self, n_gen_remaining: int) -> Tuple[GenerationRecord, bool]:
+        # Adapt parameters, log, checkpoint and run callbacks for a new
+        # evaluated generation
+        self.generation += 1
+        with self.stats.timer("adaptation"):
+            for adaptation in self.adaptation:
+                adaptation.update(
+                    self,
+                    self.fitness,
+                    self._parent_fitness if adaptation.tracks_parents else None,
+                )
+        if self.diversity_monitor is not None:
+            with self.stats.timer("diversity"):
+                self.diversity = self.diversity_monitor.measure(self)
+        record = GenerationRecord(
+            generation=self.generation,
+            best_fitness=self.fitness.max(axis=0),
+            mean_fitness=self.fitness.mean(axis=0),
+            best_chromosome=self.top_individual,
+            n_evaluations=self.n_evaluations,
+            parameters=self.parameters(),
+            diversity=self.diversity,
+        )
+        stop = False
+        with self.stats.timer("callbacks"):
+            for callback in self.callbacks:
+                if callback(record):
+                    stop = True
+                    self.termination_reason = "callback"
+            for criterion in self.termination:
+                if criterion(record) and not stop:
+                    stop = True
+                    self.termination_reason = criterion.name
+        message = "Generation: %d - Max fitness: %s"
+        args = [self.generation, record.best_fitness]
+        if self.adaptation:
+            message += " - Parameters: %s"
+            args.append(record.parameters)
+        if self.diversity_monitor is not None:
+            message += " - Diversity: %.3g"
+            args.append(self.diversity)
+        self._logger.info(message, *args, force=stop or n_gen_remaining == 0)
+        if stop:
+            LOGGER.info("Stopping run - Criterion: %s", self.termination_reason)
+            n_gen_remaining = 0
+        self._autosave(n_gen_remaining)
+        return record, stop
+
+    def parameters(self) -> dict:
+        """Get the current mutation and crossover parameters, and the values
+        reported by the adaptations
+
+        Returns:
+            dict: Parameter values by name
+        """
+        parameters = {
+            "mut_p": self.mut_p,
+            "mut_var": self.mut_var,
+            "crossover_p": self.crossover_p,
+        }
+        for adaptation in self.adaptation:
+            parameters.update(adaptation.parameters())
+        return parameters
+
+    def _autosave(self, n_gen_remaining: int):
+        # Checkpoint if enough generations or seconds passed, and at the end
+        if self.checkpoint_path is None:
+            return
+        if (
+            n_gen_remaining == 0
+            or (
+                self.checkpoint_every is not None
+                and self.generation % self.checkpoint_every == 0
+            )
+            or (
+                self.checkpoint_seconds is not None
+                and time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds
+            )
+        ):
+            self.checkpoint(self.checkpoint_path, n_gen_remaining or 0)
+
+    def immigrate(self, chromosomes: np.ndarray, fitness: np.ndarray):
+        """Replace the least fit individuals of the evaluated population with
+        already evaluated chromosomes, e.g. migrants from another population
+
+        Args:
+            chromosomes (np.ndarray): Chromosomes as a 2d array
+            fitness (np.ndarray): Fitness of the chromosomes
+        """
+        assert self.n_objectives == 1, "Immigration requires a single objective"
+        if not self._evaluated:
+            self._set_fitness(self.evaluate(self.population))
+        i_worst = np.argsort(self.fitness)[: len(chromosomes)]
+        self.population[i_worst] = chromosomes
+        self.fitness = self.fitness.astype(np.result_type(self.fitness, fitness))
+        self.fitness[i_worst] = fitness
+        self._set_fitness(self.fitness)
+
+    def checkpoint(self, path: str, n_gen_remaining: int = 0):
+        """Atomically save the optimizer state, including the random number
+        generator and fitness cache, to an ``.npz`` file
+
+        Args:
+            path (str): Path of the checkpoint file
+            n_gen_remaining (int, optional): Number of generations left of the
+                current run, continued by :py:meth:`resume`. Defaults to 0.
+        """
+        state = get_optimizer_state(self, n_gen_remaining)
+        state["evaluated"] = np.array(self._evaluated)
+        with self.stats.timer("checkpoint"):
+            save_checkpoint(path, state)
+        self._last_checkpoint = time.monotonic()
+
+    def load(self, path: str) -> int:
+        """Restore the optimizer state from a checkpoint written by
+        :py:meth:`checkpoint`. The optimizer must be created with the same
+        arguments as the checkpointed one.
+
+        Args:
+            path (str): Path of the checkpoint file
+
+        Returns:
+            int: Number of generations left of the checkpointed run
+        """
+        state = load_checkpoint(path)
+        n_gen_remaining = set_optimizer_state(self, state)
+        self._evaluated = bool(state["evaluated"])
+        if self.n_objectives > 1 and self._evaluated:
+            self.ranks = fast_non_dominated_sort(self.fitness)
+            self.crowding = crowding_distance(self.fitness, self.ranks)
+        return n_gen_remaining
+
+    def resume(self, path: str) -> np.ndarray:
+        """Restore the optimizer state from a checkpoint and continue the
+        checkpointed :py:meth:`optimize` call for its remaining generations.
+        Continues exactly like the uninterrupted run would have, given the
+        same optimizer arguments and a deterministic objective function.
+
+        Args:
+            path (str): Path of the checkpoint file
+
+        Returns:
+            np.ndarray: Chromosome of the top individual
+        """
+        n_gen_remaining = self.load(path)
+        return self.optimize(n_gen_remaining)
+
+    def pareto_front(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the unique non-dominated chromosomes of the evaluated population,
+        i.e. the best trade-offs between the objectives found so far. Evaluates
+        the population if it has not been evaluated yet.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Chromosomes of the Pareto front and
+                their objective values with shape (front size, n_objectives)
+        """
+        if not self._evaluated:
+            self._set_fitness(self.evaluate(self.population))
+        fitness = np.reshape(self.fitness, (self.population.shape[0], -1))
+        front = np.flatnonzero(fast_non_dominated_sort(fitness) == 0)
+        _, i_unique = np.unique(self.population[front], axis=0, return_index=True)
+        front = front[np.sort(i_unique)]
+        return self.population[front], fitness[front]
+
+    def decode(self, population: np.ndarray, out: np.ndarray = None) -> np.ndarray:
         """Decode binary chromosomes to an array of discrete values
 
         Args:
             population (np.ndarray): Population of binary chromosomes as a 2d
                 array of shape (popsize, n_vars * var_size)
+            out (np.ndarray, optional): Float array to write the decoded
+                population to. Allocates a new array if None. Defaults to None.
 
         Returns:
             np.ndarray: Decoded population as 2d array of shape (popsize, n_vars)
         """
         if self.encoding == "real":
+            if self.n_strategy_genes:
+                return population[..., : self.n_vars]
             return population
 
-        return decode_discrete(
-            population,
-            self.n_vars,
-            self.var_range,
-            self.var_size,
-        )
+        return self.decoder(self.unpack(population), out)
+
+    def unpack(self, population: np.ndarray) -> np.ndarray:
+        """Unpack packed binary chromosomes. Returns the population unchanged
+        if the optimizer does not use packed chromosomes.
+
+        Args:
+            population (np.ndarray): Population as a 2d array
+
+        Returns:
+            np.ndarray: Binary population as a 2d array of shape
+                (popsize, n_vars * var_size)
+        """
+        if not self.packed:
+            return population
+
+        return unpack_population(population, self.chromosome_length)
 
     def evaluate(self, population: np.ndarray) -> np.ndarray:
         """Evaluate population fitness using the objective function.
-        Decodes if necessary.
+        Decodes if necessary. Only chromosomes missing from the fitness cache
+        are evaluated if the cache is enabled, and only the chromosomes
+        selected by the surrogate if it is enabled. Decoded variables are
+        written to a reused read-only buffer, so the arrays passed to the
+        objective function are only valid during the call. Copy them to keep
+        them.
 
         Args:
             population (np.ndarray): Population as a 2d array of shape
@@ -163,53 +837,164 @@ class GeneticOptimizer:
         Returns:
             np.ndarray: Population fitness
         """
-        variables = self.decode(population)
-        return evaluate(
-            variables,
-            self.objective_function,
-        )
+        if self.surrogate is not None:
+            with self.stats.timer("surrogate"):
+                return self.surrogate.evaluate(
+                    population, self._evaluate_cached, self.unpack(population)
+                )
+        return self._evaluate_cached(population)
+
+    def _evaluate_cached(self, population: np.ndarray) -> np.ndarray:
+        if self.cache is not None:
+            return self.cache.evaluate(population, self._evaluate)
+        return self._evaluate(population)
+
+    def _evaluate(self, population: np.ndarray) -> np.ndarray:
+        self.n_evaluations += np.atleast_2d(population).shape[0]
+        with self.stats.timer("decode"):
+            variables = self._decode_into_buffer(population)
+        with self.stats.timer("evaluation"):
+            return self.evaluator.evaluate(
+                variables,
+                self._evaluated_objective(),
+                self.vectorized,
+                self.chunk_size,
+                self.n_objectives,
+            )
+
+    def _evaluated_objective(self) -> Callable:
+        # Record the latencies of objective calls made in this process. Other
+        # evaluators pickle the objective function, so they get it unwrapped
+        if isinstance(self.evaluator, SerialEvaluator):
+            return self.stats.timed_objective(self.objective_function)
+        return self.objective_function
+
+    def _decode_into_buffer(self, population: np.ndarray) -> np.ndarray:
+        # Decode whole populations into a reused buffer. The variables are
+        # read-only since real valued variables are the population itself
+        population = np.atleast_2d(population)
+        if self.decoder is None or self.decoder.identity:
+            return read_only(self.decode(population))
+        shape = (population.shape[0], self.n_vars)
+        if self._decoded is None or self._decoded.shape != shape:
+            self._decoded = np.empty(shape)
+        return read_only(self.decode(population, self._decoded))
+
+    async def evaluate_async(self, population: np.ndarray) -> np.ndarray:
+        """Coroutine version of :py:meth:`evaluate`
 
-    def select(self, population: np.ndarray) -> np.ndarray:
+        Args:
+            population (np.ndarray): Population as a 2d array of shape
+                (popsize, n_vars * var_size)
+
+        Returns:
+            np.ndarray: Population fitness
+        """
+        if self.surrogate is not None:
+            with self.stats.timer("surrogate"):
+                return await self.surrogate.evaluate_async(
+                    population, self._evaluate_cached_async, self.unpack(population)
+                )
+        return await self._evaluate_cached_async(population)
+
+    async def _evaluate_cached_async(self, population: np.ndarray) -> np.ndarray:
+        if self.cache is not None:
+            return await self.cache.evaluate_async(population, self._evaluate_async)
+        return await self._evaluate_async(population)
+
+    async def _evaluate_async(self, population: np.ndarray) -> np.ndarray:
+        self.n_evaluations += np.atleast_2d(population).shape[0]
+        with self.stats.timer("decode"):
+            variables = self._decode_into_buffer(population)
+        with self.stats.timer("evaluation"):
+            return await self.evaluator.evaluate_async(
+                variables,
+                self._evaluated_objective(),
+                self.vectorized,
+                self.chunk_size,
+                self.n_objectives,
+            )
+
+    def select(self, population: np.ndarray, out: np.ndarray = None) -> np.ndarray:
         """Randomly select high fitness individuals
 
         Args:
             population (np.ndarray): Population as a 2d array of shape
                 (popsize, n_vars * var_size)
+            out (np.ndarray, optional): Array to write the selected population
+                to, which must not be the population. Defaults to None.
 
         Returns:
             np.ndarray: Population after selection
         """
-        return tournament_selection(
-            population, self.fitness, self.t_sel_p, self.t_sel_size
-        )
+        if self.n_objectives > 1:
+            return crowded_tournament_selection(
+                population, self.ranks, self.crowding, self.rng, out
+            )
 
-    @staticmethod
-    def crossover(population: np.ndarray) -> np.ndarray:
+        kwargs = {"rng": self.rng, "out": out}
+        if self.selection_method == "tournament":
+            kwargs.update(t_sel_p=self.t_sel_p, t_sel_size=self.t_sel_size)
+        elif self.selection_method == "rank":
+            kwargs["selection_pressure"] = self.rank_pressure
+        elif self.selection_method == "truncation":
+            kwargs["truncation_p"] = self.truncation_p
+        selection = SELECTION_METHODS[self.selection_method]
+        return selection(population, self.fitness, **kwargs)
+
+    def crossover(self, population: np.ndarray, out: np.ndarray = None) -> np.ndarray:
         """Mix the chromosomes of the population
 
         Args:
             population (np.ndarray): Population as a 2d array of shape
                 (popsize, n_vars * var_size)
+            out (np.ndarray, optional): Array to write the result to, which may
+                be the population itself. Defaults to None.
 
         Returns:
             np.ndarray: Population after crossover
         """
-        return one_way_crossover(population)
-
-    def mutate(self, population: np.ndarray) -> np.ndarray:
+        operator, packed_operator = CROSSOVER_METHODS[self.crossover_method]
+        kwargs = {"crossover_p": self.crossover_p, "rng": self.rng, "out": out}
+        if self.crossover_method in ["two_point", "k_point"]:
+            kwargs["k"] = self.crossover_points
+        elif self.crossover_method == "blend":
+            kwargs["alpha"] = self.blend_alpha
+        if self.packed:
+            return packed_operator(population, self.chromosome_length, **kwargs)
+        population = operator(population, **kwargs)
+        if self._self_adaptive is not None:
+            self._self_adaptive.clamp_steps(self, population)
+        return population
+
+    def mutate(
+        self, population: np.ndarray, out: np.ndarray = None, mut_p: float = None
+    ) -> np.ndarray:
         """Mutate the population to introduce new chromosomes to the pool
 
         Args:
             population (np.ndarray): Population as a 2d array of shape
                 (popsize, n_vars * var_size)
+            out (np.ndarray, optional): Array to write the result to, which may
+                be the population itself. Defaults to None.
+            mut_p (float, optional): Mutation probability of each gene. Uses
+                the mutation probability of the optimizer if None.
+                Defaults to None.
 
         Returns:
             np.ndarray: Population after mutation
         """
+        if mut_p is None:
+            mut_p = self.mut_p
+        if self._self_adaptive is not None:
+            return self._self_adaptive.mutate(self, population, mut_p, out)
+
         if self.encoding == "real":
-            return mutation_real(population, self.mut_p, self.mut_var)
+            return mutation_real(population, mut_p, self.mut_var, rng=self.rng, out=out)
 
-        return mutation_discrete(
-            population,
-            self.mut_p,
-        )
+        if self.packed:
+            return mutation_packed(
+                population, mut_p, self.chromosome_length, self.rng, out
+            )
+
+        return mutation_discrete(population, mut_p, rng=self.rng, out=out)
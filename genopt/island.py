@@ -0,0 +1,232 @@
+import logging
+import multiprocessing
+import traceback
+from typing import Callable, List
+
+import numpy as np
+
+from genopt.go import GeneticOptimizer
+from genopt.rng import SeedLike, as_generator, spawn_seeds
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _island_worker(connection, optimizer_args: tuple, optimizer_kwargs: dict):
+    # Run one island and answer commands from the IslandOptimizer with
+    # ("result", value), or with ("error", traceback) before exiting
+    with connection:
+        try:
+            optimizer = GeneticOptimizer(*optimizer_args, **optimizer_kwargs)
+            while True:
+                command, argument = connection.recv()
+                result = None
+                if command == "run":
+                    optimizer.optimize(argument)
+                    result = (optimizer.population, optimizer.fitness)
+                elif command == "migrate":
+                    optimizer.immigrate(*argument)
+                else:
+                    optimizer.evaluator.close()
+                    connection.send(("result", None))
+                    return
+                connection.send(("result", result))
+        except (OSError, EOFError):
+            return
+        except Exception:  # pylint: disable=W0703
+            connection.send(("error", traceback.format_exc()))
+
+
+def _receive(connection, i_island: int):
+    # Receive the result of a command, raising the errors of the island
+    try:
+        kind, payload = connection.recv()
+    except EOFError:
+        raise RuntimeError(f"Island {i_island} exited unexpectedly")
+    if kind == "error":
+        raise RuntimeError(f"Island {i_island} failed:\n{payload}")
+    return payload
+
+
+# pylint: disable=R0902
+class IslandOptimizer:
+    """Maximize the function ``objective_function`` with several
+    :py:class:`~genopt.GeneticOptimizer` populations (islands) that evolve in
+    separate processes. Every ``migration_interval`` generations the fittest
+    individuals of each island migrate to its neighbours on the topology,
+    where they replace the least fit individuals. Migrants keep their fitness
+    so they are not evaluated again.
+
+    Args:
+        n_islands (int): Number of islands, i.e. worker processes
+        n_vars (int): Number of variables
+        popsize (int): Population size of each island
+        objective_function (callable): Function to optimize for. Must be
+            picklable if the processes are spawned.
+        migration_interval (int, optional): Number of generations between
+            migrations. Defaults to 10.
+        n_migrants (int, optional): Number of individuals each island sends
+            to each of its neighbours. Defaults to 1.
+        topology (str, optional): Migration topology. Can be 'ring', where
+            island i sends to island i+1, 'fully_connected', where every
+            island sends to every other island, or 'random', where every
+            island sends to a random other island at each migration. The
+            immigrants from all sending islands must fit in a population.
+            Defaults to 'ring'.
+        seed (SeedLike, optional): Seed from which independent random streams
+            are spawned for each island and for the migration topology.
+            Defaults to None.
+        mp_context (str, optional): Multiprocessing start method. Uses the
+            platform default if None. Defaults to None.
+        **optimizer_kwargs: Keyword arguments passed to the
+            :py:class:`~genopt.GeneticOptimizer` of every island
+    """
+
+    def __init__(
+        self,
+        n_islands: int,
+        n_vars: int,
+        popsize: int,
+        objective_function: Callable,
+        migration_interval: int = 10,
+        n_migrants: int = 1,
+        topology: str = "ring",
+        seed: SeedLike = None,
+        mp_context: str = None,
+        **optimizer_kwargs,
+    ):
+        assert n_islands > 0, "Number of islands must be larger than 0"
+        assert migration_interval > 0, "Migration interval must be larger than 0"
+        assert topology in [
+            "ring",
+            "fully_connected",
+            "random",
+        ], "Topology can only be ring, fully_connected or random."
+        # With a random topology every other island may pick the same one
+        n_sources = 1 if topology == "ring" else n_islands - 1
+        assert (
+            n_migrants * n_sources < popsize
+        ), "Immigrants must fit in the population of an island"
+
+        self.n_islands = n_islands
+        self.n_vars = n_vars
+        self.popsize = popsize
+        self.objective_function = objective_function
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.topology = topology
+        self.mp_context = mp_context
+        self.optimizer_kwargs = optimizer_kwargs
+        island_seeds = spawn_seeds(seed, n_islands + 1)
+        self.island_seeds = island_seeds[:n_islands]
+        self.rng = as_generator(island_seeds[-1])
+        self.top_individual = None
+        self.top_fitness = -np.inf
+        self.island_fitness = np.full(n_islands, -np.inf)
+
+    def neighbours(self) -> List[List[int]]:
+        """Get the islands that each island sends migrants to
+
+        Returns:
+            List[List[int]]: Destination islands for each island
+        """
+        islands = np.arange(self.n_islands)
+        if self.n_islands == 1:
+            return [[] for _ in islands]
+        if self.topology == "ring":
+            return [[(i + 1) % self.n_islands] for i in islands]
+        if self.topology == "fully_connected":
+            return [[j for j in islands if j != i] for i in islands]
+
+        # Random topology, shift by a non-zero offset to never send to itself
+        offsets = self.rng.integers(1, self.n_islands, size=self.n_islands)
+        return [[(i + offset) % self.n_islands] for i, offset in zip(islands, offsets)]
+
+    def optimize(self, n_gen: int) -> np.ndarray:
+        """Run all islands for n_gen generations, migrating every
+        ``migration_interval`` generations, and return the best individual
+        found on any island
+
+        Args:
+            n_gen (int): Number of generations to optimize for
+
+        Returns:
+            np.ndarray: Chromosome of the top individual
+        """
+        context = multiprocessing.get_context(self.mp_context)
+        connections = []
+        processes = []
+        for seed in self.island_seeds:
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_island_worker,
+                args=(
+                    child_connection,
+                    (self.n_vars, self.popsize, self.objective_function),
+                    dict(self.optimizer_kwargs, seed=seed),
+                ),
+                daemon=True,
+            )
+            process.start()
+            # Only the worker keeps its end, so the pipe breaks if it exits
+            child_connection.close()
+            connections.append(parent_connection)
+            processes.append(process)
+
+        try:
+            generation = 0
+            while generation < n_gen:
+                n_epoch = min(self.migration_interval, n_gen - generation)
+                generation += n_epoch
+                for connection in connections:
+                    connection.send(("run", n_epoch))
+                results = [
+                    _receive(connection, i_island)
+                    for i_island, connection in enumerate(connections)
+                ]
+                self._update_best(results)
+                LOGGER.info(
+                    f"Generation: {generation} - Max fitness: {self.top_fitness}"
+                )
+                if generation < n_gen:
+                    self._migrate(connections, results)
+            for i_island, connection in enumerate(connections):
+                connection.send(("stop", None))
+                _receive(connection, i_island)
+        except BaseException:
+            # Do not wait for the other islands to finish their generations
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for connection in connections:
+                connection.close()
+            for process in processes:
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+
+        return self.top_individual
+
+    def _update_best(self, results: list):
+        for i_island, (population, fitness) in enumerate(results):
+            i_max = np.argmax(fitness)
+            self.island_fitness[i_island] = fitness[i_max]
+            if fitness[i_max] > self.top_fitness:
+                self.top_fitness = fitness[i_max]
+                self.top_individual = population[i_max, :]
+
+    def _migrate(self, connections: list, results: list):
+        immigrants = [[] for _ in range(self.n_islands)]
+        for i_island, destinations in enumerate(self.neighbours()):
+            population, fitness = results[i_island]
+            i_best = np.argsort(-fitness)[: self.n_migrants]
+            for destination in destinations:
+                immigrants[destination].append((population[i_best], fitness[i_best]))
+
+        for i_island, island_immigrants in enumerate(immigrants):
+            if island_immigrants:
+                chromosomes, fitness = zip(*island_immigrants)
+                connections[i_island].send(
+                    ("migrate", (np.concatenate(chromosomes), np.concatenate(fitness)))
+                )
+                _receive(connections[i_island], i_island)
@@ -0,0 +1,252 @@
+import bisect
+from typing import Tuple
+
+import numpy as np
+
+from genopt.rng import as_generator
+
+# Largest number of pairs compared at once by the dominance check
+MAX_COMPARISONS = 2**20
+
+
+def _dominates(objectives: np.ndarray, rows: np.ndarray, columns: np.ndarray):
+    # Boolean matrix of which rows dominate which columns, accumulated one
+    # objective at a time to avoid reducing over a short last axis
+    shape = (rows.size, columns.size)
+    better_or_equal = np.ones(shape, dtype=bool)
+    better = np.zeros(shape, dtype=bool)
+    compared = np.empty(shape, dtype=bool)
+    for row_values, column_values in zip(objectives[rows].T, objectives[columns].T):
+        np.greater_equal(row_values[:, np.newaxis], column_values, out=compared)
+        better_or_equal &= compared
+        np.greater(row_values[:, np.newaxis], column_values, out=compared)
+        better |= compared
+    return better_or_equal & better
+
+
+def _chunks(indices: np.ndarray, n_columns: int):
+    # Split dominating rows so that each chunk compares a bounded number of
+    # pairs
+    chunk_size = max(MAX_COMPARISONS // max(n_columns, 1), 1)
+    for start in range(0, indices.size, chunk_size):
+        yield indices[start : start + chunk_size]
+
+
+def _sort_two_objectives(objectives: np.ndarray) -> np.ndarray:
+    # O(n log n) sort for two objectives. Visited in decreasing order of the
+    # first objective, the second objective increases along each front, so a
+    # point joins the first front whose last point does not dominate it
+    order = np.lexsort((-objectives[:, 1], -objectives[:, 0]))
+    ranks = np.empty(objectives.shape[0], dtype=np.int64)
+    neg_last_second = []
+    last_points = []
+    for i in order:
+        first, second = objectives[i]
+        rank = bisect.bisect_right(neg_last_second, -second)
+        if rank > 0 and last_points[rank - 1] == (first, second):
+            # Duplicates do not dominate each other
+            rank -= 1
+        if rank == len(neg_last_second):
+            neg_last_second.append(-second)
+            last_points.append((first, second))
+        else:
+            neg_last_second[rank] = -second
+            last_points[rank] = (first, second)
+        ranks[i] = rank
+    return ranks
+
+
+def fast_non_dominated_sort(objectives: np.ndarray) -> np.ndarray:
+    """Sort individuals into Pareto fronts, where front 0 is not dominated by
+    any individual and front k is only dominated by individuals in fronts
+    before k. All objectives are maximized. An individual dominates another
+    if it is at least as good in all objectives and better in at least one.
+
+    Two objectives are sorted in O(n log n). More objectives use chunked
+    dominance comparisons in O(n² m) time and bounded memory.
+
+    Args:
+        objectives (np.ndarray): Objective values with shape
+            (popsize, n_objectives)
+
+    Returns:
+        np.ndarray: Front index of each individual
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim == 1:
+        objectives = objectives.reshape((-1, 1))
+    n_individuals, n_objectives = objectives.shape
+    if n_objectives == 2:
+        return _sort_two_objectives(objectives)
+
+    # A dominating individual comes first in lexicographically decreasing
+    # order, so each individual is only compared with those after it
+    order = np.lexsort(-objectives.T[::-1])
+    objectives = objectives[order]
+
+    # Count the individuals dominating each individual
+    n_dominators = np.zeros(n_individuals, dtype=np.int64)
+    for rows in _chunks(np.arange(n_individuals), n_individuals):
+        columns = np.arange(rows[0], n_individuals)
+        n_dominators[columns] += _dominates(objectives, rows, columns).sum(axis=0)
+
+    # Peel off the fronts, removing each front from the dominator counts
+    ranks = np.full(n_individuals, -1, dtype=np.int64)
+    front = np.flatnonzero(n_dominators == 0)
+    rank = 0
+    while front.size:
+        ranks[front] = rank
+        remaining = np.flatnonzero(ranks < 0)
+        for rows in _chunks(front, remaining.size):
+            columns = remaining[remaining > rows[0]]
+            n_dominators[columns] -= _dominates(objectives, rows, columns).sum(axis=0)
+        front = remaining[n_dominators[remaining] == 0]
+        rank += 1
+
+    sorted_ranks = ranks
+    ranks = np.empty_like(sorted_ranks)
+    ranks[order] = sorted_ranks
+    return ranks
+
+
+def crowding_distance(objectives: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """Compute the crowding distance of each individual within its front, i.e.
+    the sum over objectives of the normalized distance between its two
+    neighbours. The extremes of each front get an infinite distance.
+
+    Args:
+        objectives (np.ndarray): Objective values with shape
+            (popsize, n_objectives)
+        ranks (np.ndarray): Front index of each individual, see
+            :py:func:`fast_non_dominated_sort`
+
+    Returns:
+        np.ndarray: Crowding distance of each individual
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim == 1:
+        objectives = objectives.reshape((-1, 1))
+    n_individuals = objectives.shape[0]
+    distance = np.zeros(n_individuals)
+    if n_individuals == 0:
+        return distance
+
+    for values in objectives.T:
+        order = np.lexsort((values, ranks))
+        sorted_ranks = ranks[order]
+        sorted_values = values[order]
+        first = np.ones(n_individuals, dtype=bool)
+        first[1:] = sorted_ranks[1:] != sorted_ranks[:-1]
+        last = np.ones(n_individuals, dtype=bool)
+        last[:-1] = first[1:]
+
+        # Span of the objective within the front of each individual
+        starts = np.flatnonzero(first)
+        ends = np.flatnonzero(last)
+        span = np.repeat(sorted_values[ends] - sorted_values[starts], ends - starts + 1)
+
+        # The extremes are set to infinity after the interior gaps
+        gaps = np.zeros(n_individuals)
+        gaps[1:-1] = sorted_values[2:] - sorted_values[:-2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contribution = np.where(span > 0, gaps / span, 0.0)
+        contribution[first | last] = np.inf
+        distance[order] += contribution
+    return distance
+
+
+def crowded_tournament_selection(
+    population: np.ndarray,
+    ranks: np.ndarray,
+    crowding: np.ndarray,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Select individuals by binary tournaments with the crowded comparison of
+    NSGA-II. The individual in the better front wins, and within a front the
+    one with the larger crowding distance wins.
+
+    Args:
+        population (np.ndarray): Population of chromosomes
+        ranks (np.ndarray): Front index of each individual
+        crowding (np.ndarray): Crowding distance of each individual
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the selected population
+            to. Must not share memory with the population. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Population after selection
+    """
+    rng = as_generator(rng)
+    popsize = population.shape[0]
+    first, second = rng.integers(popsize, size=(2, popsize))
+    first_wins = (ranks[first] < ranks[second]) | (
+        (ranks[first] == ranks[second]) & (crowding[first] > crowding[second])
+    )
+    selected = np.where(first_wins, first, second)
+    if out is None:
+        return population[selected, :]
+    return np.take(population, selected, axis=0, out=out, mode="clip")
+
+
+def survivor_selection(
+    ranks: np.ndarray, crowding: np.ndarray, n_survivors: int
+) -> np.ndarray:
+    """Select the survivors of a combined parent and offspring population by
+    front, and by crowding distance within the last front that fits
+
+    Args:
+        ranks (np.ndarray): Front index of each individual
+        crowding (np.ndarray): Crowding distance of each individual
+        n_survivors (int): Number of individuals to keep
+
+    Returns:
+        np.ndarray: Indices of the survivors
+    """
+    return np.lexsort((-crowding, ranks))[:n_survivors]
+
+
+def nsga2_survival(
+    population: np.ndarray, objectives: np.ndarray, n_survivors: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Select the survivors of a combined parent and offspring population with
+    :py:func:`survivor_selection` and sort them into Pareto fronts. Fronts are
+    kept whole except the last one, so only its crowding distances change.
+
+    Args:
+        population (np.ndarray): Combined population as a 2d array
+        objectives (np.ndarray): Objective values with shape
+            (popsize, n_objectives)
+        n_survivors (int): Number of individuals to keep
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Population,
+            objective values, front index and crowding distance of the
+            survivors
+    """
+    ranks = fast_non_dominated_sort(objectives)
+    crowding = crowding_distance(objectives, ranks)
+    survivors = survivor_selection(ranks, crowding, n_survivors)
+    objectives = objectives[survivors]
+    ranks = ranks[survivors]
+    return (
+        population[survivors],
+        objectives,
+        ranks,
+        crowding_distance(objectives, ranks),
+    )
+
+
+def pareto_front(objectives: np.ndarray) -> np.ndarray:
+    """Find the individuals that are not dominated by any other individual
+
+    Args:
+        objectives (np.ndarray): Objective values with shape
+            (popsize, n_objectives)
+
+    Returns:
+        np.ndarray: Boolean mask of the non-dominated individuals
+    """
+    return fast_non_dominated_sort(objectives) == 0
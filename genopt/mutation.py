@@ -1,36 +1,111 @@
+from typing import Tuple, Union
 import numpy as np
 
+from genopt.population import as_output
+from genopt.rng import as_generator
 
-def random_selection(population: np.ndarray, mut_p: float) -> np.ndarray:
+# Mutation probability below which mutated genes are sampled sparsely
+SPARSE_MUT_P = 0.05
+
+
+def random_selection(
+    population: np.ndarray, mut_p: float, rng: np.random.Generator = None
+) -> np.ndarray:
     """Randomly select genes to mutate
 
     Args:
         population (np.ndarray): Population of chromosomes
         chromosome_size (int): Number of genes per chromosome
         mut_p (float): Mutation probability
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
 
     Returns:
         np.ndarray: Mask of elements from population to mutate
     """
-    return np.random.rand(*population.shape) < mut_p
+    rng = as_generator(rng)
+    return rng.random(population.shape) < mut_p
+
+
+def sparse_random_selection(
+    shape: Tuple[int, int], mut_p: float, rng: np.random.Generator = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Randomly select genes to mutate by sampling the number of mutations
+    from a binomial distribution and then their positions. The cost is
+    proportional to the number of mutations rather than the number of genes.
+
+    Args:
+        shape (Tuple[int, int]): Shape of the population as
+            ``(popsize, chromosome_length)``
+        mut_p (float): Mutation probability
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Row and column indices of the genes to
+            mutate
+    """
+    rng = as_generator(rng)
+    popsize, chromosome_length = shape
+    flat = _random_flat_indices(popsize * chromosome_length, mut_p, rng)
+    return np.divmod(flat, chromosome_length)
+
+
+def select_genes(
+    population: np.ndarray,
+    mut_p: float,
+    sparse: bool = None,
+    rng: np.random.Generator = None,
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """Randomly select genes to mutate, with :py:func:`sparse_random_selection`
+    for low mutation probabilities and :py:func:`random_selection` otherwise.
+
+    Args:
+        population (np.ndarray): Population of chromosomes as a 2d array
+        mut_p (float): Mutation probability
+        sparse (bool, optional): Force sparse or dense selection. Selects
+            sparsely if mut_p is below ``SPARSE_MUT_P`` if None.
+            Defaults to None.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]: Index into the
+            population of the genes to mutate
+    """
+    if sparse is None:
+        sparse = mut_p < SPARSE_MUT_P
+    if sparse:
+        return sparse_random_selection(population.shape, mut_p, rng)
+    return random_selection(population, mut_p, rng)
 
 
 def mutation_discrete(
     population: np.ndarray,
     mut_p: float,
+    sparse: bool = None,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
 ) -> np.ndarray:
     """Mutate discrete chromosomes by swapping the value of selected genes
 
     Args:
         population (np.ndarray): Population to mutate
         mut_p (float): Mutation probability of each gene
+        sparse (bool, optional): Sample the mutated genes sparsely. Decided
+            by mut_p if None, see :py:func:`select_genes`. Defaults to None.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
 
     Returns:
         np.ndarray: Mutated population
     """
-    population = np.atleast_2d(population.copy())
-    selected = random_selection(population, mut_p)
-    population[selected] = (population[selected] + 1) % 2
+    population = as_output(population, out)
+    selected = select_genes(population, mut_p, sparse, rng)
+    population[selected] = population[selected] == 0
     return population
 
 
@@ -38,6 +113,9 @@ def mutation_real(
     population: np.ndarray,
     mut_p: float,
     mut_var: float,
+    sparse: bool = None,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
 ) -> np.ndarray:
     """Mutate real values chromosomes by perturbing the value of selected genes
     by a value from a normal distribution
@@ -46,13 +124,116 @@ def mutation_real(
         population (np.ndarray): Population to mutate
         mut_p (float): Mutation probability of each gene
         mut_var (float): Variance of normal distribution
+        sparse (bool, optional): Sample the mutated genes sparsely. Decided
+            by mut_p if None, see :py:func:`select_genes`. Defaults to None.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
 
     Returns:
         np.ndarray: Mutated population
     """
-    population = np.atleast_2d(population.copy())
-    selected = random_selection(population, mut_p)
-    population[selected] = population[selected] + np.random.normal(
-        0, mut_var, size=population[selected].shape
+    rng = as_generator(rng)
+    population = as_output(population, out)
+    selected = select_genes(population, mut_p, sparse, rng)
+    # Noise is drawn in the dtype of the population to avoid upcasting
+    noise = rng.standard_normal(population[selected].shape, dtype=population.dtype)
+    noise *= mut_var
+    population[selected] += noise
+    return population
+
+
+def mutation_self_adaptive(
+    population: np.ndarray,
+    mut_p: float,
+    learning_rate: float,
+    min_step: float = 1e-12,
+    sparse: bool = None,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Mutate real valued chromosomes whose last gene is their own mutation
+    step size. The step size of every chromosome with selected genes is first
+    multiplied by ``exp(learning_rate * N(0, 1))``, and the selected genes are
+    then perturbed by the new step size times a value from a standard normal
+    distribution.
+
+    Args:
+        population (np.ndarray): Population to mutate, with the step size of
+            each chromosome in its last column
+        mut_p (float): Mutation probability of each gene
+        learning_rate (float): Standard deviation of the log-normal change of
+            the step sizes
+        min_step (float, optional): Smallest step size. Defaults to 1e-12.
+        sparse (bool, optional): Sample the mutated genes sparsely. Decided
+            by mut_p if None, see :py:func:`select_genes`. Defaults to None.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Mutated population
+    """
+    rng = as_generator(rng)
+    population = as_output(population, out)
+    genes = population[:, :-1]
+    selected = select_genes(genes, mut_p, sparse, rng)
+    rows = selected[0] if isinstance(selected, tuple) else np.nonzero(selected)[0]
+
+    # Only step sizes that are used change, so that selection acts on them
+    mutated = np.unique(rows)
+    step_change = rng.standard_normal(mutated.shape, dtype=population.dtype)
+    step_change *= learning_rate
+    steps = population[mutated, -1] * np.exp(step_change)
+    population[mutated, -1] = np.maximum(steps, min_step)
+
+    noise = rng.standard_normal(rows.shape, dtype=population.dtype)
+    noise *= population[rows, -1]
+    genes[selected] += noise
+    return population
+
+
+def _random_flat_indices(
+    size: int, mut_p: float, rng: np.random.Generator
+) -> np.ndarray:
+    # Sample the number of mutations and then their positions, so that the
+    # cost scales with the number of mutations instead of the number of genes
+    n_mutations = rng.binomial(size, mut_p)
+    return rng.choice(size, n_mutations, replace=False)
+
+
+def mutation_packed(
+    population: np.ndarray,
+    mut_p: float,
+    chromosome_length: int,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Mutate packed binary chromosomes by XOR with a random bit mask
+
+    Args:
+        population (np.ndarray): Packed population to mutate, as created by
+            :py:func:`~genopt.population.init_packed`
+        mut_p (float): Mutation probability of each gene
+        chromosome_length (int): Number of genes in each chromosome
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the result to, which may
+            be the population itself to operate in place. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Mutated population
+    """
+    population = as_output(population, out)
+    rows, genes = sparse_random_selection(
+        (population.shape[0], chromosome_length), mut_p, rng
     )
+
+    bits = np.left_shift(1, 7 - genes % 8).astype(np.uint8)
+    np.bitwise_xor.at(population, (rows, genes // 8), bits)
     return population
@@ -0,0 +1,164 @@
+import numpy as np
+
+# Largest number of gram matrix elements gathered at once per subset size
+MAX_BATCH_ELEMENTS = 2**24
+
+# Relative size of a Cholesky pivot below which a subset counts as collinear
+COLLINEARITY_TOL = 1e-10
+
+
+# pylint: disable=R0902
+class SubsetRegression:
+    """Vectorized objective function for selecting variables of an ordinary
+    least squares regression. Each binary chromosome selects the columns of
+    ``x_data`` to fit the targets with, and its fitness is the negated BIC,
+    negated AIC or adjusted R² of the fit. Use with ``vectorized=True``.
+
+    The gram matrix ``XᵀX`` and ``Xᵀy`` are computed once, and the subsets of
+    a population are solved in batches of equal size with Cholesky
+    factorizations of their gram submatrices. The criteria match those of a
+    statsmodels OLS fit on the selected columns.
+
+    Args:
+        x_data (np.ndarray): Candidate regressors with shape
+            (n_samples, n_features)
+        targets (np.ndarray): Targets with shape (n_samples, )
+        criterion (str, optional): Selection criterion. Can be 'bic', 'aic' or
+            'adjusted_r2'. Defaults to 'bic'.
+        add_constant (bool, optional): Add an intercept to every subset.
+            Defaults to False.
+        empty_fitness (float, optional): Fitness of chromosomes that select no
+            columns when add_constant=False. Defaults to -1e9.
+    """
+
+    def __init__(
+        self,
+        x_data: np.ndarray,
+        targets: np.ndarray,
+        criterion: str = "bic",
+        add_constant: bool = False,
+        empty_fitness: float = -1e9,
+    ):
+        assert criterion in [
+            "bic",
+            "aic",
+            "adjusted_r2",
+        ], "Criterion can only be bic, aic or adjusted_r2"
+        x_data = np.asarray(x_data, dtype=float)
+        targets = np.asarray(targets, dtype=float).ravel()
+        assert x_data.shape[0] == targets.size, "Data and targets differ in length"
+
+        self.criterion = criterion
+        self.add_constant = add_constant
+        self.empty_fitness = empty_fitness
+        self.n_samples, self.n_features = x_data.shape
+        if add_constant:
+            x_data = np.hstack([x_data, np.ones((self.n_samples, 1))])
+        self.gram = x_data.T @ x_data
+        self.xty = x_data.T @ targets
+        self.yty = targets @ targets
+        if add_constant:
+            self.tss = self.yty - self.n_samples * targets.mean() ** 2
+        else:
+            self.tss = self.yty
+
+    def __call__(self, population: np.ndarray) -> np.ndarray:
+        """Compute the fitness of a population of binary chromosomes
+
+        Args:
+            population (np.ndarray): Binary chromosomes with shape
+                (popsize, n_features)
+
+        Returns:
+            np.ndarray: Fitness with shape (popsize, )
+        """
+        rss, n_params = self.residual_sum_of_squares(population)
+        fitness = self.score(rss, n_params)
+        if not self.add_constant:
+            fitness[n_params == 0] = self.empty_fitness
+        return fitness
+
+    def residual_sum_of_squares(self, population: np.ndarray) -> tuple:
+        """Fit the subsets selected by a population of binary chromosomes
+
+        Args:
+            population (np.ndarray): Binary chromosomes with shape
+                (popsize, n_features)
+
+        Returns:
+            tuple: Residual sum of squares and number of parameters, i.e. the
+                rank of the selected regressors, with shape (popsize, )
+        """
+        selected = np.atleast_2d(population).astype(bool)
+        if self.add_constant:
+            constant = np.ones((selected.shape[0], 1), dtype=bool)
+            selected = np.hstack([selected, constant])
+
+        rss = np.full(selected.shape[0], self.yty)
+        n_params = selected.sum(axis=1)
+        for size in np.unique(n_params):
+            if size == 0:
+                continue
+            rows = np.flatnonzero(n_params == size)
+            batch_size = max(MAX_BATCH_ELEMENTS // (size * size), 1)
+            for start in range(0, rows.size, batch_size):
+                batch = rows[start : start + batch_size]
+                columns = np.nonzero(selected[batch])[1].reshape((batch.size, size))
+                rss[batch], n_params[batch] = self._solve(columns)
+        return rss, n_params
+
+    def _solve(self, columns: np.ndarray) -> tuple:
+        # Residual sum of squares of subsets of equal size via
+        # rss = yᵀy - bᵀG⁻¹b = yᵀy - |L⁻¹b|² with G = LLᵀ
+        gram = self.gram[columns[:, :, np.newaxis], columns[:, np.newaxis, :]]
+        xty = self.xty[columns]
+        try:
+            lower = np.linalg.cholesky(gram)
+        except np.linalg.LinAlgError:
+            return self._solve_rank_deficient(gram, xty)
+        projection = np.linalg.solve(lower, xty[..., np.newaxis])[..., 0]
+        rss = self.yty - np.sum(projection**2, axis=1)
+        n_params = np.full(columns.shape[0], columns.shape[1])
+
+        # Pivots that vanish relative to their column norm mean collinearity
+        # that rounding let through the factorization
+        pivots = np.diagonal(lower, axis1=1, axis2=2) ** 2
+        collinear = (
+            pivots < COLLINEARITY_TOL * np.diagonal(gram, axis1=1, axis2=2)
+        ).any(axis=1)
+        if collinear.any():
+            rss[collinear], n_params[collinear] = self._solve_rank_deficient(
+                gram[collinear], xty[collinear]
+            )
+        return np.maximum(rss, 0), n_params
+
+    def _solve_rank_deficient(self, gram: np.ndarray, xty: np.ndarray) -> tuple:
+        # Collinear subsets are solved with the pseudo-inverse like statsmodels
+        coefficients = np.linalg.pinv(gram, hermitian=True) @ xty[..., np.newaxis]
+        rss = self.yty - np.sum(xty * coefficients[..., 0], axis=1)
+        return np.maximum(rss, 0), np.linalg.matrix_rank(gram, hermitian=True)
+
+    def score(self, rss: np.ndarray, n_params: np.ndarray) -> np.ndarray:
+        """Compute the criterion to maximize from fitted subsets
+
+        Args:
+            rss (np.ndarray): Residual sum of squares
+            n_params (np.ndarray): Number of parameters of each fit
+
+        Returns:
+            np.ndarray: Negated BIC or AIC, or adjusted R²
+        """
+        n_samples = self.n_samples
+        if self.criterion == "adjusted_r2":
+            n_constant = int(self.add_constant)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return 1 - (n_samples - n_constant) / (n_samples - n_params) * (
+                    rss / self.tss
+                )
+
+        with np.errstate(divide="ignore"):
+            log_likelihood = (
+                -n_samples / 2 * (np.log(2 * np.pi) + np.log(rss / n_samples) + 1)
+            )
+        penalty = np.log(n_samples) if self.criterion == "bic" else 2
+        return 2 * log_likelihood - penalty * n_params
@@ -1,35 +1,172 @@
+from typing import Sequence, Union
 import numpy as np
 
+from genopt.rng import as_generator
 
-def init_discrete(popsize: int, n_vars: int, var_size: int) -> np.ndarray:
+DTypeLike = Union[type, str, np.dtype]
+
+
+def genome_dtype(encoding: str, dtype: DTypeLike = None) -> np.dtype:
+    """Get and check the data type of the genes for an encoding
+
+    Args:
+        encoding (str): Type of variable encoding, 'real' or 'discrete'
+        dtype (DTypeLike, optional): Requested data type. Must be float32 or
+            float64 for real encoding, and bool or an integer type for
+            discrete encoding. Uses float64 for real and int64 for discrete
+            encoding if None. Defaults to None.
+
+    Returns:
+        np.dtype: Data type of the genes
+    """
+    if dtype is None:
+        return np.dtype(np.float64 if encoding == "real" else np.int64)
+    dtype = np.dtype(dtype)
+    if encoding == "real":
+        assert dtype in [
+            np.float32,
+            np.float64,
+        ], "Real encoding requires dtype float32 or float64"
+    else:
+        assert dtype == bool or np.issubdtype(
+            dtype, np.integer
+        ), "Discrete encoding requires dtype bool or an integer type"
+    return dtype
+
+
+def init_discrete(
+    popsize: int,
+    n_vars: int,
+    var_size: Union[int, Sequence[int]],
+    rng: np.random.Generator = None,
+    dtype: DTypeLike = np.int64,
+) -> np.ndarray:
     """Initialize a population of binary chromosomes
 
     Args:
         popsize (int): Population size
         n_vars (int): Number of variables
-        var_size (int): Size of each variable
+        var_size (Union[int, Sequence[int]]): Size of each variable, or a
+            sequence with one size per variable
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        dtype (DTypeLike, optional): Data type of the genes, bool or an
+            integer type. Defaults to int64.
 
     Returns:
         np.ndarray: Binary population
     """
-    return np.random.randint(2, size=(popsize, n_vars * var_size))
+    rng = as_generator(rng)
+    chromosome_length = int(np.broadcast_to(var_size, (n_vars,)).sum())
+    return rng.integers(2, size=(popsize, chromosome_length), dtype=dtype)
+
+
+def init_packed(
+    popsize: int,
+    n_vars: int,
+    var_size: Union[int, Sequence[int]],
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """Initialize a population of binary chromosomes packed into bytes, with
+    eight genes per byte. Padding bits after the last gene are zero.
+
+    Args:
+        popsize (int): Population size
+        n_vars (int): Number of variables
+        var_size (Union[int, Sequence[int]]): Size of each variable, or a
+            sequence with one size per variable
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Packed binary population with dtype uint8
+    """
+    rng = as_generator(rng)
+    chromosome_length = int(np.broadcast_to(var_size, (n_vars,)).sum())
+    population = rng.integers(
+        256, size=(popsize, -(-chromosome_length // 8)), dtype=np.uint8
+    )
+    if chromosome_length % 8:
+        population[:, -1] &= np.uint8((0xFF << (8 - chromosome_length % 8)) & 0xFF)
+    return population
+
+
+def pack_population(population: np.ndarray) -> np.ndarray:
+    """Pack a population of binary chromosomes into bytes
+
+    Args:
+        population (np.ndarray): Binary population
+
+    Returns:
+        np.ndarray: Packed population with dtype uint8
+    """
+    return np.packbits(np.atleast_2d(population).astype(bool), axis=1)
 
 
-def init_real(popsize: int, n_vars: int) -> np.ndarray:
+def unpack_population(population: np.ndarray, chromosome_length: int) -> np.ndarray:
+    """Unpack a population of binary chromosomes packed into bytes
+
+    Args:
+        population (np.ndarray): Packed population
+        chromosome_length (int): Number of genes in each chromosome
+
+    Returns:
+        np.ndarray: Binary population with dtype uint8
+    """
+    return np.unpackbits(np.atleast_2d(population), axis=1, count=chromosome_length)
+
+
+def init_real(
+    popsize: int,
+    n_vars: int,
+    rng: np.random.Generator = None,
+    dtype: DTypeLike = np.float64,
+) -> np.ndarray:
     """Initalize a population of real valued chromosomes
 
     Args:
         popsize (int): Population size
         n_vars (int): Number of variables
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        dtype (DTypeLike, optional): Data type of the genes, float32 or
+            float64. Defaults to float64.
 
     Returns:
         np.ndarray: Real valued population
     """
-    return np.random.normal(0, 1, (popsize, n_vars))
+    rng = as_generator(rng)
+    return rng.standard_normal((popsize, n_vars), dtype=dtype)
+
+
+def as_output(population: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Get the array an operator writes its result to. The population is
+    copied to ``out``, or to a new array if ``out`` is None. Nothing is copied
+    if ``out`` is the population itself, so the operator works in place.
+
+    Args:
+        population (np.ndarray): Input population of the operator
+        out (np.ndarray, optional): Preallocated array with the shape and
+            dtype of the population. Defaults to None.
+
+    Returns:
+        np.ndarray: Array holding a copy of the population
+    """
+    population = np.atleast_2d(population)
+    if out is None:
+        return population.copy()
+    if out is not population:
+        np.copyto(out, population)
+    return out
 
 
 def update_population(
-    population: np.ndarray, top_individual: np.ndarray, elitism: int
+    population: np.ndarray,
+    top_individual: np.ndarray,
+    elitism: int,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+    carry: np.ndarray = None,
 ) -> np.ndarray:
     """Update a population with elitism and shuffle
 
@@ -37,11 +174,27 @@ def update_population(
         population (np.ndarray): Current population
         top_individual (np.ndarray): Chromosome of top individual
         elitism (int): Number of copies of the best individual to copy to new population
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the new population to, which
+            may be the population itself to update it in place. Allocates a
+            new array if None. Defaults to None.
+        carry (np.ndarray, optional): Array with one value per chromosome
+            that is shuffled in place along with the population, e.g. to keep
+            track of the parents of each chromosome. Defaults to None.
 
     Returns:
         np.ndarray: Population after elitism and shuffle
     """
-    new_population = population.copy()
-    np.random.shuffle(new_population)
+    rng = as_generator(rng)
+    new_population = as_output(population, out)
+    if carry is None:
+        rng.shuffle(new_population)
+    else:
+        # Shuffling the order draws the same permutation as shuffling the rows
+        order = np.arange(new_population.shape[0])
+        rng.shuffle(order)
+        new_population[...] = new_population[order]
+        carry[...] = carry[order]
     new_population[:elitism, :] = top_individual
     return new_population
@@ -0,0 +1,58 @@
+from typing import List, Union
+import numpy as np
+
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def as_generator(seed: SeedLike = None) -> np.random.Generator:
+    """Get a random number generator from a seed
+
+    Args:
+        seed (SeedLike, optional): Seed as an integer or
+            ``np.random.SeedSequence``, or an existing generator which is
+            returned as is. Seeds from the operating system if None.
+            Defaults to None.
+
+    Returns:
+        np.random.Generator: Random number generator using PCG64
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.Generator(np.random.PCG64(seed))
+
+
+def spawn_seeds(seed: SeedLike, n: int) -> List[np.random.SeedSequence]:
+    """Spawn independent seed sequences, e.g. for parallel workers or
+    islands. Spawning from the same seed always gives the same sequences.
+
+    Args:
+        seed (SeedLike): Parent seed as an integer, ``np.random.SeedSequence``
+            or generator. A generator spawns from its own seed sequence.
+            Seeds from the operating system if None.
+        n (int): Number of seed sequences
+
+    Returns:
+        List[np.random.SeedSequence]: Independent child seed sequences
+    """
+    if isinstance(seed, np.random.Generator):
+        bit_generator = seed.bit_generator
+        # seed_seq is only public since numpy 1.25
+        seed = getattr(bit_generator, "seed_seq", None) or getattr(
+            bit_generator, "_seed_seq"
+        )
+    elif not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+
+def spawn_generators(seed: SeedLike, n: int) -> List[np.random.Generator]:
+    """Spawn independent random number generators. See :py:func:`spawn_seeds`.
+
+    Args:
+        seed (SeedLike): Parent seed
+        n (int): Number of generators
+
+    Returns:
+        List[np.random.Generator]: Independent random number generators
+    """
+    return [as_generator(seed_seq) for seed_seq in spawn_seeds(seed, n)]
@@ -1,8 +1,75 @@
 import numpy as np
 
+from genopt.rng import as_generator
+
+# Number of random keys drawn at once when sampling large tournaments, which
+# bounds the memory of large populations
+RANDOM_KEYS_CHUNK_SIZE = 2**20
+
+
+def _take(population: np.ndarray, selected: np.ndarray, out: np.ndarray) -> np.ndarray:
+    # Gather the selected chromosomes, unbuffered into out if it is given
+    if out is None:
+        return population[selected, :]
+    assert out is not population, "Selection can not be done in place"
+    return np.take(population, selected, axis=0, out=out, mode="clip")
+
+
+def random_tournaments(
+    popsize: int,
+    t_sel_size: int,
+    rng: np.random.Generator,
+    n_tournaments: int = None,
+) -> np.ndarray:
+    """Sample the participants of random tournaments. Each tournament gets
+    ``t_sel_size`` distinct individuals, in random order.
+
+    Args:
+        popsize (int): Population size
+        t_sel_size (int): Tournament size by number of participants. Can not
+            exceed the population size.
+        rng (np.random.Generator): Random number generator
+        n_tournaments (int, optional): Number of tournaments. Uses the
+            population size if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Indices of the participants with shape
+        ``(n_tournaments, t_sel_size)``
+    """
+    assert t_sel_size <= popsize, "Tournament size can not exceed population size"
+    if n_tournaments is None:
+        n_tournaments = popsize
+    if t_sel_size * t_sel_size > popsize:
+        # Duplicates are likely, pick the individuals with the smallest random
+        # keys, drawn for a chunk of tournaments at a time
+        selected = np.empty((n_tournaments, t_sel_size), dtype=np.intp)
+        chunk_size = max(1, RANDOM_KEYS_CHUNK_SIZE // popsize)
+        for start in range(0, n_tournaments, chunk_size):
+            keys = rng.random((min(chunk_size, n_tournaments - start), popsize))
+            selected[start : start + chunk_size] = np.argpartition(
+                keys, t_sel_size - 1, axis=1
+            )[:, :t_sel_size]
+        return selected
+
+    # Sample with replacement and resample the tournaments that got duplicates
+    selected = rng.integers(popsize, size=(n_tournaments, t_sel_size))
+    while t_sel_size > 1:
+        sorted_selected = np.sort(selected, axis=1)
+        duplicates = (sorted_selected[:, 1:] == sorted_selected[:, :-1]).any(axis=1)
+        n_duplicates = duplicates.sum()
+        if n_duplicates == 0:
+            break
+        selected[duplicates] = rng.integers(popsize, size=(n_duplicates, t_sel_size))
+    return selected
+
 
 def tournament_selection(
-    population: np.ndarray, fitness: np.ndarray, t_sel_p: float, t_sel_size: int
+    population: np.ndarray,
+    fitness: np.ndarray,
+    t_sel_p: float,
+    t_sel_size: int,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
 ) -> np.ndarray:
     """Select fit individuals from a population by tournament selection.
     In tournament selection a group from the population are put into tournaments
@@ -17,20 +84,21 @@ def tournament_selection(
             new population
         t_sel_size (int): Tournament size by number of participants. Should be
             2 or more.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the selected population
+            to. Must not share memory with the population. Allocates a new
+            array if None. Defaults to None.
 
     Returns:
         np.ndarray: Population after selection of tournament winners.
     """
-    # Couldn't figure out a way to make it less messy without a bunch of loops
+    rng = as_generator(rng)
     popsize = population.shape[0]
 
     # Select t_sel_size random individuals for each tournament without replacement
-    selected = np.array(
-        [
-            np.random.choice(popsize, size=t_sel_size, replace=False)
-            for _ in range(popsize)
-        ]
-    )
+    selected = random_tournaments(popsize, t_sel_size, rng)
+
     # Save their sorted indices
     i_sel = np.argsort(-np.take(fitness, selected), axis=1)
 
@@ -38,15 +106,132 @@ def tournament_selection(
     prob_thresholds = np.cumsum(
         [t_sel_p * (1 - t_sel_p) ** i for i in range(t_sel_size - 1)]
     )
-    # Reshape probability thresholds so they can be broadcasted
-    prob_thresholds = np.tile(np.append(prob_thresholds, 1), popsize).reshape(
-        (-1, t_sel_size)
-    )
+    prob_thresholds = np.append(prob_thresholds, 1)
+
     # Sample a random number in [0, 1] and see the threshold it lands in
-    prob_diffs = prob_thresholds - np.random.rand(popsize).reshape((-1, 1))
-    i_winner = np.argmax(np.minimum(prob_diffs, 0), axis=1)
+    i_winner = np.searchsorted(prob_thresholds, rng.random(popsize))
+    i_winner = np.minimum(i_winner, t_sel_size - 1)
 
     # Return the new population
     i_sel = i_sel[np.arange(popsize), i_winner]
     selected = selected[np.arange(popsize), i_sel]
-    return population[selected, :]
+    return _take(population, selected, out)
+
+
+def _universal_sampling(
+    weights: np.ndarray, n_samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    # Sample indices proportionally to weights with evenly spaced pointers,
+    # and shuffle them so that neighbours are not copies of each other
+    cumulative = np.cumsum(weights)
+    if cumulative[-1] <= 0:
+        return rng.integers(weights.size, size=n_samples)
+    pointers = (rng.random() + np.arange(n_samples)) * cumulative[-1] / n_samples
+    selected = np.searchsorted(cumulative, pointers, side="right")
+    selected = np.minimum(selected, weights.size - 1)
+    rng.shuffle(selected)
+    return selected
+
+
+def stochastic_universal_sampling(
+    population: np.ndarray,
+    fitness: np.ndarray,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Select individuals with probability proportional to their fitness
+    using stochastic universal sampling. The fitness is shifted so that the
+    least fit individual has zero weight.
+
+    Args:
+        population (np.ndarray): Population of chromosomes
+        fitness (np.ndarray): Fitness scores for the chromosomes
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the selected population
+            to. Must not share memory with the population. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Population after selection
+    """
+    rng = as_generator(rng)
+    popsize = population.shape[0]
+    weights = np.asarray(fitness, dtype=float) - np.min(fitness)
+    return _take(population, _universal_sampling(weights, popsize, rng), out)
+
+
+def rank_selection(
+    population: np.ndarray,
+    fitness: np.ndarray,
+    selection_pressure: float = 1.5,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Select individuals by linear ranking. The fittest individual is
+    expected to be selected ``selection_pressure`` times and the least fit
+    ``2 - selection_pressure`` times, independent of the fitness scale.
+
+    Args:
+        population (np.ndarray): Population of chromosomes
+        fitness (np.ndarray): Fitness scores for the chromosomes
+        selection_pressure (float, optional): Expected number of copies of the
+            fittest individual, between 1 and 2. Defaults to 1.5.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the selected population
+            to. Must not share memory with the population. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Population after selection
+    """
+    rng = as_generator(rng)
+    popsize = population.shape[0]
+    ranks = np.empty(popsize)
+    ranks[np.argsort(fitness)] = np.arange(popsize)
+    weights = 2 - selection_pressure
+    if popsize > 1:
+        weights = weights + 2 * (selection_pressure - 1) * ranks / (popsize - 1)
+    weights = np.broadcast_to(weights, (popsize,))
+    return _take(population, _universal_sampling(weights, popsize, rng), out)
+
+
+def truncation_selection(
+    population: np.ndarray,
+    fitness: np.ndarray,
+    truncation_p: float = 0.5,
+    rng: np.random.Generator = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Select individuals uniformly at random from the fittest fraction of the
+    population
+
+    Args:
+        population (np.ndarray): Population of chromosomes
+        fitness (np.ndarray): Fitness scores for the chromosomes
+        truncation_p (float, optional): Fraction of the population that can be
+            selected. Defaults to 0.5.
+        rng (np.random.Generator, optional): Random number generator. Uses a
+            new generator if None. Defaults to None.
+        out (np.ndarray, optional): Array to write the selected population
+            to. Must not share memory with the population. Allocates a new
+            array if None. Defaults to None.
+
+    Returns:
+        np.ndarray: Population after selection
+    """
+    rng = as_generator(rng)
+    popsize = population.shape[0]
+    n_top = min(max(int(round(truncation_p * popsize)), 1), popsize)
+    top = np.argpartition(-np.asarray(fitness), n_top - 1)[:n_top]
+    return _take(population, top[rng.integers(n_top, size=popsize)], out)
+
+
+# Selection schemes by name, the selection_method of GeneticOptimizer
+SELECTION_METHODS = {
+    "tournament": tournament_selection,
+    "sus": stochastic_universal_sampling,
+    "rank": rank_selection,
+    "truncation": truncation_selection,
+}
@@ -0,0 +1,232 @@
+import bisect
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+# Upper edges in seconds of the objective latency histogram bins, four bins
+# per decade from 1 microsecond to 100 seconds. The last bin is unbounded.
+LATENCY_BINS = tuple(10.0 ** (i / 4) for i in range(-24, 9))
+
+
+class _StageTimer:
+    # Context manager adding its wall time to a stage, cheaper than a
+    # contextlib generator in the generation loop
+    __slots__ = ("stats", "stage", "start")
+
+    def __init__(self, stats: "OptimizerStats", stage: str):
+        self.stats = stats
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.add_time(self.stage, time.perf_counter() - self.start)
+
+
+# pylint: disable=R0902
+class OptimizerStats:
+    """Wall time and call counters of each stage of the generation loop, a
+    histogram of objective function latencies and optional profiles captured
+    for a range of generations. Available as ``stats`` on
+    :py:class:`~genopt.GeneticOptimizer`.
+
+    Attributes:
+        stage_times (Dict[str, float]): Total wall time in seconds per stage
+        stage_calls (Dict[str, int]): Number of calls per stage
+        latency_counts (np.ndarray): Number of objective calls per latency
+            bin, with upper bin edges ``LATENCY_BINS`` and an unbounded last bin
+        profile (pstats.Stats): cProfile statistics of the profiled
+            generations, or None
+        memory (tracemalloc.Snapshot): Memory allocations at the end of the
+            profiled generations, or None
+        memory_peak (int): Peak traced memory in bytes during the profiled
+            generations, or None
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all timings, counters and profiles"""
+        self.stage_times = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.latency_counts = np.zeros(len(LATENCY_BINS) + 1, dtype=int)
+        self.profile = None
+        self.memory = None
+        self.memory_peak = None
+        self._profiler = None
+        self._tracing = False
+
+    def timer(self, stage: str) -> _StageTimer:
+        """Time a stage with a ``with`` statement
+
+        Args:
+            stage (str): Name of the stage
+
+        Returns:
+            _StageTimer: Context manager adding its wall time to the stage
+        """
+        return _StageTimer(self, stage)
+
+    def add_time(self, stage: str, seconds: float):
+        """Add a call and its wall time to a stage
+
+        Args:
+            stage (str): Name of the stage
+            seconds (float): Wall time of the call
+        """
+        self.stage_times[stage] += seconds
+        self.stage_calls[stage] += 1
+
+    def add_latency(self, seconds: float):
+        """Add the latency of an objective function call to the histogram
+
+        Args:
+            seconds (float): Latency of the call
+        """
+        self.latency_counts[bisect.bisect_left(LATENCY_BINS, seconds)] += 1
+
+    def timed_objective(self, objective_function: Callable) -> Callable:
+        """Wrap an objective function to record the latency of every call
+
+        Args:
+            objective_function (Callable): Objective function
+
+        Returns:
+            Callable: Objective function recording its latencies
+        """
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return objective_function(*args, **kwargs)
+            finally:
+                self.add_latency(time.perf_counter() - start)
+
+        return timed
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Estimate a percentile of the objective latency from the histogram
+
+        Args:
+            percentile (float): Percentile between 0 and 100
+
+        Returns:
+            float: Upper edge of the bin containing the percentile, inf if it
+                is in the last bin and nan if no latencies were recorded
+        """
+        total = self.latency_counts.sum()
+        if total == 0:
+            return np.nan
+        i_bin = np.searchsorted(
+            np.cumsum(self.latency_counts), percentile / 100 * total
+        )
+        return LATENCY_BINS[i_bin] if i_bin < len(LATENCY_BINS) else np.inf
+
+    def start_profile(self, memory: bool = False):
+        """Start capturing a cProfile profile and optionally trace memory
+        allocations with tracemalloc
+
+        Args:
+            memory (bool, optional): Trace memory allocations.
+                Defaults to False.
+        """
+        if self._profiler is not None:
+            return
+        self._profiler = cProfile.Profile()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._profiler.enable()
+
+    def stop_profile(self):
+        """Stop the capture started by :py:meth:`start_profile` and store the
+        results in ``profile``, ``memory`` and ``memory_peak``"""
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        self.profile = pstats.Stats(self._profiler, stream=io.StringIO())
+        self._profiler = None
+        if self._tracing:
+            self.memory = tracemalloc.take_snapshot()
+            _, self.memory_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._tracing = False
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize the stage timings and objective latencies
+
+        Returns:
+            Dict[str, Dict[str, float]]: Total seconds, calls and mean seconds
+                per stage, and the number of objective calls with their
+                estimated median and 99th percentile latency under the key
+                ``objective_latency``
+        """
+        summary = {
+            stage: {
+                "seconds": seconds,
+                "calls": self.stage_calls[stage],
+                "mean": seconds / self.stage_calls[stage],
+            }
+            for stage, seconds in self.stage_times.items()
+        }
+        summary["objective_latency"] = {
+            "calls": int(self.latency_counts.sum()),
+            "p50": self.latency_percentile(50),
+            "p99": self.latency_percentile(99),
+        }
+        return summary
+
+
+class RateLimitedLogger:
+    """Emit log messages at most once per interval
+
+    Args:
+        logger (logging.Logger): Logger to emit to
+        interval (float): Minimum number of seconds between messages. Logs
+            every message if 0.
+    """
+
+    def __init__(self, logger, interval: float):
+        self.logger = logger
+        self.interval = interval
+        self._last = -np.inf
+
+    def info(self, message: str, *args, force: bool = False):
+        """Log a message at INFO level unless one was logged within the
+        interval
+
+        Args:
+            message (str): Message, formatted with args by the logger
+            force (bool, optional): Log regardless of the interval.
+                Defaults to False.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        now = time.monotonic()
+        if force or now - self._last >= self.interval:
+            self._last = now
+            self.logger.info(message, *args)
+
+
+def generation_in_range(generation: int, generations: Tuple[int, int]) -> bool:
+    """Check if a generation is in a half-open range ``[start, stop)``
+
+    Args:
+        generation (int): Generation
+        generations (Tuple[int, int]): Start and stop generation, or None
+
+    Returns:
+        bool: True if generations is not None and contains generation
+    """
+    return generations is not None and generations[0] <= generation < generations[1]
@@ -0,0 +1,361 @@
+from typing import Awaitable, Callable, Dict, Tuple
+import numpy as np
+
+
+def _squared_distances(x_a: np.ndarray, x_b: np.ndarray) -> np.ndarray:
+    # Pairwise squared euclidean distances, which for binary chromosomes are
+    # Hamming distances
+    distances = (
+        np.sum(x_a**2, axis=1).reshape((-1, 1))
+        + np.sum(x_b**2, axis=1)
+        - 2 * x_a @ x_b.T
+    )
+    return np.maximum(distances, 0)
+
+
+def _rank_correlation(x_a: np.ndarray, x_b: np.ndarray) -> float:
+    # Spearman rank correlation, nan if either array is constant
+    if x_a.size < 2 or np.ptp(x_a) == 0 or np.ptp(x_b) == 0:
+        return np.nan
+    ranks_a = np.argsort(np.argsort(x_a)).astype(float)
+    ranks_b = np.argsort(np.argsort(x_b)).astype(float)
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+class KNNRegressor:
+    """Inverse distance weighted k-nearest neighbours regression. A chromosome
+    identical to an archived one is predicted as its archived fitness.
+
+    Args:
+        k (int, optional): Number of neighbours. Defaults to 5.
+    """
+
+    def __init__(self, k: int = 5):
+        assert k > 0, "Number of neighbours must be larger than 0"
+        self.k = k
+        self.x_train = None
+        self.y_train = None
+
+    def fit(self, x_train: np.ndarray, y_train: np.ndarray):
+        """Fit the model
+
+        Args:
+            x_train (np.ndarray): Chromosomes as a 2d array
+            y_train (np.ndarray): Fitness of the chromosomes
+        """
+        self.x_train = np.asarray(x_train, dtype=float)
+        self.y_train = np.asarray(y_train, dtype=float)
+
+    def predict(self, x_test: np.ndarray) -> np.ndarray:
+        """Predict the fitness of chromosomes
+
+        Args:
+            x_test (np.ndarray): Chromosomes as a 2d array
+
+        Returns:
+            np.ndarray: Predicted fitness
+        """
+        distances = _squared_distances(np.asarray(x_test, dtype=float), self.x_train)
+        k = min(self.k, self.x_train.shape[0])
+        i_nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest = np.take_along_axis(distances, i_nearest, axis=1)
+        # Rows with an exact match only average over the exact matches
+        exact = nearest == 0
+        weights = np.where(
+            exact.any(axis=1, keepdims=True),
+            exact,
+            1 / np.where(exact, 1, nearest),
+        )
+        return np.sum(weights * self.y_train[i_nearest], axis=1) / weights.sum(axis=1)
+
+
+class RBFRegressor:
+    """Gaussian radial basis function (kernel ridge) regression
+
+    Args:
+        length_scale (float, optional): Length scale of the kernel. Set to the
+            median distance between the training chromosomes if None.
+            Defaults to None.
+        regularization (float, optional): Ridge penalty added to the kernel
+            diagonal. Defaults to 1e-6.
+    """
+
+    def __init__(self, length_scale: float = None, regularization: float = 1e-6):
+        self.length_scale = length_scale
+        self.regularization = regularization
+        self.x_train = None
+        self.weights = None
+        self.mean = 0.0
+        self._length_scale = length_scale
+
+    def fit(self, x_train: np.ndarray, y_train: np.ndarray):
+        """Fit the model
+
+        Args:
+            x_train (np.ndarray): Chromosomes as a 2d array
+            y_train (np.ndarray): Fitness of the chromosomes
+        """
+        self.x_train = np.asarray(x_train, dtype=float)
+        y_train = np.asarray(y_train, dtype=float)
+        distances = _squared_distances(self.x_train, self.x_train)
+        if self.length_scale is None:
+            median = np.median(distances[np.triu_indices_from(distances, 1)])
+            self._length_scale = np.sqrt(median) if median > 0 else 1.0
+        kernel = np.exp(-distances / (2 * self._length_scale**2))
+        kernel[np.diag_indices_from(kernel)] += self.regularization
+        self.mean = y_train.mean()
+        self.weights = np.linalg.solve(kernel, y_train - self.mean)
+
+    def predict(self, x_test: np.ndarray) -> np.ndarray:
+        """Predict the fitness of chromosomes
+
+        Args:
+            x_test (np.ndarray): Chromosomes as a 2d array
+
+        Returns:
+            np.ndarray: Predicted fitness
+        """
+        distances = _squared_distances(np.asarray(x_test, dtype=float), self.x_train)
+        kernel = np.exp(-distances / (2 * self._length_scale**2))
+        return self.mean + kernel @ self.weights
+
+
+# pylint: disable=R0902
+class SurrogateScreening:
+    """Pre-screen chromosomes with a cheap surrogate model fitted on an archive
+    of truly evaluated chromosomes. Only the fraction of a population with the
+    highest predicted fitness is evaluated with the objective function and
+    the rest get their predicted fitness. Predictions are capped below the
+    best truly evaluated fitness of the population, so the top individual
+    always has a true fitness. Every ``validation_interval`` populations are
+    evaluated in full to measure the accuracy of the surrogate.
+
+    Args:
+        model (optional): Regression model with ``fit`` and ``predict``
+            methods, e.g. :py:class:`KNNRegressor` or :py:class:`RBFRegressor`.
+            Uses a :py:class:`KNNRegressor` if None. Defaults to None.
+        fraction (float, optional): Fraction of each population evaluated with
+            the objective function. Defaults to 0.25.
+        archive_size (int, optional): Maximum number of evaluated chromosomes
+            to fit the model on, the oldest are dropped first.
+            Defaults to 1000.
+        min_archive_size (int, optional): Evaluate populations in full until
+            the archive has this many chromosomes. Defaults to 50.
+        validation_interval (int, optional): Evaluate every n:th population in
+            full. Never validates if None. Defaults to 10.
+
+    Attributes:
+        n_true (int): Number of chromosomes evaluated with the objective
+        n_predicted (int): Number of chromosomes given a predicted fitness
+        validation_errors (List[float]): Mean absolute error of the predicted
+            fitness of each validated population
+        validation_correlations (List[float]): Rank correlation between the
+            predicted and true fitness of each validated population
+    """
+
+    def __init__(
+        self,
+        model=None,
+        fraction: float = 0.25,
+        archive_size: int = 1000,
+        min_archive_size: int = 50,
+        validation_interval: int = 10,
+    ):
+        assert 0 < fraction <= 1, "Fraction must be in (0, 1]"
+        assert archive_size >= min_archive_size, "Archive is smaller than minimum"
+        self.model = model if model is not None else KNNRegressor()
+        self.fraction = fraction
+        self.archive_size = archive_size
+        self.min_archive_size = min_archive_size
+        self.validation_interval = validation_interval
+        self.n_true = 0
+        self.n_predicted = 0
+        self.validation_errors = []
+        self.validation_correlations = []
+        self._archive_x = None
+        self._archive_y = np.zeros(0)
+        self._fitted = False
+        self._n_calls = 0
+
+    def __len__(self) -> int:
+        return self._archive_y.size
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Get the archive, counters and validation results as arrays for
+        checkpoints
+
+        Returns:
+            Dict[str, np.ndarray]: Surrogate state
+        """
+        return {
+            "archive_x": (
+                self._archive_x if self._archive_x is not None else np.zeros((0, 0))
+            ),
+            "archive_y": self._archive_y,
+            "counters": np.array([self.n_true, self.n_predicted, self._n_calls]),
+            "validation_errors": np.array(self.validation_errors, dtype=float),
+            "validation_correlations": np.array(
+                self.validation_correlations, dtype=float
+            ),
+        }
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        """Restore a state from :py:meth:`get_state`. The model is fitted on
+        the restored archive before the next prediction.
+
+        Args:
+            state (Dict[str, np.ndarray]): Surrogate state
+        """
+        self._archive_y = np.asarray(state["archive_y"], dtype=float)
+        self._archive_x = (
+            np.asarray(state["archive_x"], dtype=float)
+            if self._archive_y.size
+            else None
+        )
+        self.n_true, self.n_predicted, self._n_calls = (
+            int(counter) for counter in state["counters"]
+        )
+        self.validation_errors = [float(e) for e in state["validation_errors"]]
+        self.validation_correlations = [
+            float(c) for c in state["validation_correlations"]
+        ]
+        self._fitted = False
+
+    def accuracy(self) -> Dict[str, float]:
+        """Summarize the accuracy of the surrogate over the validations
+
+        Returns:
+            Dict[str, float]: Number of validations, mean absolute error and
+                mean rank correlation
+        """
+        return {
+            "validations": len(self.validation_errors),
+            "mean_absolute_error": (
+                float(np.mean(self.validation_errors))
+                if self.validation_errors
+                else np.nan
+            ),
+            "rank_correlation": (
+                float(np.nanmean(self.validation_correlations))
+                if self.validation_correlations
+                else np.nan
+            ),
+        }
+
+    def evaluate(
+        self,
+        population: np.ndarray,
+        evaluate_function: Callable,
+        features: np.ndarray = None,
+    ) -> np.ndarray:
+        """Get the fitness of a population, evaluating only the most promising
+        chromosomes with ``evaluate_function``
+
+        Args:
+            population (np.ndarray): Population as a 2d array
+            evaluate_function (Callable): Function that takes a 2d array of
+                chromosomes and returns their fitness scores
+            features (np.ndarray, optional): Representation of the population
+                used by the model, e.g. unpacked chromosomes. Uses the
+                population if None. Defaults to None.
+
+        Returns:
+            np.ndarray: Fitness scores with shape (popsize, )
+        """
+        population = np.atleast_2d(population)
+        i_true, predicted = self._screen(population, features)
+        return self._combine(
+            population,
+            features,
+            i_true,
+            predicted,
+            evaluate_function(population[i_true]),
+        )
+
+    async def evaluate_async(
+        self,
+        population: np.ndarray,
+        evaluate_function: Callable[..., Awaitable],
+        features: np.ndarray = None,
+    ) -> np.ndarray:
+        """Coroutine version of :py:meth:`evaluate`
+
+        Args:
+            population (np.ndarray): Population as a 2d array
+            evaluate_function (Callable): Coroutine function that takes a 2d
+                array of chromosomes and returns their fitness scores
+            features (np.ndarray, optional): Representation of the population
+                used by the model. Uses the population if None.
+                Defaults to None.
+
+        Returns:
+            np.ndarray: Fitness scores with shape (popsize, )
+        """
+        population = np.atleast_2d(population)
+        i_true, predicted = self._screen(population, features)
+        fitness = await evaluate_function(population[i_true])
+        return self._combine(population, features, i_true, predicted, fitness)
+
+    def _screen(
+        self, population: np.ndarray, features: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Predict the fitness and pick the chromosomes to evaluate truly
+        self._n_calls += 1
+        popsize = population.shape[0]
+        if len(self) < self.min_archive_size:
+            return np.arange(popsize), None
+
+        features = population if features is None else features
+        if not self._fitted:
+            self.model.fit(self._archive_x, self._archive_y)
+            self._fitted = True
+        predicted = self.model.predict(features)
+        if (
+            self.validation_interval is not None
+            and self._n_calls % self.validation_interval == 0
+        ):
+            return np.arange(popsize), predicted
+
+        n_true = max(int(np.ceil(self.fraction * popsize)), 1)
+        return np.sort(np.argsort(-predicted, kind="stable")[:n_true]), predicted
+
+    def _combine(
+        self,
+        population: np.ndarray,
+        features: np.ndarray,
+        i_true: np.ndarray,
+        predicted: np.ndarray,
+        true_fitness: np.ndarray,
+    ) -> np.ndarray:
+        # Merge true and predicted fitness, update the statistics and archive
+        features = population if features is None else features
+        true_fitness = np.asarray(true_fitness, dtype=float)
+        popsize = population.shape[0]
+        self.n_true += i_true.size
+        self.n_predicted += popsize - i_true.size
+
+        if predicted is None:
+            fitness = true_fitness
+        elif i_true.size == popsize:
+            fitness = true_fitness
+            self.validation_errors.append(
+                float(np.mean(np.abs(predicted - true_fitness)))
+            )
+            self.validation_correlations.append(
+                _rank_correlation(predicted, true_fitness)
+            )
+        else:
+            cap = np.nextafter(true_fitness.max(), -np.inf)
+            fitness = np.minimum(predicted, cap)
+            fitness[i_true] = true_fitness
+
+        self._add_to_archive(features[i_true], true_fitness)
+        return fitness
+
+    def _add_to_archive(self, x_new: np.ndarray, y_new: np.ndarray):
+        x_new = np.asarray(x_new, dtype=float)
+        if self._archive_x is None:
+            self._archive_x = np.zeros((0, x_new.shape[1]))
+        self._archive_x = np.vstack([self._archive_x, x_new])[-self.archive_size :]
+        self._archive_y = np.concatenate([self._archive_y, y_new])[-self.archive_size :]
+        self._fitted = False
@@ -0,0 +1,119 @@
+import time
+from typing import Sequence, Union
+
+import numpy as np
+
+
+class TerminationCriterion:
+    """Base class for criteria that stop :py:meth:`~genopt.GeneticOptimizer.optimize`
+    early. A criterion is reset at the start of every run and then called with
+    the :py:class:`~genopt.go.GenerationRecord` of each generation.
+    """
+
+    name = "criterion"
+
+    def reset(self):
+        """Reset the criterion at the start of a run"""
+
+    def __call__(self, record) -> bool:
+        """Check if the run should stop
+
+        Args:
+            record (GenerationRecord): Summary of the latest generation
+
+        Returns:
+            bool: True if the run should stop
+        """
+        raise NotImplementedError
+
+
+class Stagnation(TerminationCriterion):
+    """Stop when the best fitness has not improved for ``n_gen`` generations.
+    With multiple objectives, the run stagnates when the best value of no
+    objective has improved.
+
+    Args:
+        n_gen (int): Number of generations without improvement
+        min_improvement (float, optional): Smallest increase of the best
+            fitness that counts as an improvement. Defaults to 0.
+    """
+
+    name = "stagnation"
+
+    def __init__(self, n_gen: int, min_improvement: float = 0.0):
+        assert n_gen > 0, "Number of generations must be larger than 0"
+        self.n_gen = n_gen
+        self.min_improvement = min_improvement
+        self.best_fitness = -np.inf
+        self.n_stagnant = 0
+
+    def reset(self):
+        self.best_fitness = -np.inf
+        self.n_stagnant = 0
+
+    def __call__(self, record) -> bool:
+        best_fitness = np.asarray(record.best_fitness, dtype=float)
+        improved = best_fitness > self.best_fitness + self.min_improvement
+        if improved.any():
+            self.best_fitness = np.where(improved, best_fitness, self.best_fitness)
+            self.n_stagnant = 0
+        else:
+            self.n_stagnant += 1
+        return self.n_stagnant >= self.n_gen
+
+
+class TargetFitness(TerminationCriterion):
+    """Stop when the best fitness reaches a target. With multiple objectives,
+    the best value of every objective must reach its target.
+
+    Args:
+        target (Union[float, Sequence[float]]): Target fitness, or one target
+            per objective
+    """
+
+    name = "target_fitness"
+
+    def __init__(self, target: Union[float, Sequence[float]]):
+        self.target = target
+
+    def __call__(self, record) -> bool:
+        return bool(np.all(np.asarray(record.best_fitness) >= self.target))
+
+
+class TimeLimit(TerminationCriterion):
+    """Stop when the wall-clock time since the start of the run exceeds a
+    limit. The running generation is always finished.
+
+    Args:
+        seconds (float): Time limit in seconds
+    """
+
+    name = "time_limit"
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.start = time.monotonic()
+
+    def reset(self):
+        self.start = time.monotonic()
+
+    def __call__(self, record) -> bool:
+        return time.monotonic() - self.start >= self.seconds
+
+
+class MaxEvaluations(TerminationCriterion):
+    """Stop when the number of objective function evaluations reaches a
+    budget. The running generation is always finished, so the budget can be
+    exceeded by at most one population.
+
+    Args:
+        n_evaluations (int): Maximum number of evaluations
+    """
+
+    name = "max_evaluations"
+
+    def __init__(self, n_evaluations: int):
+        self.n_evaluations = n_evaluations
+
+    def __call__(self, record) -> bool:
+        return record.n_evaluations >= self.n_evaluations
@@ -0,0 +1,171 @@
+import numpy as np
+from genopt import GeneticOptimizer
+from genopt.adaptation import (
+    ImprovementRule,
+    OneFifthRule,
+    SelfAdaptiveMutation,
+    offspring_parent_fitness,
+)
+from genopt.termination import MaxEvaluations, TargetFitness
+
+
+class DummyOptimizer:
+    encoding = "real"
+    chromosome_length = 10
+    mut_p = 0.1
+    mut_var = 1.0
+    crossover_p = 1.0
+
+
+def sphere(x):
+    return -(x**2).sum(axis=1)
+
+
+def onemax(x):
+    return x.sum(axis=1)
+
+
+def test_offspring_parent_fitness():
+    population = np.array([[0, 0], [1, 1], [2, 2]])
+    fitness = np.array([1.0, 3.0, 2.0])
+    parents = np.array([0, 2, 2, 1, 0])
+    offspring = np.array([[0, 2], [2, 0], [2, 2], [1, 2], [5, 5]])
+    parent_fitness = offspring_parent_fitness(population, fitness, parents, offspring)
+    assert np.array_equal(parent_fitness, [2.0, 2.0, np.nan, 3.0, 1.0], equal_nan=True)
+
+
+def test_one_fifth_rule():
+    optimizer = DummyOptimizer()
+    rule = OneFifthRule()
+    parent_fitness = np.array([0.0, 0.0, 0.0, 0.0, np.nan])
+    rule.update(optimizer, np.array([1.0, 0.0, -1.0, -1.0, 5.0]), parent_fitness)
+    assert rule.success_rate == 0.25
+    assert optimizer.mut_var == 1 / 0.85
+
+    rule.update(optimizer, np.array([0.0, -1.0, -1.0, -1.0, 5.0]), parent_fitness)
+    assert np.isclose(optimizer.mut_var, 1.0)
+
+    # Generations without tracked offspring leave the parameter unchanged
+    rule.update(optimizer, np.zeros(5), np.full(5, np.nan))
+    assert np.isclose(optimizer.mut_var, 1.0)
+
+    optimizer.encoding = "discrete"
+    rule = OneFifthRule(bounds=(0.05, 0.1))
+    rule.update(optimizer, np.ones(4), np.zeros(4))
+    assert optimizer.mut_p == 0.1
+
+
+def test_improvement_rule():
+    optimizer = DummyOptimizer()
+    rule = ImprovementRule(factor=2, patience=2)
+    rule.update(optimizer, np.array([1.0]), None)
+    assert optimizer.mut_p == 0.1 and optimizer.crossover_p == 1.0
+
+    rule.update(optimizer, np.array([2.0]), None)
+    assert optimizer.mut_p == 0.2 and optimizer.crossover_p == 0.5
+    for _ in range(2):
+        rule.update(optimizer, np.array([2.0]), None)
+    assert optimizer.mut_p == 0.1 and optimizer.crossover_p == 1.0
+
+    restored = ImprovementRule(factor=2, patience=2)
+    rule.update(optimizer, np.array([2.0]), None)
+    restored.set_state(rule.get_state())
+    assert restored.best_fitness == 2 and restored.n_stagnant == 1
+
+
+def test_self_adaptive_mutation():
+    go = GeneticOptimizer(
+        10,
+        50,
+        sphere,
+        vectorized=True,
+        crossover_p=0.5,
+        adaptation=[SelfAdaptiveMutation(initial_step=2.0)],
+        seed=0,
+    )
+    assert go.population.shape == (50, 11)
+    assert (go.population[:, -1] == 2).all()
+    records = list(go.iter_generations(100))
+    steps = [record.parameters["median_step"] for record in records]
+    assert steps[-1] < steps[0]
+    assert records[-1].best_fitness > records[0].best_fitness
+    # Step sizes are not passed to the objective
+    best = go.decode(go.top_individual).reshape((1, -1))
+    assert best.shape == (1, 10)
+    assert go.fitness.max() == sphere(best)[0]
+
+
+def test_self_adaptive_mutation_blend_crossover():
+    adaptation = SelfAdaptiveMutation(min_step=0.01)
+    go = GeneticOptimizer(
+        10,
+        50,
+        sphere,
+        vectorized=True,
+        crossover_method="blend",
+        blend_alpha=1.0,
+        adaptation=[adaptation],
+        seed=0,
+    )
+    # Blend crossover extrapolates the step sizes of distant parents below 0
+    go.population[:, -1] = np.tile([0.01, 10.0], 25)
+    steps = go.crossover(go.population)[:, -1]
+    assert (steps >= adaptation.min_step).all()
+    assert (steps == adaptation.min_step).any()
+    for record in go.iter_generations(10):
+        assert (go.population[:, -1] >= adaptation.min_step).all()
+
+
+def test_adaptation_fewer_evaluations():
+    kwargs = dict(
+        vectorized=True,
+        crossover_p=0.5,
+        seed=0,
+        termination=[TargetFitness(-1e-2), MaxEvaluations(50000)],
+    )
+    fixed = GeneticOptimizer(10, 50, sphere, **kwargs)
+    fixed.optimize()
+    adaptive = GeneticOptimizer(10, 50, sphere, adaptation=[OneFifthRule()], **kwargs)
+    adaptive.optimize()
+    assert adaptive.termination_reason == "target_fitness"
+    assert adaptive.n_evaluations < fixed.n_evaluations
+
+    kwargs = dict(
+        encoding="discrete",
+        vectorized=True,
+        seed=0,
+        termination=[TargetFitness(60), MaxEvaluations(50000)],
+    )
+    fixed = GeneticOptimizer(60, 50, onemax, **kwargs)
+    fixed.optimize()
+    adaptive = GeneticOptimizer(
+        60, 50, onemax, adaptation=[ImprovementRule()], **kwargs
+    )
+    adaptive.optimize()
+    assert adaptive.termination_reason == "target_fitness"
+    assert adaptive.n_evaluations < fixed.n_evaluations
+
+
+def test_adaptation_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    kwargs = dict(encoding="discrete", vectorized=True, seed=3)
+    go = GeneticOptimizer(
+        20, 20, onemax, adaptation=[OneFifthRule(), ImprovementRule()], **kwargs
+    )
+    records = list(go.iter_generations(5))
+    assert set(records[-1].parameters) == {
+        "mut_p",
+        "mut_var",
+        "crossover_p",
+        "success_rate",
+    }
+    assert records[-1].parameters["mut_p"] == go.mut_p
+    go.checkpoint(path)
+    expected = go.optimize(5)
+
+    go = GeneticOptimizer(
+        20, 20, onemax, adaptation=[OneFifthRule(), ImprovementRule()], **kwargs
+    )
+    go.load(path)
+    assert go.mut_p == records[-1].parameters["mut_p"]
+    assert (go.optimize(5) == expected).all()
@@ -0,0 +1,111 @@
+import time
+
+import numpy as np
+
+from genopt import BatchOptimizer, GeneticOptimizer
+from genopt.batch import (
+    batch_mutation,
+    batch_one_way_crossover,
+    batch_tournament_selection,
+    batch_update_population,
+)
+
+
+def test_batch_tournament_selection():
+    n_runs, popsize = 3, 10000
+    fitness = np.tile(np.random.rand(popsize), (n_runs, 1))
+    population = fitness[..., np.newaxis]
+    selected = batch_tournament_selection(
+        population, fitness, np.array([1, 1, 0.7]), np.array([1, 3, 2])
+    )
+    assert selected.shape == (n_runs, popsize, 1)
+    # Expected best of one and three uniform samples, and the expected value
+    # of a size 2 tournament won by the fitter individual 70% of the time
+    assert 0.48 < selected[0].mean() < 0.52
+    assert 0.73 < selected[1].mean() < 0.77
+    assert 0.55 < selected[2].mean() < 0.58
+
+
+def test_batch_tournament_selection_size_equals_popsize():
+    fitness = np.array([[0, 1], [1, 0]])
+    population = fitness[..., np.newaxis]
+    selected = batch_tournament_selection(population, fitness, 1, 2)
+    assert (selected == 1).all()
+
+    # Large tournaments do not rely on rejection sampling
+    fitness = np.tile(np.arange(30), (3, 1))
+    population = fitness[..., np.newaxis]
+    selected = batch_tournament_selection(population, fitness, 1, [30, 30, 2])
+    assert (selected[:2] == 29).all()
+    go = BatchOptimizer(2, 5, 30, lambda x: x.sum(), t_sel_size=30)
+    go.optimize(1)
+
+
+def test_batch_one_way_crossover():
+    population = np.zeros((2, 4, 6), dtype=int)
+    population[:, 1::2] = 1
+    crossed = batch_one_way_crossover(population, [1, 0])
+    # Genes are only exchanged, and the first gene is always swapped
+    assert (crossed.sum(axis=1) == 2).all()
+    assert (crossed[0, ::2, 0] == 1).all()
+    assert (crossed[1] == population[1]).all()
+
+
+def test_batch_mutation():
+    population = np.zeros((2, 100, 50), dtype=int)
+    mutated = batch_mutation(population, [0, 0.5])
+    assert mutated[0].sum() == 0
+    assert 0.45 < mutated[1].mean() < 0.55
+    real = batch_mutation(population.astype(float), [1, 0], [1, 1])
+    assert (real[0] != 0).all() and (real[1] == 0).all()
+    real = batch_mutation(population.astype(np.float32), 0.5, 1.0)
+    assert real.dtype == np.float32
+
+
+def test_batch_update_population():
+    population = np.arange(2 * 4).reshape((2, 4, 1))
+    top = np.array([[-1], [-2]])
+    updated = batch_update_population(population, top, [1, 3])
+    assert (updated[0, :1] == -1).all() and (updated[0, 1:] >= 0).all()
+    assert (updated[1, :3] == -2).all()
+    assert sorted(updated[0, 1:].ravel()) != [-1] * 3
+
+
+def test_batch_optimizer():
+    mut_p = np.array([0.0, 0.05, 0.1, 0.2])
+    optimizer = BatchOptimizer(
+        4,
+        10,
+        20,
+        lambda x: x.sum(axis=1),
+        t_sel_size=2,
+        mut_p=mut_p,
+        encoding="discrete",
+        vectorized=True,
+        seed=0,
+    )
+    top = optimizer.optimize(20)
+    assert top.shape == (4, 10)
+    assert optimizer.history.shape == (21, 4)
+    assert (np.diff(optimizer.history, axis=0) >= 0).all()
+    results = optimizer.results()
+    assert [result["mut_p"] for result in results] == mut_p.tolist()
+    assert all(
+        result["best_fitness"] == result["best_variables"].sum() for result in results
+    )
+
+
+def test_batch_optimizer_faster_than_sequential_runs():
+    n_runs, n_gen = 50, 20
+
+    def objective(x):
+        return -np.sum(x**2, axis=-1)
+
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        GeneticOptimizer(5, 10, objective, vectorized=True, seed=0).optimize(n_gen)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    BatchOptimizer(n_runs, 5, 10, objective, vectorized=True, seed=0).optimize(n_gen)
+    assert time.perf_counter() - start < sequential
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from genopt.benchmarks import (
+    ackley,
+    deceptive_trap,
+    get_problems,
+    make_variable_selection,
+    onemax,
+    rastrigin,
+    rosenbrock,
+    run_microbenchmarks,
+    run_problem,
+)
+from genopt.benchmarks.__main__ import main
+
+
+def test_optima():
+    zeros = np.zeros((1, 4))
+    np.testing.assert_allclose(rastrigin(zeros), 0)
+    np.testing.assert_allclose(ackley(zeros), 0, atol=1e-12)
+    np.testing.assert_allclose(rosenbrock(np.ones((1, 4))), 0)
+    assert rastrigin(np.ones((1, 4)))[0] < 0
+    assert onemax(np.array([[1, 0, 1, 1]]))[0] == 3
+
+
+def test_deceptive_trap():
+    chromosomes = np.array(
+        [[1, 1, 1, 1, 0, 0, 0, 0], [1, 1, 1, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0]]
+    )
+    np.testing.assert_array_equal(deceptive_trap(chromosomes), [7, 2, 6])
+
+
+def test_variable_selection():
+    objective, informative = make_variable_selection(100, 10, 3, seed=1)
+    assert informative.sum() == 3
+    candidates = np.vstack(
+        [informative, np.ones(10, dtype=int), 1 - informative, np.zeros(10)]
+    )
+    fitness = objective(candidates)
+    assert fitness.shape == (4,)
+    assert fitness[0] == fitness.max()
+
+
+def test_run_problem():
+    problem = get_problems(8)["onemax"]
+    result = run_problem(problem, popsize=20, n_gen=30, seed=0)
+    assert result["n_evaluations"] == 20 * 31
+    assert result["best_fitness"] <= problem.optimum
+    assert result["evaluations_to_target"] is None or (
+        result["evaluations_to_target"] <= result["n_evaluations"]
+    )
+    with pytest.raises(AssertionError):
+        run_problem(problem, popsize=20, n_gen=1, n_objectives=2)
+
+
+def test_microbenchmarks():
+    results = run_microbenchmarks([10], [16, 32], repeats=2, seed=0)
+    assert len(results) == 2 * 6
+    assert all(result["min"] <= result["median"] for result in results)
+
+
+def test_cli(tmp_path):
+    output = tmp_path / "results.json"
+    argv = ["--problems", "onemax", "--size", "8", "--popsize", "10", "--n-gen", "2"]
+    results = main(argv + ["--output", str(output)])
+    assert json.loads(output.read_text()) == results
+    assert [result["problem"] for result in results["problems"]] == ["onemax"]
+    assert "micro" not in results
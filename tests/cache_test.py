@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+from genopt.cache import FitnessCache
+
+
+def evaluate_rows(population):
+    evaluate_rows.calls.append(population.shape[0])
+    return population.sum(axis=1)
+
+
+evaluate_rows.calls = []
+
+
+def test_fitness_cache_deduplicates():
+    evaluate_rows.calls.clear()
+    population = np.array([[0, 1], [1, 1], [0, 1], [1, 1], [1, 0]])
+    cache = FitnessCache()
+    fitness = cache.evaluate(population, evaluate_rows)
+    assert (fitness == population.sum(axis=1)).all()
+    assert evaluate_rows.calls == [3]
+    assert cache.misses == 3
+    assert cache.duplicates == 2
+    assert len(cache) == 3
+
+
+def test_fitness_cache_hits():
+    evaluate_rows.calls.clear()
+    cache = FitnessCache()
+    cache.evaluate(np.array([[0, 1], [1, 1]]), evaluate_rows)
+    fitness = cache.evaluate(np.array([[1, 1], [0, 0], [0, 1]]), evaluate_rows)
+    assert (fitness == [2, 0, 1]).all()
+    assert evaluate_rows.calls == [2, 1]
+    assert cache.hits == 2
+    assert cache.misses == 3
+
+
+def test_fitness_cache_all_hits():
+    evaluate_rows.calls.clear()
+    cache = FitnessCache()
+    population = np.random.rand(5, 3)
+    cache.evaluate(population, evaluate_rows)
+    fitness = cache.evaluate(population, evaluate_rows)
+    assert np.allclose(fitness, population.sum(axis=1))
+    assert evaluate_rows.calls == [5]
+
+
+def test_fitness_cache_lru_eviction():
+    cache = FitnessCache(maxsize=2)
+    cache.evaluate(np.array([[0, 0], [0, 1]]), evaluate_rows)
+    cache.evaluate(np.array([[0, 0]]), evaluate_rows)
+    cache.evaluate(np.array([[1, 1]]), evaluate_rows)
+    assert len(cache) == 2
+    assert np.array([0, 0]) in cache
+    assert np.array([0, 1]) not in cache
+    assert np.array([1, 1]) in cache
+
+
+def test_fitness_cache_async():
+    async def evaluate_async(population):
+        await asyncio.sleep(0)
+        return population.sum(axis=1)
+
+    cache = FitnessCache()
+    population = np.array([[0, 1], [0, 1], [1, 1]])
+    loop = asyncio.new_event_loop()
+    try:
+        fitness = loop.run_until_complete(
+            cache.evaluate_async(population, evaluate_async)
+        )
+    finally:
+        loop.close()
+    assert (fitness == [1, 1, 2]).all()
+    assert cache.misses == 2
+
+
+def test_fitness_cache_objective_vectors():
+    cache = FitnessCache()
+
+    def evaluate_objectives(population):
+        return np.column_stack([population.sum(axis=1), -population[:, 0]])
+
+    cache.evaluate(np.array([[0, 1], [1, 1]]), evaluate_objectives)
+    fitness = cache.evaluate(np.array([[1, 1], [1, 0], [1, 1]]), evaluate_objectives)
+    assert (fitness == [[2, -1], [1, -1], [2, -1]]).all()
+    assert cache.hits == 1
+    assert cache.duplicates == 1
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pytest
+from genopt.checkpoint import (
+    load_checkpoint,
+    rng_state_from_array,
+    rng_state_to_array,
+    save_checkpoint,
+)
+
+
+def test_save_load_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    state = {"population": np.random.rand(5, 3), "generation": np.array(4)}
+    save_checkpoint(path, state)
+    loaded = load_checkpoint(path)
+    assert (loaded["population"] == state["population"]).all()
+    assert int(loaded["generation"]) == 4
+    assert os.listdir(str(tmp_path)) == ["checkpoint.npz"]
+
+
+class Unserializable:
+    def __array__(self, *args, **kwargs):
+        raise ValueError("Can not serialize")
+
+
+def test_save_checkpoint_keeps_old_file_on_error(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    save_checkpoint(path, {"generation": np.array(1)})
+    with pytest.raises(ValueError):
+        save_checkpoint(path, {"generation": Unserializable()})
+    assert int(load_checkpoint(path)["generation"]) == 1
+    assert os.listdir(str(tmp_path)) == ["checkpoint.npz"]
+
+
+def test_rng_state():
+    rng = np.random.default_rng(0)
+    state = rng_state_to_array(rng)
+    expected = rng.random(3)
+    rng_state_from_array(rng, state)
+    assert (rng.random(3) == expected).all()
@@ -1,5 +1,15 @@
 import numpy as np
-from genopt.crossover import one_way_crossover
+from genopt.crossover import (
+    blend_crossover,
+    k_point_crossover,
+    k_point_crossover_packed,
+    one_way_crossover,
+    one_way_crossover_packed,
+    two_point_crossover,
+    uniform_crossover,
+    uniform_crossover_packed,
+)
+from genopt.population import pack_population, unpack_population
 
 
 def test_one_way_crossover_single_chromosome():
@@ -26,3 +36,143 @@ def test_one_way_crossover_uneven_popsize():
     assert population[0, 0] == new_population[1, 0]
     assert population[1, 0] == new_population[0, 0]
     assert (population[2, :] == new_population[2, :]).all()
+
+
+def test_one_way_crossover_packed():
+    chromosome_length = 21
+    popsize = 51
+    population = np.zeros((popsize, chromosome_length), dtype=np.uint8)
+    population[1::2] = 1
+    new_population = one_way_crossover_packed(
+        pack_population(population), chromosome_length
+    )
+    assert new_population.shape == (popsize, 3)
+    assert (new_population[:, -1] & 0b111).sum() == 0
+
+    unpacked = unpack_population(new_population, chromosome_length)
+    for j in range(0, popsize - 1, 2):
+        cross_point = unpacked[j].sum()
+        assert 1 <= cross_point <= chromosome_length - 2
+        assert (unpacked[j, :cross_point] == 1).all()
+        assert (unpacked[j + 1] == 1 - unpacked[j]).all()
+    assert (unpacked[-1] == 0).all()
+
+
+def test_one_way_crossover_probability():
+    population = np.random.rand(100, 5)
+    new_population = one_way_crossover(population, crossover_p=0)
+    assert (population == new_population).all()
+
+
+def test_two_point_crossover():
+    chromosome_length = 10
+    population = np.zeros((50, chromosome_length))
+    population[1::2] = 1
+    new_population = two_point_crossover(population)
+    assert (new_population[0::2] + new_population[1::2] == 1).all()
+    # Exactly one segment is swapped, so the genes change value twice
+    n_changes = np.abs(np.diff(new_population[0::2], axis=1)).sum(axis=1)
+    assert (n_changes <= 2).all()
+    assert (new_population[0::2].sum(axis=1) < chromosome_length).all()
+
+
+def test_k_point_crossover_packed_matches_mask():
+    chromosome_length = 37
+    population = np.zeros((20, chromosome_length), dtype=np.uint8)
+    population[1::2] = 1
+    new_population = unpack_population(
+        k_point_crossover_packed(pack_population(population), chromosome_length, 3),
+        chromosome_length,
+    )
+    assert (new_population[0::2] + new_population[1::2] == 1).all()
+    n_changes = np.abs(np.diff(new_population[0::2].astype(int), axis=1)).sum(axis=1)
+    assert (n_changes == 3).all()
+    assert (new_population[0::2, 0] == 1).all()
+
+
+def test_k_point_crossover_packed_matches_unpacked():
+    chromosome_length = 37
+    population = np.random.randint(0, 2, (20, chromosome_length), dtype=np.uint8)
+    for k in [1, 3, 6, 20]:
+        expected = k_point_crossover(population, k, rng=k)
+        new_population = k_point_crossover_packed(
+            pack_population(population), chromosome_length, k, rng=k
+        )
+        assert (unpack_population(new_population, chromosome_length) == expected).all()
+
+
+def test_k_point_crossover_odd_popsize():
+    population = np.random.rand(5, 8)
+    new_population = k_point_crossover(population, 3)
+    assert (new_population[-1] == population[-1]).all()
+
+
+def test_uniform_crossover():
+    population = np.zeros((2, 1000))
+    population[1] = 1
+    new_population = uniform_crossover(population)
+    assert (new_population.sum(axis=0) == 1).all()
+    assert 400 < new_population[0].sum() < 600
+
+
+def test_uniform_crossover_packed():
+    chromosome_length = 1000
+    population = np.zeros((2, chromosome_length), dtype=np.uint8)
+    population[1] = 1
+    new_population = unpack_population(
+        uniform_crossover_packed(pack_population(population), chromosome_length),
+        chromosome_length,
+    )
+    assert (new_population.sum(axis=0) == 1).all()
+    assert 400 < new_population[0].sum() < 600
+
+
+def test_uniform_crossover_packed_chunked(monkeypatch):
+    import genopt.crossover
+
+    chromosome_length = 100
+    packed = pack_population(np.random.randint(0, 2, (21, chromosome_length)))
+    expected = uniform_crossover_packed(packed, chromosome_length, 0.3, rng=1)
+    monkeypatch.setattr(
+        genopt.crossover, "RANDOM_MASK_CHUNK_SIZE", 3 * chromosome_length
+    )
+    new_population = uniform_crossover_packed(packed, chromosome_length, 0.3, rng=1)
+    assert (new_population == expected).all()
+
+
+def test_blend_crossover():
+    alpha = 0.5
+    population = np.zeros((1000, 3))
+    population[1::2] = 1
+    new_population = blend_crossover(population, alpha)
+    assert (new_population >= -alpha).all()
+    assert (new_population <= 1 + alpha).all()
+    assert (new_population < 0).any()
+    assert (new_population > 1).any()
+
+
+def test_crossover_out():
+    rng = np.random.default_rng(0)
+    population = rng.integers(2, size=(10, 8))
+    expected = one_way_crossover(population, rng=np.random.default_rng(1))
+    out = np.empty_like(population)
+    result = one_way_crossover(population, rng=np.random.default_rng(1), out=out)
+    assert result is out and (out == expected).all()
+
+    # In place
+    result = one_way_crossover(population, rng=np.random.default_rng(1), out=population)
+    assert result is population and (population == expected).all()
+
+    packed = pack_population(population)
+    expected = uniform_crossover_packed(packed, 8, rng=np.random.default_rng(2))
+    uniform_crossover_packed(packed, 8, rng=np.random.default_rng(2), out=packed)
+    assert (packed == expected).all()
+
+
+def test_crossover_preserves_dtype():
+    population = np.random.rand(10, 6).astype(np.float32)
+    assert blend_crossover(population).dtype == np.float32
+    assert one_way_crossover(population).dtype == np.float32
+    population = np.random.rand(10, 6) < 0.5
+    assert uniform_crossover(population).dtype == bool
+    assert k_point_crossover(population, 3).dtype == bool
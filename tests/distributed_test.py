@@ -0,0 +1,157 @@
+import functools
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+from genopt import GeneticOptimizer
+from genopt.distributed import DistributedEvaluator, main, run_worker
+from genopt.evaluation import worker_rng
+
+
+def objective(arr):
+    return arr.sum()
+
+
+def vectorized_objective(arr):
+    return arr.sum(axis=1)
+
+
+def failing_objective(arr):
+    raise ValueError("Bad chromosome")
+
+
+def random_objective(arr):
+    return worker_rng().random()
+
+
+def exit_once_objective(marker, arr):
+    # The first worker to evaluate a chromosome dies
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return arr.sum()
+
+
+def hang_once_objective(marker, arr):
+    # The first worker to evaluate a chromosome stops responding
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        time.sleep(1.5)
+    return arr.sum()
+
+
+def start_workers(evaluator, n_workers):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(
+            target=run_worker, args=(evaluator.address, evaluator.authkey), daemon=True
+        )
+        for _ in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    assert evaluator.wait_for_workers(n_workers, timeout=10) == n_workers
+    return workers
+
+
+def stop_workers(workers):
+    for worker in workers:
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+
+
+def test_distributed_evaluator_order():
+    variables = np.random.rand(103, 4)
+    with DistributedEvaluator(batch_size=10) as evaluator:
+        workers = start_workers(evaluator, 3)
+        fitness = evaluator.evaluate(variables, objective)
+        np.testing.assert_allclose(fitness, variables.sum(axis=1))
+        fitness = evaluator.evaluate(variables, vectorized_objective, True, 4)
+        np.testing.assert_allclose(fitness, variables.sum(axis=1))
+        assert sum(info["n_completed"] for info in evaluator.workers.values()) == 22
+    stop_workers(workers)
+    assert all(worker.exitcode == 0 for worker in workers)
+
+
+def test_distributed_evaluator_lost_worker(tmp_path):
+    variables = np.random.rand(40, 3)
+    lost_objective = functools.partial(exit_once_objective, str(tmp_path / "lost"))
+    with DistributedEvaluator(batch_size=5) as evaluator:
+        workers = start_workers(evaluator, 2)
+        fitness = evaluator.evaluate(variables, lost_objective)
+        np.testing.assert_allclose(fitness, variables.sum(axis=1))
+        assert evaluator.n_workers == 1
+    stop_workers(workers)
+
+
+def test_distributed_evaluator_timeout(tmp_path):
+    variables = np.random.rand(20, 3)
+    slow_objective = functools.partial(hang_once_objective, str(tmp_path / "slow"))
+    with DistributedEvaluator(batch_size=5, task_timeout=0.3) as evaluator:
+        workers = start_workers(evaluator, 2)
+        fitness = evaluator.evaluate(variables, slow_objective)
+        np.testing.assert_allclose(fitness, variables.sum(axis=1))
+        assert evaluator.n_workers == 1
+    stop_workers(workers)
+
+
+def test_distributed_evaluator_errors():
+    with DistributedEvaluator(worker_timeout=0.2) as evaluator:
+        with pytest.raises(RuntimeError):
+            evaluator.evaluate(np.ones((2, 2)), objective)
+        workers = start_workers(evaluator, 1)
+        with pytest.raises(RuntimeError, match="Bad chromosome"):
+            evaluator.evaluate(np.ones((8, 2)), failing_objective)
+        # The worker keeps serving after an objective error
+        fitness = evaluator.evaluate(np.ones((8, 2)), objective)
+        assert (fitness == 2).all()
+    stop_workers(workers)
+
+
+def test_distributed_evaluator_seed():
+    variables = np.zeros((12, 2))
+    results = []
+    for n_workers in [1, 3]:
+        with DistributedEvaluator(batch_size=2, seed=5) as evaluator:
+            workers = start_workers(evaluator, n_workers)
+            results.append(evaluator.evaluate(variables, random_objective))
+        stop_workers(workers)
+    np.testing.assert_array_equal(results[0], results[1])
+
+
+def test_distributed_main(monkeypatch):
+    with DistributedEvaluator() as evaluator:
+        argv = ["--port", str(evaluator.address[1]), "--processes", "2"]
+        monkeypatch.delenv("GENOPT_AUTHKEY", raising=False)
+        with pytest.raises(SystemExit):
+            main(argv)
+
+        monkeypatch.setenv("GENOPT_AUTHKEY", evaluator.authkey.decode())
+        context = multiprocessing.get_context("fork")
+        process = context.Process(target=main, args=(argv,))
+        process.start()
+        assert evaluator.wait_for_workers(2, timeout=10) == 2
+    process.join(timeout=5)
+    assert process.exitcode == 0
+
+
+def test_distributed_authkey():
+    with DistributedEvaluator() as evaluator, DistributedEvaluator() as other:
+        assert len(evaluator.authkey) == 64
+        assert evaluator.authkey != other.authkey
+    with DistributedEvaluator(authkey=b"secret") as evaluator:
+        assert evaluator.authkey == b"secret"
+
+
+def test_go_distributed():
+    kwargs = dict(encoding="discrete", var_size=3, seed=3)
+    expected = GeneticOptimizer(8, 20, objective, **kwargs).optimize(5)
+    with DistributedEvaluator() as evaluator:
+        workers = start_workers(evaluator, 2)
+        go = GeneticOptimizer(8, 20, objective, evaluator=evaluator, **kwargs)
+        result = go.optimize(5)
+    stop_workers(workers)
+    assert (result == expected).all()
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from genopt import GeneticOptimizer
+from genopt.diversity import (
+    DiversityMonitor,
+    gene_counts,
+    gene_variance,
+    mean_hamming_distance,
+)
+from genopt.termination import MaxEvaluations, TargetFitness
+
+
+def trap(x):
+    blocks = x.reshape((x.shape[0], -1, 4)).sum(axis=2)
+    return np.where(blocks == 4, 4, 3 - blocks).sum(axis=1)
+
+
+def test_mean_hamming_distance():
+    population = np.random.randint(2, size=(20, 13), dtype=np.uint8)
+    distances = [
+        np.count_nonzero(population[i] ^ population[j])
+        for i in range(20)
+        for j in range(i + 1, 20)
+    ]
+    expected = np.mean(distances)
+    assert np.isclose(mean_hamming_distance(population), expected)
+    packed = np.packbits(population, axis=1)
+    assert np.isclose(mean_hamming_distance(packed, 13), expected)
+    assert (gene_counts(packed, 13) == population.sum(axis=0)).all()
+
+    assert mean_hamming_distance(np.ones((5, 4), dtype=bool)) == 0
+    assert mean_hamming_distance(np.ones((1, 4))) == 0
+
+
+def test_gene_variance():
+    population = np.array([[0.0, 1.0], [2.0, 1.0]])
+    assert (gene_variance(population) == [1, 0]).all()
+
+
+def test_should_respond():
+    monitor = DiversityMonitor(threshold=0.1, cooldown=3)
+    assert not monitor.should_respond(None, 0)
+    assert not monitor.should_respond(0.2, 1)
+    assert monitor.should_respond(0.05, 2)
+    assert not monitor.should_respond(0.05, 4)
+    assert monitor.should_respond(0.05, 5)
+    assert monitor.n_restarts == 2 and monitor.last_restart == 5
+
+    restored = DiversityMonitor()
+    restored.set_state(monitor.get_state())
+    assert restored.n_restarts == 2 and restored.last_restart == 5
+    assert not DiversityMonitor(response=None).should_respond(0.0, 1)
+    with pytest.raises(AssertionError):
+        DiversityMonitor(response="restart")
+
+
+def test_respond():
+    go = GeneticOptimizer(5, 10, lambda x: x.sum(axis=1), vectorized=True, seed=0)
+    population = np.zeros((10, 5))
+    assert DiversityMonitor(fraction=0.5).respond(go, population, 2) == 5
+    assert (population[:2] == 0).all() and (population[7:] == 0).all()
+    assert (population[2:7] != 0).all()
+
+    population = np.zeros((10, 5))
+    monitor = DiversityMonitor(response="mutate", fraction=1.0, mut_p=1.0)
+    assert monitor.respond(go, population, 1) == 9
+    assert (population[0] == 0).all() and (population[1:] != 0).all()
+
+    population = np.zeros((10, 5))
+    monitor = DiversityMonitor(threshold=0.5, fraction=0.5)
+    go.diversity = 0.6
+    assert monitor.restart(go, population, 1) == 0 and (population == 0).all()
+    go.diversity = 0.1
+    assert monitor.restart(go, population, 1) == 5
+    assert monitor.n_restarts == 1 and (population[1:6] != 0).all()
+
+
+def test_go_diversity_restarts(tmp_path):
+    kwargs = dict(
+        encoding="discrete",
+        vectorized=True,
+        t_sel_size=4,
+        seed=2,
+        termination=[TargetFitness(38), MaxEvaluations(30000)],
+    )
+    reference = GeneticOptimizer(40, 30, trap, **kwargs)
+    reference.optimize()
+    monitor = DiversityMonitor()
+    go = GeneticOptimizer(40, 30, trap, diversity_monitor=monitor, **kwargs)
+    records = list(go.iter_generations())
+    assert monitor.n_restarts > 0
+    assert min(record.diversity for record in records) < monitor.threshold
+    assert go.fitness.max() > reference.fitness.max()
+    # The elite survives every restart
+    best = [record.best_fitness for record in records]
+    assert (np.diff(best) >= 0).all()
+
+    path = str(tmp_path / "checkpoint.npz")
+    go.checkpoint(path)
+    n_restarts = monitor.n_restarts
+    expected = go.optimize(20)
+    go = GeneticOptimizer(40, 30, trap, diversity_monitor=DiversityMonitor(), **kwargs)
+    go.load(path)
+    assert go.diversity_monitor.n_restarts == n_restarts
+    assert go.diversity == records[-1].diversity
+    assert (go.optimize(20) == expected).all()
+
+
+def test_go_diversity_real():
+    monitor = DiversityMonitor(threshold=0.5, response="mutate")
+    go = GeneticOptimizer(
+        5,
+        20,
+        lambda x: -(x**2).sum(axis=1),
+        vectorized=True,
+        t_sel_size=4,
+        seed=0,
+        diversity_monitor=monitor,
+    )
+    records = list(go.iter_generations(30))
+    assert records[0].diversity > 0
+    assert monitor.n_restarts > 0
@@ -1,12 +1,40 @@
+import asyncio
+import time
+from functools import partial
+
 import numpy as np
+import pytest
 
-from genopt.evaluation import evaluate, decode_discrete
+from genopt.evaluation import (
+    AsyncEvaluator,
+    DiscreteDecoder,
+    ProcessPoolEvaluator,
+    SerialEvaluator,
+    evaluate,
+    evaluate_worker_chunk,
+    decode_discrete,
+    init_worker,
+    worker_rng,
+)
 
 
 def objective(arr):
     return arr.sum()
 
 
+def weighted_objective(arr, weights):
+    return arr.dot(weights)
+
+
+def noisy_objective(arr):
+    return arr.sum() + worker_rng().random()
+
+
+async def async_objective(arr):
+    await asyncio.sleep(0.05)
+    return arr.sum()
+
+
 def test_decode_discrete_single_chromosome():
     n_vars = 10
     var_size = 4
@@ -33,6 +61,38 @@ def test_decode_discrete_special_case():
     assert x is chromosome
 
 
+def test_decode_discrete_matches_loop():
+    n_vars = 5
+    var_size = 6
+    var_range = (-2.5, 3)
+    population = np.random.randint(2, size=(8, n_vars * var_size))
+    x = decode_discrete(population, n_vars, var_range, var_size)
+    for i_indiv in range(population.shape[0]):
+        for i_var in range(n_vars):
+            var_bits = population[i_indiv, i_var * var_size : (i_var + 1) * var_size]
+            var_decimal = var_bits.dot(-(2 ** np.arange(var_size)))
+            expected = (var_range[0] - var_range[1]) * var_decimal / (
+                2**var_size - 1
+            ) + var_range[0]
+            assert x[i_indiv, i_var] == expected
+
+
+def test_decode_discrete_per_variable():
+    population = np.array([[1, 0, 1, 1, 1], [0, 1, 0, 0, 0]])
+    decoder = DiscreteDecoder(2, [(0, 3), (-1, 1)], [2, 3])
+    x = decoder(population)
+    assert np.allclose(x, [[1, 1], [2, -1]])
+
+
+def test_decode_discrete_gray():
+    n_bits = 4
+    values = np.arange(2**n_bits)
+    gray = values ^ (values >> 1)
+    population = (gray.reshape((-1, 1)) >> np.arange(n_bits)) & 1
+    x = decode_discrete(population, 1, (0, 2**n_bits - 1), n_bits, gray=True)
+    assert (x[:, 0] == values).all()
+
+
 def test_evaluate_single_chromosome():
     n_vars = 10
     variables = np.random.rand(n_vars)
@@ -50,3 +110,142 @@ def test_evaluate_population():
     fitness = evaluate(variables, objective)
     i_max = np.argmax(fitness)
     assert i_max == popsize - 1
+
+
+def test_evaluate_vectorized():
+    popsize = 25
+    variables = np.random.rand(popsize, 10)
+    calls = []
+
+    def vectorized_objective(arr):
+        calls.append(arr.shape[0])
+        return arr.sum(axis=1)
+
+    fitness = evaluate(variables, vectorized_objective, vectorized=True, chunk_size=10)
+    assert calls == [10, 10, 5]
+    assert np.allclose(fitness, variables.sum(axis=1))
+
+
+def test_evaluate_vectorized_objectives():
+    variables = np.random.rand(5, 10)
+    fitness = evaluate(
+        variables,
+        lambda arr: np.column_stack([arr.sum(axis=1), arr.max(axis=1)]),
+        vectorized=True,
+        chunk_size=2,
+        n_objectives=2,
+    )
+    assert fitness.shape == (5, 2)
+    assert np.allclose(fitness[:, 1], variables.max(axis=1))
+
+
+def test_evaluate_vectorized_wrong_shape():
+    variables = np.random.rand(5, 10)
+    with pytest.raises(ValueError):
+        evaluate(variables, lambda arr: arr.sum(), vectorized=True)
+
+    # Objective vectors are only accepted with the matching number of objectives
+    def two_objectives(arr):
+        return np.column_stack([arr.sum(axis=1), arr.max(axis=1)])
+
+    with pytest.raises(ValueError):
+        evaluate(variables, two_objectives, vectorized=True)
+    with pytest.raises(ValueError):
+        evaluate(variables, two_objectives, vectorized=True, n_objectives=3)
+    with pytest.raises(ValueError):
+        evaluate(variables, lambda x: np.array([x.sum(), x.max()]))
+
+
+def test_evaluate_single_objective_column():
+    variables = np.random.rand(5, 10)
+    fitness = evaluate(variables, lambda arr: np.array([arr.sum()]))
+    assert fitness.shape == (5,)
+    assert np.allclose(fitness, variables.sum(axis=1))
+    fitness = evaluate(
+        variables, lambda arr: arr.sum(axis=1, keepdims=True), vectorized=True
+    )
+    assert fitness.shape == (5,)
+    assert np.allclose(fitness, variables.sum(axis=1))
+
+
+def test_serial_evaluator():
+    variables = np.random.rand(25, 10)
+    fitness = SerialEvaluator().evaluate(variables, objective)
+    assert np.allclose(fitness, variables.sum(axis=1))
+
+
+def test_process_pool_evaluator_order():
+    popsize = 37
+    weights = np.random.rand(10)
+    variables = np.random.rand(popsize, 10)
+    with ProcessPoolEvaluator(n_workers=2, worker_chunk_size=5) as evaluator:
+        objective_function = partial(weighted_objective, weights=weights)
+        fitness = evaluator.evaluate(variables, objective_function)
+        fitness_again = evaluator.evaluate(variables[::-1], objective_function)
+    assert np.allclose(fitness, variables.dot(weights))
+    assert np.allclose(fitness_again, fitness[::-1])
+
+
+def test_async_evaluator_concurrent():
+    popsize = 20
+    variables = np.random.rand(popsize, 10)
+    start = time.perf_counter()
+    fitness = AsyncEvaluator().evaluate(variables, async_objective)
+    elapsed = time.perf_counter() - start
+    assert np.allclose(fitness, variables.sum(axis=1))
+    assert elapsed < 0.05 * popsize / 2
+
+
+def test_async_evaluator_max_concurrency():
+    running = []
+    max_running = []
+
+    async def counting_objective(arr):
+        running.append(1)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+        return arr.sum()
+
+    variables = np.random.rand(12, 3)
+    fitness = AsyncEvaluator(max_concurrency=3).evaluate(variables, counting_objective)
+    assert np.allclose(fitness, variables.sum(axis=1))
+    assert max(max_running) == 3
+
+
+def test_process_pool_evaluator_seed():
+    variables = np.random.rand(20, 3)
+    results = []
+    for n_workers in [1, 3]:
+        with ProcessPoolEvaluator(n_workers, worker_chunk_size=4, seed=5) as evaluator:
+            results.append(evaluator.evaluate(variables, noisy_objective))
+    assert (results[0] == results[1]).all()
+    assert not np.allclose(results[0], variables.sum(axis=1))
+
+
+def test_evaluate_worker_chunk():
+    variables = np.random.rand(6, 3)
+    init_worker(noisy_objective)
+    tasks = [(variables, False, 2, 1, np.random.SeedSequence(5)) for _ in range(2)]
+    fitness = [evaluate_worker_chunk(task) for task in tasks]
+    assert (fitness[0] == fitness[1]).all()
+    assert fitness[0].shape == (6,)
+
+
+def test_decoder_out():
+    decoder = DiscreteDecoder(3, (-1, 2), 4)
+    population = np.random.randint(0, 2, (5, 12))
+    out = np.empty((5, 3))
+    assert decoder(population, out) is out
+    np.testing.assert_array_equal(out, decoder(population))
+
+
+def test_evaluate_read_only():
+    def mutating_objective(arr):
+        arr[0] = 0
+        return arr.sum()
+
+    variables = np.ones((3, 2))
+    with pytest.raises(ValueError):
+        evaluate(variables, mutating_objective)
+    assert (variables == 1).all()
@@ -1,5 +1,11 @@
+import asyncio
+
 import numpy as np
+import pytest
 from genopt import GeneticOptimizer
+from genopt.evaluation import ProcessPoolEvaluator, SerialEvaluator
+from genopt.surrogate import SurrogateScreening
+from genopt.termination import MaxEvaluations, Stagnation, TargetFitness
 
 
 def objective(arr):
@@ -24,3 +30,385 @@ def test_go_discrete():
     result = go.optimize(10)
     result_decoded = go.decode(result)
     assert objective(result_decoded) > random_result
+
+
+def test_go_discrete_per_variable():
+    go = GeneticOptimizer(
+        2,
+        20,
+        objective,
+        encoding="discrete",
+        var_range=[(0, 1), (-5, 5)],
+        var_size=[1, 4],
+        gray=True,
+    )
+    assert go.population.shape == (20, 5)
+    result = go.decode(go.optimize(2))
+    assert result.shape == (1, 2)
+
+
+def test_go_vectorized():
+    n_vars = 10
+    random_result = objective(np.random.rand(n_vars))
+    go = GeneticOptimizer(
+        n_vars, 100, lambda arr: arr.sum(axis=1), vectorized=True, chunk_size=32
+    )
+    result = go.optimize(10)
+    assert objective(result) > random_result
+
+
+def test_go_process_pool():
+    n_vars = 10
+    random_result = objective(np.random.rand(n_vars))
+    with ProcessPoolEvaluator(n_workers=2) as evaluator:
+        go = GeneticOptimizer(n_vars, 100, objective, evaluator=evaluator)
+        result = go.optimize(5)
+    assert objective(result) > random_result
+    assert go.stats.latency_counts.sum() == 0
+
+    n_evaluations = go.n_evaluations
+    go.evaluator = SerialEvaluator()
+    go.optimize(2)
+    assert go.stats.latency_counts.sum() == go.n_evaluations - n_evaluations > 0
+
+
+def test_go_async():
+    n_vars = 10
+    random_result = objective(np.random.rand(n_vars))
+
+    async def async_objective(arr):
+        await asyncio.sleep(0)
+        return arr.sum()
+
+    go = GeneticOptimizer(n_vars, 50, async_objective, max_concurrency=10)
+    result = go.optimize(5)
+    assert objective(result) > random_result
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(go.optimize_async(5))
+    finally:
+        loop.close()
+    assert objective(result) > random_result
+
+
+def test_go_cache():
+    calls = []
+
+    def counting_objective(arr):
+        calls.append(1)
+        return arr.sum()
+
+    go = GeneticOptimizer(
+        10, 50, counting_objective, encoding="discrete", cache_size=100
+    )
+    go.optimize(10)
+    assert len(calls) == go.cache.misses
+    assert len(calls) < 50 * 10
+    assert len(go.cache) <= 100
+
+
+def test_go_packed():
+    n_vars = 10
+    var_size = 4
+    random_result = objective(np.random.rand(n_vars))
+    go = GeneticOptimizer(
+        n_vars, 100, objective, encoding="discrete", var_size=var_size, packed=True
+    )
+    assert go.population.shape == (100, 5)
+    result = go.optimize(10)
+    assert go.unpack(result).shape == (1, n_vars * var_size)
+    assert objective(go.decode(result)) > random_result
+
+
+def test_go_crossover_methods():
+    n_vars = 10
+    random_result = objective(np.random.rand(n_vars))
+    for crossover_method in ["two_point", "k_point", "uniform", "blend"]:
+        go = GeneticOptimizer(n_vars, 100, objective, crossover_method=crossover_method)
+        result = go.optimize(10)
+        assert objective(result) > random_result
+    go = GeneticOptimizer(
+        n_vars,
+        10,
+        objective,
+        encoding="discrete",
+        packed=True,
+        crossover_method="k_point",
+        crossover_points=3,
+    )
+    go.optimize(2)
+    with pytest.raises(AssertionError):
+        GeneticOptimizer(n_vars, 10, objective, crossover_method="two_points")
+    with pytest.raises(AssertionError):
+        GeneticOptimizer(
+            n_vars, 10, objective, encoding="discrete", crossover_method="blend"
+        )
+    with pytest.raises(AssertionError):
+        GeneticOptimizer(
+            n_vars, 10, objective, crossover_method="blend", dtype=np.int64
+        )
+
+
+def test_go_selection_methods():
+    n_vars = 10
+    random_result = objective(np.random.rand(n_vars))
+    for selection_method in ["sus", "rank", "truncation"]:
+        go = GeneticOptimizer(n_vars, 100, objective, selection_method=selection_method)
+        result = go.optimize(10)
+        assert objective(result) > random_result
+    for selection_method in ["roulette", "Tournament"]:
+        with pytest.raises(AssertionError):
+            GeneticOptimizer(n_vars, 10, objective, selection_method=selection_method)
+
+
+def test_go_seed_reproducible():
+    results = []
+    for _ in range(2):
+        go = GeneticOptimizer(
+            10, 20, objective, encoding="discrete", var_size=3, seed=123
+        )
+        results.append(go.optimize(5))
+    assert (results[0] == results[1]).all()
+
+
+def test_go_checkpoint_resume(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    kwargs = dict(encoding="discrete", var_size=3, seed=7, cache_size=None)
+    expected = GeneticOptimizer(10, 20, objective, **kwargs).optimize(8)
+
+    calls = []
+
+    def crashing_objective(arr):
+        calls.append(1)
+        if len(calls) > 100:
+            raise RuntimeError("Preempted")
+        return objective(arr)
+
+    go = GeneticOptimizer(
+        10, 20, crashing_objective, checkpoint_path=path, checkpoint_every=2, **kwargs
+    )
+    with pytest.raises(RuntimeError):
+        go.optimize(8)
+
+    go = GeneticOptimizer(10, 20, objective, **kwargs)
+    result = go.resume(path)
+    assert go.generation == 8
+    assert (result == expected).all()
+
+
+def test_go_iter_generations():
+    go = GeneticOptimizer(10, 20, objective)
+    records = list(go.iter_generations(4))
+    assert [record.generation for record in records] == [1, 2, 3, 4]
+    assert records[-1].n_evaluations == 20 * 5
+    assert records[-1].best_fitness == go.fitness.max()
+    assert records[-1].best_fitness >= records[-1].mean_fitness
+    # Records hold copies since the population buffers are reused
+    assert not np.shares_memory(records[-1].best_chromosome, go.population)
+    assert records[0].best_fitness == objective(records[0].best_chromosome)
+
+    # Final population is evaluated, so the result matches its fitness
+    assert objective(go.top_individual) == go.fitness.max()
+
+
+def test_go_iter_generations_unbounded():
+    go = GeneticOptimizer(10, 20, objective)
+    for record in go.iter_generations():
+        if record.generation == 3:
+            break
+    assert go.generation == 3
+
+
+def test_go_callbacks_stop():
+    records = []
+
+    def callback(record):
+        records.append(record)
+        return record.generation == 2
+
+    go = GeneticOptimizer(10, 20, objective, callbacks=[callback])
+    go.optimize(10)
+    assert len(records) == 2
+    assert go.generation == 2
+
+
+def test_go_results_outlive_buffers():
+    records = []
+    go = GeneticOptimizer(
+        3, 10, objective, encoding="discrete", var_size=4, callbacks=[records.append]
+    )
+    go.optimize(1)
+    results = [records[0].best_chromosome, *go.pareto_front()]
+    expected = [result.copy() for result in results]
+    go.optimize(3)
+    for result, expected_result in zip(results, expected):
+        assert (result == expected_result).all()
+
+
+def test_go_immigrate():
+    go = GeneticOptimizer(3, 10, objective)
+    go.optimize(1)
+    immigrant = np.full((1, 3), 100.0)
+    go.immigrate(immigrant, np.array([300.0]))
+    assert (go.top_individual == immigrant).all()
+    assert go.fitness.max() == 300
+
+
+def test_go_termination():
+    go = GeneticOptimizer(10, 20, objective, termination=[MaxEvaluations(100)])
+    go.optimize()
+    assert go.termination_reason == "max_evaluations"
+    assert go.n_evaluations == 100
+
+    go = GeneticOptimizer(
+        3,
+        20,
+        objective,
+        encoding="discrete",
+        termination=[Stagnation(3), TargetFitness(3)],
+    )
+    go.optimize(100)
+    assert go.termination_reason in ["stagnation", "target_fitness"]
+    assert go.generation < 100
+
+    go.optimize(2)
+    assert go.termination_reason in ["n_gen", "target_fitness"]
+
+
+def test_stats():
+    go = GeneticOptimizer(
+        4,
+        10,
+        lambda x: -np.sum(x**2),
+        profile_generations=(2, 4),
+        seed=0,
+    )
+    go.optimize(5)
+    summary = go.stats.summary()
+    for stage in ["selection", "crossover", "mutation", "elitism", "generation"]:
+        assert summary[stage]["calls"] == 5
+    assert summary["evaluation"]["calls"] == 6
+    assert summary["objective_latency"]["calls"] == go.n_evaluations
+    assert go.stats.profile is not None
+    functions = {function[2] for function in go.stats.profile.stats}
+    assert "tournament_selection" in functions
+
+
+def test_surrogate():
+    def onemax(x):
+        return x.sum(axis=1)
+
+    kwargs = dict(encoding="discrete", vectorized=True, t_sel_size=2, seed=1)
+    surrogate = SurrogateScreening(fraction=0.2, min_archive_size=40)
+    go = GeneticOptimizer(30, 40, onemax, surrogate=surrogate, **kwargs)
+    go.optimize(40)
+    reference = GeneticOptimizer(30, 40, onemax, **kwargs)
+    reference.optimize(40)
+    assert go.n_evaluations == surrogate.n_true
+    assert go.n_evaluations < reference.n_evaluations / 2
+    assert go.fitness.max() == go.top_individual.sum()
+    assert go.fitness.max() >= 25
+
+
+def test_surrogate_resume(tmp_path):
+    def onemax(x):
+        return x.sum(axis=1)
+
+    path = str(tmp_path / "checkpoint.npz")
+    kwargs = dict(encoding="discrete", vectorized=True, t_sel_size=3, seed=4)
+
+    def surrogate():
+        return SurrogateScreening(
+            fraction=0.2, min_archive_size=40, validation_interval=None
+        )
+
+    expected = GeneticOptimizer(30, 40, onemax, surrogate=surrogate(), **kwargs)
+    expected.optimize(20)
+
+    go = GeneticOptimizer(30, 40, onemax, surrogate=surrogate(), **kwargs)
+    go.optimize(10)
+    go.checkpoint(path, 10)
+    go = GeneticOptimizer(30, 40, onemax, surrogate=surrogate(), **kwargs)
+    result = go.resume(path)
+    assert (result == expected.top_individual).all()
+    assert (go.population == expected.population).all()
+    assert go.n_evaluations == expected.n_evaluations
+    assert go.surrogate.n_true == expected.surrogate.n_true
+    assert go.surrogate.n_predicted == expected.surrogate.n_predicted
+
+
+def test_go_double_buffering():
+    go = GeneticOptimizer(
+        8, 10, lambda x: x.sum(axis=1), encoding="discrete", vectorized=True
+    )
+    populations = []
+    for _ in go.iter_generations(4):
+        populations.append(go.population)
+    # The two population buffers alternate between generations
+    assert populations[0] is populations[2] and populations[1] is populations[3]
+    assert populations[0] is not populations[1]
+    np.testing.assert_array_equal(go.fitness, go.population.sum(axis=1))
+
+
+def test_go_multi_objective(tmp_path):
+    def zdt1(x):
+        g = 1 + 9 * x[:, 1:].mean(axis=1)
+        return -np.column_stack([x[:, 0], g * (1 - np.sqrt(x[:, 0] / g))])
+
+    kwargs = dict(encoding="discrete", var_size=8, vectorized=True, n_objectives=2)
+    go = GeneticOptimizer(6, 40, zdt1, seed=0, **kwargs)
+    records = list(go.iter_generations(30))
+    assert records[-1].best_fitness.shape == (2,)
+    assert go.fitness.shape == (40, 2)
+    assert (go.ranks >= 0).all() and go.crowding.shape == (40,)
+
+    chromosomes, objectives = go.pareto_front()
+    assert len(chromosomes) > 5
+    np.testing.assert_allclose(objectives, zdt1(go.decode(chromosomes)))
+    # Front members are close to the true front f2 = 1 - sqrt(f1)
+    assert np.all(-objectives[:, 1] - (1 - np.sqrt(-objectives[:, 0])) < 1)
+
+    # Termination criteria apply to the best value of every objective
+    go = GeneticOptimizer(
+        6, 40, zdt1, seed=0, termination=[Stagnation(3), TargetFitness(0)], **kwargs
+    )
+    go.optimize(200)
+    assert go.termination_reason == "stagnation"
+
+    # Fronts are restored from checkpoints
+    path = str(tmp_path / "checkpoint.npz")
+    go.checkpoint(path)
+    expected = go.optimize(5)
+    go.load(path)
+    assert (go.optimize(5) == expected).all()
+
+
+def test_go_dtype():
+    received = []
+
+    def float32_objective(x):
+        received.append(x.dtype)
+        return x.sum(axis=1)
+
+    for crossover_method in ["one_way", "blend"]:
+        go = GeneticOptimizer(
+            5,
+            20,
+            float32_objective,
+            vectorized=True,
+            dtype=np.float32,
+            crossover_method=crossover_method,
+        )
+        go.optimize(3)
+        assert go.population.dtype == np.float32
+        assert go.top_individual.dtype == np.float32
+    assert set(received) == {np.dtype(np.float32)}
+
+    for dtype in [bool, np.uint8]:
+        go = GeneticOptimizer(
+            5, 20, objective, encoding="discrete", var_size=3, dtype=dtype
+        )
+        result = go.optimize(3)
+        assert go.population.dtype == dtype and result.dtype == dtype
+        assert objective(go.decode(result)) == go.fitness.max()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from genopt import IslandOptimizer
+
+
+def objective(arr):
+    return arr.sum()
+
+
+def failing_objective(arr):
+    raise ValueError("Bad chromosome")
+
+
+def test_island_optimizer():
+    n_vars = 10
+    random_result = objective(np.random.rand(n_vars))
+    optimizer = IslandOptimizer(
+        3, n_vars, 20, objective, migration_interval=2, n_migrants=2, seed=1
+    )
+    result = optimizer.optimize(5)
+    assert objective(result) > random_result
+    assert optimizer.top_fitness == objective(result)
+    assert optimizer.top_fitness == optimizer.island_fitness.max()
+
+
+def test_island_optimizer_topologies():
+    for topology in ["ring", "fully_connected", "random"]:
+        optimizer = IslandOptimizer(
+            4, 6, 10, objective, topology=topology, encoding="discrete", var_size=2
+        )
+        neighbours = optimizer.neighbours()
+        assert len(neighbours) == 4
+        for i_island, destinations in enumerate(neighbours):
+            assert i_island not in destinations
+        result = optimizer.optimize(3)
+        assert result.shape == (12,)
+
+    # Every island might send its migrants to the same island
+    IslandOptimizer(4, 6, 10, objective, n_migrants=3, topology="ring")
+    for topology in ["fully_connected", "random"]:
+        with pytest.raises(AssertionError):
+            IslandOptimizer(4, 6, 10, objective, n_migrants=4, topology=topology)
+
+
+def test_island_optimizer_seed_reproducible():
+    results = [
+        IslandOptimizer(2, 5, 10, objective, migration_interval=2, seed=3).optimize(5)
+        for _ in range(2)
+    ]
+    assert (results[0] == results[1]).all()
+
+
+def test_island_optimizer_failing_objective():
+    for n_islands in [1, 2]:
+        optimizer = IslandOptimizer(n_islands, 5, 10, failing_objective)
+        with pytest.raises(RuntimeError, match="Bad chromosome"):
+            optimizer.optimize(2)
@@ -0,0 +1,97 @@
+import numpy as np
+from genopt.multiobjective import (
+    crowded_tournament_selection,
+    crowding_distance,
+    fast_non_dominated_sort,
+    nsga2_survival,
+    pareto_front,
+    survivor_selection,
+)
+
+
+def non_dominated_sort_loop(objectives):
+    ranks = np.full(len(objectives), -1)
+    rank = 0
+    while (ranks < 0).any():
+        remaining = np.flatnonzero(ranks < 0)
+        for i in remaining:
+            dominated = any(
+                (objectives[j] >= objectives[i]).all()
+                and (objectives[j] > objectives[i]).any()
+                for j in remaining
+            )
+            if not dominated:
+                ranks[i] = rank
+        rank += 1
+    return ranks
+
+
+def test_fast_non_dominated_sort():
+    objectives = np.array([[1, 5], [2, 4], [2, 2], [1, 1], [0, 6], [1, 1]])
+    assert (fast_non_dominated_sort(objectives) == [0, 0, 1, 2, 0, 2]).all()
+
+
+def test_fast_non_dominated_sort_matches_loop():
+    rng = np.random.default_rng(0)
+    for n_objectives in [1, 2, 3, 4]:
+        for _ in range(5):
+            objectives = rng.integers(0, 4, size=(40, n_objectives)).astype(float)
+            expected = non_dominated_sort_loop(objectives)
+            assert (fast_non_dominated_sort(objectives) == expected).all()
+
+
+def test_fast_non_dominated_sort_chunked(monkeypatch):
+    import genopt.multiobjective
+
+    objectives = np.random.default_rng(1).random((50, 3))
+    expected = fast_non_dominated_sort(objectives)
+    monkeypatch.setattr(genopt.multiobjective, "MAX_COMPARISONS", 7)
+    assert (fast_non_dominated_sort(objectives) == expected).all()
+
+
+def test_crowding_distance():
+    objectives = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0], [0, 0]])
+    ranks = fast_non_dominated_sort(objectives)
+    distance = crowding_distance(objectives, ranks)
+    assert np.isinf(distance[[0, 3, 4]]).all()
+    assert np.allclose(distance[[1, 2]], [1.5, 1.5])
+
+
+def test_crowded_tournament_selection():
+    population = np.arange(6).reshape((3, 2))
+    ranks = np.array([1, 0, 0])
+    crowding = np.array([np.inf, np.inf, 1.0])
+    selected = crowded_tournament_selection(
+        population, ranks, crowding, np.random.default_rng(0)
+    )
+    assert selected.shape == population.shape
+    # The individual in the worse front only wins against itself
+    assert (selected == population[0]).all(axis=1).sum() <= 1
+
+    out = np.empty_like(population)
+    result = crowded_tournament_selection(
+        population, ranks, crowding, np.random.default_rng(0), out
+    )
+    assert result is out
+    assert (out == selected).all()
+
+
+def test_survivor_selection():
+    ranks = np.array([1, 0, 1, 2, 1])
+    crowding = np.array([0.5, np.inf, np.inf, np.inf, 1.0])
+    assert list(survivor_selection(ranks, crowding, 3)) == [1, 2, 4]
+
+
+def test_nsga2_survival():
+    population = np.arange(5).reshape((-1, 1))
+    objectives = np.array([[1.0, 1.0], [3.0, 0.0], [0.0, 0.0], [0.0, 3.0], [2, 2]])
+    survivors, fitness, ranks, crowding = nsga2_survival(population, objectives, 3)
+    assert sorted(survivors[:, 0]) == [1, 3, 4]
+    assert (fitness == objectives[survivors[:, 0]]).all()
+    assert (ranks == 0).all()
+    assert (crowding == crowding_distance(fitness, ranks)).all()
+
+
+def test_pareto_front():
+    objectives = np.array([[1, 1], [2, 0], [0, 0], [1, 1]])
+    assert (pareto_front(objectives) == [True, True, False, True]).all()
@@ -1,5 +1,12 @@
 import numpy as np
-from genopt.mutation import mutation_discrete, mutation_real
+from genopt.mutation import (
+    mutation_discrete,
+    mutation_packed,
+    mutation_real,
+    mutation_self_adaptive,
+    sparse_random_selection,
+)
+from genopt.population import init_packed, unpack_population
 
 
 def test_mutation_real_single_chromosome():
@@ -34,3 +41,95 @@ def test_mutation_discrete():
     mutated = mutation_discrete(chromosome.copy(), 0.5)
     assert not (chromosome == mutated).all()
     assert (chromosome == mutated).any()
+
+
+def test_mutation_packed():
+    chromosome_length = 1001
+    popsize = 100
+    population = init_packed(popsize, chromosome_length, 1)
+    mutated = mutation_packed(population, 0.01, chromosome_length)
+    assert mutated.dtype == np.uint8
+    n_flipped = (
+        unpack_population(population, chromosome_length)
+        != unpack_population(mutated, chromosome_length)
+    ).sum()
+    assert 700 < n_flipped < 1300
+    assert (mutated[:, -1] & 0x7F).sum() == 0
+
+
+def test_mutation_packed_all():
+    chromosome_length = 12
+    population = init_packed(5, chromosome_length, 1)
+    mutated = mutation_packed(population, 1, chromosome_length)
+    assert (
+        unpack_population(population, chromosome_length)
+        != unpack_population(mutated, chromosome_length)
+    ).all()
+
+
+def test_sparse_random_selection():
+    shape = (1000, 200)
+    rows, cols = sparse_random_selection(shape, 0.001)
+    assert 120 < rows.size < 280
+    assert (rows < shape[0]).all()
+    assert (cols < shape[1]).all()
+    assert np.unique(rows * shape[1] + cols).size == rows.size
+
+
+def test_mutation_sparse():
+    popsize = 1000
+    chromosome_length = 200
+    chromosome = np.random.randint(2, size=(popsize, chromosome_length))
+    mutated = mutation_discrete(chromosome.copy(), 0.001, sparse=True)
+    assert 120 < (chromosome != mutated).sum() < 280
+
+    chromosome = np.random.rand(popsize, chromosome_length)
+    mutated = mutation_real(chromosome.copy(), 0.001, 1, sparse=True)
+    assert 120 < (chromosome != mutated).sum() < 280
+
+
+def test_mutation_out():
+    population = np.zeros((10, 20), dtype=int)
+    result = mutation_discrete(population, 0.5, out=population)
+    assert result is population and population.any()
+
+    real = np.zeros((10, 20))
+    expected = mutation_real(real, 0.5, 1, rng=np.random.default_rng(0))
+    out = np.empty_like(real)
+    mutation_real(real, 0.5, 1, rng=np.random.default_rng(0), out=out)
+    assert (out == expected).all() and (real == 0).all()
+
+    packed = init_packed(10, 4, 3, rng=np.random.default_rng(1))
+    expected = mutation_packed(packed, 0.2, 12, rng=np.random.default_rng(2))
+    mutation_packed(packed, 0.2, 12, rng=np.random.default_rng(2), out=packed)
+    assert (packed == expected).all()
+
+
+def test_mutation_preserves_dtype():
+    population = np.zeros((20, 10), dtype=np.float32)
+    mutated = mutation_real(population, 0.5, 1.0)
+    assert mutated.dtype == np.float32
+    assert (mutated != 0).any()
+    for dtype in [bool, np.uint8]:
+        population = np.zeros((20, 10), dtype=dtype)
+        for sparse in [True, False]:
+            mutated = mutation_discrete(population, 0.3, sparse=sparse)
+            assert mutated.dtype == dtype
+            assert set(np.unique(mutated)) == {0, 1}
+
+
+def test_mutation_self_adaptive():
+    population = np.zeros((100, 4))
+    population[:, -1] = 1
+    mutated = mutation_self_adaptive(population, 1, 0.5, min_step=0.5)
+    assert mutated is not population
+    assert (mutated[:, -1] >= 0.5).all() and (mutated[:, -1] != 1).all()
+    assert (mutated[:, :-1] != 0).all()
+
+    # Step sizes of chromosomes without mutated genes are unchanged
+    mutated = mutation_self_adaptive(population, 0, 0.5)
+    assert (mutated == population).all()
+
+    population[:, -1] = 1e-3
+    mutation_self_adaptive(population, 1, 0.1, out=population)
+    assert np.abs(population[:, :-1]).max() < 0.1
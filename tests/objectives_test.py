@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from genopt.objectives import SubsetRegression
+
+
+def make_data(n_samples=100, n_features=8, seed=0):
+    rng = np.random.default_rng(seed)
+    x_data = rng.normal(size=(n_samples, n_features))
+    targets = x_data[:, :3] @ np.array([1.0, -2.0, 0.5]) + rng.normal(size=n_samples)
+    return x_data, targets
+
+
+def reference_bic(x_data, targets, chromosome):
+    x_subset = x_data[:, chromosome.astype(bool)]
+    coefficients = np.linalg.lstsq(x_subset, targets, rcond=None)[0]
+    rss = np.sum((targets - x_subset @ coefficients) ** 2)
+    n_samples = targets.size
+    log_likelihood = -n_samples / 2 * (np.log(2 * np.pi * rss / n_samples) + 1)
+    return 2 * log_likelihood - np.log(n_samples) * x_subset.shape[1]
+
+
+def test_subset_regression_bic():
+    x_data, targets = make_data()
+    population = np.random.default_rng(1).integers(2, size=(50, 8))
+    population[0] = 0
+    fitness = SubsetRegression(x_data, targets)(population)
+    assert fitness[0] == -1e9
+    expected = [reference_bic(x_data, targets, row) for row in population[1:]]
+    np.testing.assert_allclose(fitness[1:], expected)
+
+
+def test_subset_regression_collinear():
+    x_data, targets = make_data()
+    x_data[:, 1] = 2 * x_data[:, 0]
+    objective = SubsetRegression(x_data, targets)
+    rss, n_params = objective.residual_sum_of_squares(
+        np.array([[1, 1, 0, 0, 0, 0, 0, 0]])
+    )
+    assert n_params[0] == 1
+    x_subset = x_data[:, [0]]
+    coefficients = np.linalg.lstsq(x_subset, targets, rcond=None)[0]
+    np.testing.assert_allclose(rss, np.sum((targets - x_subset @ coefficients) ** 2))
+
+    # Collinear through rounding rather than exactly
+    x_data[:, 2] = x_data[:, 0] * 0.1 + x_data[:, 3] * 0.3
+    objective = SubsetRegression(x_data, targets)
+    _, n_params = objective.residual_sum_of_squares(
+        np.array([[1, 0, 1, 1, 0, 0, 0, 0]])
+    )
+    assert n_params[0] == 2
+
+
+@pytest.mark.parametrize("add_constant", [False, True])
+def test_subset_regression_matches_statsmodels(add_constant):
+    sm = pytest.importorskip("statsmodels.api")
+    x_data, targets = make_data()
+    population = np.random.default_rng(2).integers(2, size=(20, 8))
+    population[:, 0] = 1
+    criteria = {
+        criterion: SubsetRegression(x_data, targets, criterion, add_constant)(
+            population
+        )
+        for criterion in ["bic", "aic", "adjusted_r2"]
+    }
+    for i, chromosome in enumerate(population):
+        x_subset = x_data[:, chromosome.astype(bool)]
+        if add_constant:
+            x_subset = sm.add_constant(x_subset, has_constant="add")
+        results = sm.OLS(targets, x_subset).fit()
+        np.testing.assert_allclose(criteria["bic"][i], -results.bic)
+        np.testing.assert_allclose(criteria["aic"][i], -results.aic)
+        np.testing.assert_allclose(criteria["adjusted_r2"][i], results.rsquared_adj)
+
+
+def test_subset_regression_adjusted_r2():
+    x_data, targets = make_data()
+    chromosome = np.array([1, 1, 1, 0, 0, 0, 0, 0])
+    x_subset = np.hstack([x_data[:, :3], np.ones((100, 1))])
+    coefficients = np.linalg.lstsq(x_subset, targets, rcond=None)[0]
+    rss = np.sum((targets - x_subset @ coefficients) ** 2)
+    r_squared = 1 - rss / np.sum((targets - targets.mean()) ** 2)
+    expected = 1 - 99 / 96 * (1 - r_squared)
+    objective = SubsetRegression(x_data, targets, "adjusted_r2", add_constant=True)
+    np.testing.assert_allclose(objective(chromosome), [expected])
@@ -1,5 +1,15 @@
 import numpy as np
-from genopt.population import init_discrete, init_real, update_population
+import pytest
+from genopt.population import (
+    as_output,
+    genome_dtype,
+    init_discrete,
+    init_packed,
+    init_real,
+    pack_population,
+    unpack_population,
+    update_population,
+)
 
 
 def test_init_discrete():
@@ -30,3 +40,60 @@ def test_update_population_no_elitism():
     population = init_real(25, 10)
     new_population = update_population(population, top_individual, 0)
     assert (new_population[0, :] != top_individual).all()
+
+
+def test_init_packed():
+    population = init_packed(25, 10, 3)
+    assert population.shape == (25, 4)
+    assert population.dtype == np.uint8
+    assert (population[:, -1] & 0b11).sum() == 0
+
+
+def test_pack_unpack_population():
+    population = np.random.randint(2, size=(25, 13))
+    packed = pack_population(population)
+    assert packed.shape == (25, 2)
+    assert (unpack_population(packed, 13) == population).all()
+
+
+def test_as_output():
+    population = np.arange(6).reshape((3, 2))
+    copy = as_output(population)
+    assert copy is not population and (copy == population).all()
+    out = np.zeros_like(population)
+    assert as_output(population, out) is out and (out == population).all()
+    assert as_output(population, population) is population
+
+
+def test_update_population_in_place():
+    population = np.arange(10).reshape((5, 2))
+    top = np.array([-1, -1])
+    updated = update_population(population, top, 2, out=population)
+    assert updated is population
+    assert (population[:2] == -1).all()
+    assert (population[2:] >= 0).all()
+
+
+def test_init_dtype():
+    assert init_real(4, 3, dtype=np.float32).dtype == np.float32
+    population = init_discrete(4, 3, 2, dtype=bool)
+    assert population.dtype == bool and population.shape == (4, 6)
+    assert init_discrete(4, 3, 2, dtype=np.uint8).dtype == np.uint8
+
+
+def test_genome_dtype():
+    assert genome_dtype("real") == np.float64
+    assert genome_dtype("discrete") == np.int64
+    assert genome_dtype("real", "float32") == np.float32
+    assert genome_dtype("discrete", bool) == bool
+    with pytest.raises(AssertionError):
+        genome_dtype("real", np.int8)
+    with pytest.raises(AssertionError):
+        genome_dtype("discrete", np.float32)
+
+
+def test_update_population_carry():
+    population = np.arange(10).reshape((5, 2))
+    carry = np.arange(5)
+    update_population(population, np.array([-1, -1]), 1, out=population, carry=carry)
+    assert (population[1:, 0] == 2 * carry[1:]).all()
@@ -0,0 +1,24 @@
+import numpy as np
+from genopt.rng import as_generator, spawn_generators, spawn_seeds
+
+
+def test_as_generator():
+    rng = np.random.default_rng(1)
+    assert as_generator(rng) is rng
+    assert as_generator(3).random() == as_generator(3).random()
+    assert isinstance(as_generator().bit_generator, np.random.PCG64)
+
+
+def test_spawn_seeds_reproducible():
+    seeds1 = spawn_seeds(42, 3)
+    seeds2 = spawn_seeds(42, 3)
+    assert [s.generate_state(1)[0] for s in seeds1] == [
+        s.generate_state(1)[0] for s in seeds2
+    ]
+    assert len({s.generate_state(1)[0] for s in seeds1}) == 3
+
+
+def test_spawn_generators_independent():
+    rngs = spawn_generators(np.random.SeedSequence(7), 4)
+    draws = [rng.random() for rng in rngs]
+    assert len(set(draws)) == 4
@@ -1,4 +1,10 @@
-from genopt.selection import tournament_selection
+from genopt.selection import (
+    random_tournaments,
+    rank_selection,
+    stochastic_universal_sampling,
+    tournament_selection,
+    truncation_selection,
+)
 import numpy as np
 from genopt.crossover import one_way_crossover
 
@@ -11,9 +17,10 @@ def test_tournament_selection_size_2():
 
     wins = 0
     iterations = 1000
+    rng = np.random.default_rng(0)
     for _ in range(iterations):
         selected = tournament_selection(
-            fitness.reshape((-1, 1)), fitness, t_sel_p, t_sel_size
+            fitness.reshape((-1, 1)), fitness, t_sel_p, t_sel_size, rng=rng
         )
         wins += (selected == 1).sum()
 
@@ -29,9 +36,10 @@ def test_tournament_selection_size_5():
 
     wins = np.zeros(popsize)
     iterations = 1000
+    rng = np.random.default_rng(0)
     for _ in range(iterations):
         selected = tournament_selection(
-            fitness.reshape((-1, 1)), fitness, t_sel_p, t_sel_size
+            fitness.reshape((-1, 1)), fitness, t_sel_p, t_sel_size, rng=rng
         )
 
         for i in range(popsize):
@@ -46,3 +54,71 @@ def test_tournament_selection_size_5():
     for i, win in enumerate(wins):
         prob = prob_thresholds[-(i + 1)]
         assert prob - diff < win < prob + diff
+
+
+def test_tournament_selection_large_population():
+    popsize = 10000
+    fitness = np.random.rand(popsize)
+    population = fitness.reshape((-1, 1))
+    selected = tournament_selection(population, fitness, 1, 3)
+    assert selected.shape == (popsize, 1)
+    # The expected fitness of the best of three uniform samples is 0.75
+    assert 0.73 < selected.mean() < 0.77
+
+
+def test_tournament_selection_random_keys_chunked(monkeypatch):
+    import genopt.selection
+
+    popsize = 50
+    fitness = np.random.default_rng(0).random(popsize)
+    population = fitness.reshape((-1, 1))
+    expected = tournament_selection(population, fitness, 0.7, 10, rng=1)
+    monkeypatch.setattr(genopt.selection, "RANDOM_KEYS_CHUNK_SIZE", 7 * popsize)
+    selected = tournament_selection(population, fitness, 0.7, 10, rng=1)
+    assert (selected == expected).all()
+
+
+def test_random_tournaments():
+    rng = np.random.default_rng(0)
+    for t_sel_size in (2, 10):
+        selected = random_tournaments(20, t_sel_size, rng, n_tournaments=30)
+        assert selected.shape == (30, t_sel_size)
+        assert ((selected >= 0) & (selected < 20)).all()
+        assert (np.diff(np.sort(selected, axis=1), axis=1) > 0).all()
+
+
+def test_stochastic_universal_sampling():
+    fitness = np.array([0, 1, 1, 2])
+    selected = stochastic_universal_sampling(fitness.reshape((-1, 1)), fitness)
+    assert sorted(selected.ravel().tolist()) == [1, 1, 2, 2]
+
+
+def test_rank_selection():
+    popsize = 1000
+    fitness = -np.arange(popsize, dtype=float) ** 3
+    selected = rank_selection(fitness.reshape((-1, 1)), fitness, 2)
+    assert selected.shape == (popsize, 1)
+    assert (selected == fitness[-1]).sum() <= 1
+    assert (selected == fitness[0]).sum() == 2
+
+
+def test_truncation_selection():
+    popsize = 100
+    fitness = np.random.rand(popsize)
+    selected = truncation_selection(fitness.reshape((-1, 1)), fitness, 0.1)
+    assert (selected >= np.sort(fitness)[-10]).all()
+
+
+def test_selection_out():
+    fitness = np.random.rand(50)
+    population = np.random.rand(50, 3)
+    for select in [
+        lambda **kwargs: tournament_selection(population, fitness, 0.7, 2, **kwargs),
+        lambda **kwargs: stochastic_universal_sampling(population, fitness, **kwargs),
+        lambda **kwargs: rank_selection(population, fitness, **kwargs),
+        lambda **kwargs: truncation_selection(population, fitness, **kwargs),
+    ]:
+        expected = select(rng=np.random.default_rng(0))
+        out = np.empty_like(population)
+        assert select(rng=np.random.default_rng(0), out=out) is out
+        assert (out == expected).all()
@@ -0,0 +1,65 @@
+import logging
+
+import numpy as np
+
+from genopt.stats import (
+    LATENCY_BINS,
+    OptimizerStats,
+    RateLimitedLogger,
+    generation_in_range,
+)
+
+
+def test_stage_timer():
+    stats = OptimizerStats()
+    for _ in range(3):
+        with stats.timer("selection"):
+            pass
+    assert stats.stage_calls["selection"] == 3
+    assert stats.stage_times["selection"] >= 0
+    summary = stats.summary()
+    assert summary["selection"]["calls"] == 3
+    assert summary["objective_latency"]["calls"] == 0
+    assert np.isnan(summary["objective_latency"]["p50"])
+
+
+def test_latency_histogram():
+    stats = OptimizerStats()
+    for seconds in [1e-5, 1e-5, 1e-5, 2.0]:
+        stats.add_latency(seconds)
+    stats.add_latency(1e6)
+    assert stats.latency_counts.sum() == 5
+    assert stats.latency_counts[-1] == 1
+    assert 1e-5 <= stats.latency_percentile(50) < 2e-5
+    assert stats.latency_percentile(100) == np.inf
+
+    objective = stats.timed_objective(lambda x: x + 1)
+    assert objective(1) == 2
+    assert stats.latency_counts.sum() == 6
+    assert len(stats.latency_counts) == len(LATENCY_BINS) + 1
+
+
+def test_profile():
+    stats = OptimizerStats()
+    stats.start_profile(memory=True)
+    _ = [np.zeros(100) for _ in range(10)]
+    stats.stop_profile()
+    assert stats.profile is not None
+    assert stats.memory is not None and stats.memory_peak > 0
+    stats.reset()
+    assert stats.profile is None
+
+
+def test_rate_limited_logger(caplog):
+    logger = RateLimitedLogger(logging.getLogger("genopt.test"), 3600)
+    with caplog.at_level(logging.INFO, logger="genopt.test"):
+        for i in range(5):
+            logger.info("Message %d", i)
+        logger.info("Last", force=True)
+    assert [record.getMessage() for record in caplog.records] == ["Message 0", "Last"]
+
+
+def test_generation_in_range():
+    assert generation_in_range(2, (2, 4))
+    assert not generation_in_range(4, (2, 4))
+    assert not generation_in_range(2, None)
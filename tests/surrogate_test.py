@@ -0,0 +1,62 @@
+import numpy as np
+
+from genopt.surrogate import KNNRegressor, RBFRegressor, SurrogateScreening
+
+
+def test_knn_regressor():
+    x_train = np.array([[0, 0], [1, 0], [0, 1], [1, 1]])
+    y_train = np.array([0, 1, 1, 2])
+    model = KNNRegressor(k=2)
+    model.fit(x_train, y_train)
+    np.testing.assert_allclose(model.predict(x_train), y_train)
+    assert 0 < model.predict(np.array([[0.5, 0.5]]))[0] < 2
+
+
+def test_rbf_regressor():
+    x_train = np.linspace(0, 1, 20).reshape((-1, 1))
+    y_train = np.sin(3 * x_train[:, 0])
+    model = RBFRegressor()
+    model.fit(x_train, y_train)
+    x_test = np.array([[0.33], [0.71]])
+    np.testing.assert_allclose(
+        model.predict(x_test), np.sin(3 * x_test[:, 0]), atol=1e-2
+    )
+
+
+def test_surrogate_screening():
+    rng = np.random.default_rng(0)
+    calls = []
+
+    def evaluate_function(population):
+        calls.append(len(population))
+        return population.sum(axis=1).astype(float)
+
+    surrogate = SurrogateScreening(
+        fraction=0.25, min_archive_size=40, validation_interval=3
+    )
+    # The archive is filled with full evaluations
+    population = rng.integers(2, size=(40, 10))
+    fitness = surrogate.evaluate(population, evaluate_function)
+    np.testing.assert_array_equal(fitness, population.sum(axis=1))
+
+    population = rng.integers(2, size=(40, 10))
+    fitness = surrogate.evaluate(population, evaluate_function)
+    assert calls == [40, 10]
+    i_best = np.argmax(fitness)
+    assert fitness[i_best] == population[i_best].sum()
+    assert surrogate.n_true == 50 and surrogate.n_predicted == 30
+
+    # Every third call validates the surrogate on the full population
+    surrogate.evaluate(rng.integers(2, size=(40, 10)), evaluate_function)
+    assert calls[-1] == 40
+    accuracy = surrogate.accuracy()
+    assert accuracy["validations"] == 1
+    assert accuracy["rank_correlation"] > 0.5
+    assert len(surrogate) == 90
+
+
+def test_surrogate_archive_size():
+    surrogate = SurrogateScreening(archive_size=30, min_archive_size=10)
+    for _ in range(5):
+        surrogate.evaluate(np.random.rand(20, 3), lambda x: x.sum(axis=1))
+    assert len(surrogate) == 30
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+
+from genopt.go import GenerationRecord
+from genopt.termination import MaxEvaluations, Stagnation, TargetFitness, TimeLimit
+
+
+def record(best_fitness=0.0, n_evaluations=0):
+    return GenerationRecord(1, best_fitness, 0.0, None, n_evaluations)
+
+
+def test_stagnation():
+    criterion = Stagnation(2)
+    assert not criterion(record(1))
+    assert not criterion(record(1))
+    assert not criterion(record(2))
+    assert not criterion(record(2))
+    assert criterion(record(2))
+    criterion.reset()
+    assert not criterion(record(2))
+
+
+def test_stagnation_min_improvement():
+    criterion = Stagnation(1, min_improvement=0.5)
+    assert not criterion(record(1))
+    assert criterion(record(1.2))
+
+
+def test_target_fitness():
+    criterion = TargetFitness(3)
+    assert not criterion(record(2.9))
+    assert criterion(record(3))
+
+
+def test_time_limit():
+    criterion = TimeLimit(0.05)
+    criterion.reset()
+    assert not criterion(record())
+    time.sleep(0.06)
+    assert criterion(record())
+
+
+def test_max_evaluations():
+    criterion = MaxEvaluations(100)
+    assert not criterion(record(n_evaluations=99))
+    assert criterion(record(n_evaluations=100))
+
+
+def test_multi_objective():
+    criterion = Stagnation(2)
+    assert not criterion(record(np.array([1.0, 1.0])))
+    assert not criterion(record(np.array([1.0, 2.0])))
+    assert not criterion(record(np.array([2.0, 0.0])))
+    assert not criterion(record(np.array([2.0, 2.0])))
+    assert criterion(record(np.array([1.0, 1.0])))
+
+    criterion = TargetFitness([1, 2])
+    assert not criterion(record(np.array([1.0, 1.0])))
+    assert criterion(record(np.array([1.0, 2.0])))
+    assert TargetFitness(1)(record(np.array([1.0, 2.0])))